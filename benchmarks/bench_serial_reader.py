@@ -0,0 +1,143 @@
+"""
+Benchmark del lector serial del monitor (solo Linux/macOS)
+
+Crea un pseudo-terminal (pty) que actúa como placa: un hilo escribe líneas
+de telemetría al ritmo real de 115200 baudios durante varios segundos y el
+SerialMonitor lee desde el extremo esclavo. Al final se compara la cantidad
+de líneas enviadas y recibidas y el retraso acumulado.
+
+Uso:
+    python -m benchmarks.bench_serial_reader [--seconds 5] [--baud 115200] [--legacy]
+
+Con --legacy se mide también el lector anterior (una línea + pausa de 100 ms)
+para comparar.
+
+Autor: Código Abierto Fab Blocks IDE
+Licencia: MIT
+"""
+import argparse
+import os
+import pty
+import sys
+import threading
+import time
+import tty
+
+from PyQt5.QtCore import QCoreApplication, QThread, QTimer, pyqtSignal
+
+from core.monitor_plotter import SerialMonitor
+
+
+class LegacySerialReaderThread(QThread):
+    """Réplica del lector original: una línea por despertar y 100 ms de pausa."""
+    lines_received = pyqtSignal(list)
+
+    def __init__(self, serial_port):
+        super().__init__()
+        self.serial = serial_port
+        self.running = True
+
+    def run(self):
+        while self.running:
+            if self.serial.waitForReadyRead(100):
+                data = self.serial.readLine().data().decode('utf-8', errors='ignore').strip()
+                if data:
+                    self.lines_received.emit([data])
+            self.msleep(100)
+
+
+def _writer(master_fd, baud, seconds, stats):
+    """Escribe líneas tipo Arduino (println) respetando el ritmo del baudrate."""
+    bytes_per_second = baud / 10.0  # 8N1: 10 bits por byte
+    start = time.monotonic()
+    sent_bytes = 0
+    count = 0
+    while time.monotonic() - start < seconds:
+        line = f'temp:{count % 100}.5,luz:{count % 1024},t:{count}\r\n'.encode()
+        os.write(master_fd, line)
+        sent_bytes += len(line)
+        count += 1
+        delay = start + sent_bytes / bytes_per_second - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+    stats['sent'] = count
+    stats['write_end'] = time.monotonic()
+
+
+def run_benchmark(seconds, baud, legacy=False):
+    master_fd, slave_fd = pty.openpty()
+    tty.setraw(slave_fd)
+    port_name = os.ttyname(slave_fd)
+
+    app = QCoreApplication.instance() or QCoreApplication(sys.argv)
+    monitor = SerialMonitor()
+    stats = {'received': 0, 'batches': 0, 'last_seen': -1}
+
+    def on_lines(lines):
+        stats['received'] += len(lines)
+        stats['batches'] += 1
+        try:
+            stats['last_seen'] = int(lines[-1].rsplit('t:', 1)[1])
+        except (IndexError, ValueError):
+            pass
+
+    monitor.lines_received.connect(on_lines)
+    if legacy:
+        import core.monitor_plotter as monitor_plotter
+        original = monitor_plotter.SerialReaderThread
+        monitor_plotter.SerialReaderThread = LegacySerialReaderThread
+    try:
+        if not monitor.open_port(port_name, baud):
+            raise RuntimeError(f'No se pudo abrir {port_name}: {monitor.serial.errorString()}')
+    finally:
+        if legacy:
+            monitor_plotter.SerialReaderThread = original
+
+    writer = threading.Thread(target=_writer, args=(master_fd, baud, seconds, stats))
+    writer.start()
+
+    # Dar un segundo de margen tras la última escritura para drenar
+    QTimer.singleShot(int((seconds + 1) * 1000), app.quit)
+    app.exec_()
+    writer.join()
+    monitor.close_port()
+    app.processEvents()
+    os.close(master_fd)
+    os.close(slave_fd)
+
+    sent = stats['sent']
+    lag_lines = sent - 1 - stats['last_seen']
+    return {
+        'reader': 'legacy' if legacy else 'drain',
+        'sent': sent,
+        'received': stats['received'],
+        'lines_per_second': stats['received'] / seconds,
+        'lag_lines': lag_lines,
+        'batches_per_second': stats['batches'] / seconds,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--seconds', type=float, default=5.0)
+    parser.add_argument('--baud', type=int, default=115200)
+    parser.add_argument('--legacy', action='store_true', help='medir también el lector anterior')
+    args = parser.parse_args(argv)
+
+    results = []
+    if args.legacy:
+        results.append(run_benchmark(args.seconds, args.baud, legacy=True))
+    results.append(run_benchmark(args.seconds, args.baud))
+
+    print(f"{'lector':<8} {'enviadas':>9} {'recibidas':>10} {'líneas/s':>10} "
+          f"{'lotes/s':>8} {'retraso':>8}")
+    for r in results:
+        print(f"{r['reader']:<8} {r['sent']:>9} {r['received']:>10} "
+              f"{r['lines_per_second']:>10.0f} {r['batches_per_second']:>8.0f} {r['lag_lines']:>8}")
+
+    current = results[-1]
+    return 0 if current['received'] == current['sent'] else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
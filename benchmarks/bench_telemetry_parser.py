@@ -0,0 +1,88 @@
+"""
+Micro-benchmark del parser de telemetría
+
+Compara líneas por segundo entre el parseo original de display_data (split,
+búsqueda de ':' y float() por campo, línea por línea) y
+TelemetryParser.parse_batch con lotes del tamaño que entrega el monitor.
+
+Uso:
+    python -m benchmarks.bench_telemetry_parser [--lines 200000] [--batch 64]
+
+Autor: Código Abierto Fab Blocks IDE
+Licencia: MIT
+"""
+import argparse
+import sys
+import time
+
+from core.telemetry_parser import TelemetryParser
+
+
+def legacy_parse(data, variable_indices, dataY):
+    """Réplica del parseo original de MainWindow.display_data (sin graficar)."""
+    try:
+        variables = data.split(',')
+        has_named_variables = False
+        for variable in variables:
+            if ':' in variable:
+                has_named_variables = True
+                break
+        if has_named_variables:
+            for variable in variables:
+                name, value = variable.split(':')
+                name = name.strip()
+                value = float(value)
+                if name not in variable_indices:
+                    variable_indices[name] = len(dataY)
+                    dataY.append([])
+                dataY[variable_indices[name]].append(value)
+        else:
+            valores = [float(valor) for valor in variables]
+            while len(dataY) < len(valores):
+                dataY.append([])
+            for i, valor in enumerate(valores):
+                dataY[i].append(valor)
+    except ValueError:
+        pass
+
+
+def make_lines(count, named):
+    if named:
+        return [f'temp:{i % 100}.5,luz:{i % 1024},hum:{i % 60}.25,t:{i}' for i in range(count)]
+    return [f'{i % 100}.5,{i % 1024},{i % 60}.25,{i}' for i in range(count)]
+
+
+def bench_legacy(lines):
+    indices, data = {}, []
+    start = time.perf_counter()
+    for line in lines:
+        legacy_parse(line, indices, data)
+    return len(lines) / (time.perf_counter() - start)
+
+
+def bench_batch(lines, batch):
+    parser = TelemetryParser()
+    start = time.perf_counter()
+    for i in range(0, len(lines), batch):
+        parser.parse_batch(lines[i:i + batch])
+    return len(lines) / (time.perf_counter() - start)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--lines', type=int, default=200000)
+    parser.add_argument('--batch', type=int, default=64)
+    args = parser.parse_args(argv)
+
+    print(f"{'formato':<11} {'original':>12} {'por lotes':>12} {'mejora':>8}")
+    for named in (True, False):
+        lines = make_lines(args.lines, named)
+        before = bench_legacy(lines)
+        after = bench_batch(lines, args.batch)
+        label = 'con nombre' if named else 'posicional'
+        print(f"{label:<11} {before:>12,.0f} {after:>12,.0f} {after / before:>7.1f}x")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
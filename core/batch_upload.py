@@ -0,0 +1,131 @@
+"""
+Carga de un mismo programa en varias placas a la vez
+
+Para los laboratorios donde se programan 20 o 30 placas conectadas por
+hubs: el programa se compila una sola vez y luego BatchUploader ejecuta
+avrdude en paralelo sobre los puertos elegidos, con un máximo de
+max_workers cargas simultáneas. Un puerto que falla se reintenta hasta
+`retries` veces antes de darlo por fallido.
+
+    uploader = BatchUploader(['/dev/ttyUSB0', '/dev/ttyUSB1'], make_command)
+    uploader.port_finished.connect(...)
+    uploader.start()
+
+make_command(puerto) retorna el comando de carga de ese puerto (lista de
+argumentos).
+
+Autor: Código Abierto Fab Blocks IDE
+Licencia: MIT
+"""
+import subprocess
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from PyQt5.QtCore import QThread, pyqtSignal
+from core.command_runner import kill_process_tree, process_tree_kwargs
+
+# Cargas simultáneas por defecto (los hubs USB se saturan con muchas más)
+DEFAULT_WORKERS = 4
+# Reintentos por defecto de un puerto que falla
+DEFAULT_RETRIES = 1
+# Pausa antes de reintentar, para que la placa termine de reiniciarse (segundos)
+RETRY_DELAY = 1.0
+
+
+class PortResult:
+    def __init__(self, port):
+        self.port = port
+        self.ok = False
+        self.attempts = 0
+        self.returncode = None
+        self.seconds = 0.0
+        self.output = []
+
+
+class BatchUploader(QThread):
+    # puerto, número de intento
+    port_started = pyqtSignal(str, int)
+    # puerto, línea de salida de avrdude
+    port_output = pyqtSignal(str, str)
+    # puerto, éxito, intentos, segundos
+    port_finished = pyqtSignal(str, bool, int, float)
+
+    def __init__(self, ports, make_command, max_workers=DEFAULT_WORKERS,
+                 retries=DEFAULT_RETRIES, retry_delay=RETRY_DELAY):
+        super().__init__()
+        self.ports = list(ports)
+        self.make_command = make_command
+        self.max_workers = max(1, max_workers)
+        self.retries = max(0, retries)
+        self.retry_delay = retry_delay
+        self.results = {}
+        self._processes = {}
+        self._lock = threading.Lock()
+        self._cancelled = False
+
+    def run(self):
+        self.flash_all()
+
+    def flash_all(self):
+        """Carga todos los puertos; retorna {puerto: PortResult}."""
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            for result in pool.map(self._flash_port, self.ports):
+                self.results[result.port] = result
+        return self.results
+
+    def failed_ports(self):
+        return [port for port in self.ports
+                if port in self.results and not self.results[port].ok]
+
+    def cancel(self):
+        """Detiene las cargas en curso y no empieza las pendientes."""
+        with self._lock:
+            self._cancelled = True
+            processes = list(self._processes.values())
+        for process in processes:
+            kill_process_tree(process)
+
+    def _flash_port(self, port):
+        result = PortResult(port)
+        started = time.monotonic()
+        while not self._cancelled and result.attempts <= self.retries:
+            if result.attempts:
+                time.sleep(self.retry_delay)
+            result.attempts += 1
+            self.port_started.emit(port, result.attempts)
+            result.returncode, result.output = self._run_command(port)
+            if result.returncode == 0:
+                result.ok = True
+                break
+        result.seconds = time.monotonic() - started
+        self.port_finished.emit(port, result.ok, result.attempts, result.seconds)
+        return result
+
+    def _run_command(self, port):
+        command = self.make_command(port)
+        if self._cancelled:
+            return None, []
+        try:
+            # Sin una consola por cada avrdude en Windows; grupo propio en POSIX
+            process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                                       text=True, errors='replace', **process_tree_kwargs())
+        except OSError as e:
+            self.port_output.emit(port, str(e))
+            return None, [str(e)]
+        # Registro y consulta bajo el mismo lock que cancel(): o cancel() ve
+        # este proceso, o aquí se ve la cancelación
+        with self._lock:
+            self._processes[port] = process
+            cancelled = self._cancelled
+        if cancelled:
+            kill_process_tree(process)
+        output = []
+        try:
+            for line in process.stdout:
+                line = line.rstrip()
+                output.append(line)
+                self.port_output.emit(port, line)
+            return process.wait(), output
+        finally:
+            with self._lock:
+                self._processes.pop(port, None)
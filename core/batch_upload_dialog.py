@@ -0,0 +1,204 @@
+"""
+Diálogo de carga en varias placas
+
+Permite elegir los puertos, la cantidad de cargas simultáneas y los
+reintentos; compila el programa una sola vez (CompilationManager.upload_batch)
+y muestra el estado, los intentos y el tiempo de cada puerto. Los puertos
+que fallaron se pueden volver a cargar sin recompilar: el binario sale de la
+caché de compilación. La salida de avrdude de cada puerto se muestra al
+seleccionar su fila.
+
+Autor: Código Abierto Fab Blocks IDE
+Licencia: MIT
+"""
+from PyQt5.QtCore import Qt
+from PyQt5.QtGui import QTextCursor
+from PyQt5.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QLabel, QListWidget, QListWidgetItem,
+    QPlainTextEdit, QPushButton, QSpinBox, QTableWidget, QTableWidgetItem, QHeaderView
+)
+from core.batch_upload import DEFAULT_WORKERS, DEFAULT_RETRIES
+from core.i18n import get_text
+from core.port_inventory import get_port_inventory
+from core.ui_components import PortListUpdater
+
+COLUMN_PORT, COLUMN_STATUS, COLUMN_ATTEMPTS, COLUMN_TIME = range(4)
+
+
+class BatchUploadDialog(QDialog):
+    def __init__(self, compilation_manager, parent=None):
+        super().__init__(parent)
+        self.compilation_manager = compilation_manager
+        self.port_inventory = get_port_inventory()
+        self.uploader = None
+        self._rows = {}
+        # Líneas de salida de cada puerto en la carga actual
+        self._outputs = {}
+        self.setWindowTitle(get_text('batch.title'))
+        self.resize(560, 600)
+        self.initUI()
+
+    def initUI(self):
+        layout = QVBoxLayout(self)
+
+        layout.addWidget(QLabel(get_text('batch.ports')))
+        self.port_list = QListWidget()
+        layout.addWidget(self.port_list, 1)
+
+        options_layout = QHBoxLayout()
+        options_layout.addWidget(QLabel(get_text('batch.workers')))
+        self.workers_spin = QSpinBox()
+        self.workers_spin.setRange(1, 16)
+        self.workers_spin.setValue(DEFAULT_WORKERS)
+        options_layout.addWidget(self.workers_spin)
+        options_layout.addWidget(QLabel(get_text('batch.retries')))
+        self.retries_spin = QSpinBox()
+        self.retries_spin.setRange(0, 5)
+        self.retries_spin.setValue(DEFAULT_RETRIES)
+        options_layout.addWidget(self.retries_spin)
+        options_layout.addStretch()
+        layout.addLayout(options_layout)
+
+        self.results_table = QTableWidget(0, 4)
+        self.results_table.setHorizontalHeaderLabels([
+            get_text('batch.column_port'), get_text('batch.column_status'),
+            get_text('batch.column_attempts'), get_text('batch.column_time'),
+        ])
+        self.results_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        self.results_table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.results_table.setSelectionBehavior(QTableWidget.SelectRows)
+        self.results_table.setSelectionMode(QTableWidget.SingleSelection)
+        self.results_table.itemSelectionChanged.connect(self._show_selected_output)
+        layout.addWidget(self.results_table, 2)
+
+        layout.addWidget(QLabel(get_text('batch.output')))
+        self.output_view = QPlainTextEdit()
+        self.output_view.setReadOnly(True)
+        layout.addWidget(self.output_view, 2)
+
+        self.summary_label = QLabel()
+        layout.addWidget(self.summary_label)
+
+        button_layout = QHBoxLayout()
+        self.upload_button = QPushButton(get_text('batch.upload'))
+        self.upload_button.clicked.connect(self.start_upload)
+        self.retry_button = QPushButton(get_text('batch.retry_failed'))
+        self.retry_button.setEnabled(False)
+        self.retry_button.clicked.connect(self.retry_failed)
+        self.cancel_button = QPushButton(get_text('batch.cancel'))
+        self.cancel_button.setEnabled(False)
+        self.cancel_button.clicked.connect(self.compilation_manager.cancel)
+        button_layout.addWidget(self.upload_button)
+        button_layout.addWidget(self.retry_button)
+        button_layout.addWidget(self.cancel_button)
+        layout.addLayout(button_layout)
+
+    def update_ports(self):
+        """Agrega y quita puertos de la lista sin tocar los que siguen conectados."""
+        PortListUpdater.sync_list(self.port_list, self.port_inventory.devices(), self._create_port_item)
+
+    def _create_port_item(self, device):
+        item = QListWidgetItem(device)
+        item.setFlags(item.flags() | Qt.ItemIsUserCheckable)
+        item.setCheckState(Qt.Unchecked)
+        info = self.port_inventory.info(device)
+        if info is not None:
+            item.setToolTip(info.description)
+        return item
+
+    def checked_ports(self):
+        return [self.port_list.item(i).text() for i in range(self.port_list.count())
+                if self.port_list.item(i).checkState() == Qt.Checked]
+
+    def start_upload(self):
+        self._upload(self.checked_ports())
+
+    def retry_failed(self):
+        if self.uploader is not None:
+            self._upload(self.uploader.failed_ports())
+
+    def _upload(self, ports):
+        if not ports:
+            self.summary_label.setText(get_text('batch.no_ports'))
+            return
+        started = self.compilation_manager.upload_batch(
+            ports, self.workers_spin.value(), self.retries_spin.value(), listener=self)
+        if not started:
+            return
+        self.results_table.setRowCount(0)
+        self._rows = {}
+        self._outputs = {port: [] for port in ports}
+        self.output_view.clear()
+        for port in ports:
+            self._set_row(port, get_text('batch.status_compiling'), '', '')
+        self.summary_label.clear()
+        self.upload_button.setEnabled(False)
+        self.retry_button.setEnabled(False)
+        self.cancel_button.setEnabled(True)
+
+    def attach(self, uploader):
+        """Conecta el diálogo al BatchUploader una vez compilado el programa."""
+        self.uploader = uploader
+        for port in uploader.ports:
+            self._set_row(port, get_text('batch.status_waiting'), '', '')
+        uploader.port_started.connect(self._on_port_started)
+        uploader.port_output.connect(self._on_port_output)
+        uploader.port_finished.connect(self._on_port_finished)
+        uploader.finished.connect(self._on_batch_finished)
+
+    def batch_aborted(self):
+        """La compilación falló o se canceló antes de empezar las cargas."""
+        self.upload_button.setEnabled(True)
+        self.cancel_button.setEnabled(False)
+        self.retry_button.setEnabled(self.uploader is not None and bool(self.uploader.failed_ports()))
+
+    def _on_port_started(self, port, attempt):
+        self._set_row(port, get_text('batch.status_uploading'), str(attempt), '')
+        self._on_port_output(port, get_text('batch.attempt', attempt=attempt))
+
+    def _on_port_output(self, port, line):
+        self._outputs.setdefault(port, []).append(line)
+        if self._selected_port() == port:
+            self.output_view.appendPlainText(line)
+
+    def _selected_port(self):
+        rows = self.results_table.selectionModel().selectedRows()
+        if not rows:
+            return None
+        return self.results_table.item(rows[0].row(), COLUMN_PORT).text()
+
+    def _show_selected_output(self):
+        port = self._selected_port()
+        self.output_view.setPlainText('\n'.join(self._outputs.get(port, [])))
+        self.output_view.moveCursor(QTextCursor.End)
+
+    def _on_port_finished(self, port, ok, attempts, seconds):
+        status = get_text('batch.status_ok') if ok else get_text('batch.status_failed')
+        self._set_row(port, status, str(attempts), f'{seconds:.1f} s')
+
+    def _on_batch_finished(self):
+        results = self.uploader.results
+        failed = self.uploader.failed_ports()
+        self.summary_label.setText(get_text('batch.summary', ok=len(results) - len(failed),
+                                            total=len(self.uploader.ports)))
+        self.batch_aborted()
+
+    def _set_row(self, port, status, attempts, elapsed):
+        row = self._rows.get(port)
+        if row is None:
+            row = self.results_table.rowCount()
+            self.results_table.insertRow(row)
+            self._rows[port] = row
+        for column, text in ((COLUMN_PORT, port), (COLUMN_STATUS, status),
+                             (COLUMN_ATTEMPTS, attempts), (COLUMN_TIME, elapsed)):
+            self.results_table.setItem(row, column, QTableWidgetItem(text))
+
+    def showEvent(self, event):
+        # Solo se escuchan los cambios de puertos mientras el diálogo está visible
+        self.port_inventory.subscribe(self.update_ports)
+        self.update_ports()
+        super().showEvent(event)
+
+    def hideEvent(self, event):
+        self.port_inventory.unsubscribe(self.update_ports)
+        super().hideEvent(event)
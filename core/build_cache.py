@@ -0,0 +1,156 @@
+"""
+Caché de binarios compilados direccionada por contenido
+
+Cada .hex compilado se guarda con una clave SHA-256 de:
+- el código del sketch normalizado (saltos de línea y espacios finales),
+- el FQBN de la placa,
+- la huella de la herramienta (arduino-builder, plataforma AVR, compilador
+  y bibliotecas incluidas), calculada con fechas y tamaños de archivo.
+
+Si el mismo programa se vuelve a compilar para la misma placa se reutiliza
+el .hex sin ejecutar arduino-builder. Las entradas se desalojan de la menos a
+la más recientemente usada cuando el total supera max_bytes.
+
+Autor: Código Abierto Fab Blocks IDE
+Licencia: MIT
+"""
+import hashlib
+import os
+import shutil
+import sys
+import tempfile
+
+# Tamaño máximo por defecto de la caché de binarios
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+# Archivos y carpetas (relativos a la carpeta de Arduino) que definen la herramienta
+_TOOLCHAIN_PATHS = (
+    'arduino-builder',
+    'arduino-builder.exe',
+    'hardware/arduino/avr/platform.txt',
+    'hardware/arduino/avr/boards.txt',
+    'hardware/arduino/avr/cores/arduino',
+    'hardware/tools/avr/bin',
+    'libraries',
+)
+
+
+def user_cache_dir(*parts):
+    """Carpeta de caché del usuario para Fab Blocks IDE (no depende del directorio actual)."""
+    if sys.platform == 'win32':
+        base = os.environ.get('LOCALAPPDATA') or os.path.expanduser('~\\AppData\\Local')
+        root = os.path.join(base, 'FabBlocksIDE', 'cache')
+    elif sys.platform == 'darwin':
+        root = os.path.expanduser('~/Library/Caches/FabBlocksIDE')
+    else:
+        root = os.path.join(os.environ.get('XDG_CACHE_HOME') or os.path.expanduser('~/.cache'), 'fabblocks')
+    return os.path.join(root, *parts)
+
+
+def normalize_sketch(text):
+    """Quita diferencias que no cambian el programa: fin de línea y espacios finales."""
+    lines = text.replace('\r\n', '\n').replace('\r', '\n').split('\n')
+    return '\n'.join(line.rstrip() for line in lines).strip('\n') + '\n'
+
+
+def toolchain_fingerprint(arduino_folder):
+    """
+    Huella de la instalación de Arduino basada en fecha y tamaño de sus
+    archivos clave (y de las entradas de primer nivel de las carpetas).
+    """
+    digest = hashlib.sha256()
+    for relative in _TOOLCHAIN_PATHS:
+        path = os.path.join(arduino_folder, relative)
+        entries = [path]
+        if os.path.isdir(path):
+            entries += [os.path.join(path, name) for name in sorted(os.listdir(path))]
+        for entry in entries:
+            try:
+                stat = os.stat(entry)
+            except OSError:
+                continue
+            name = os.path.relpath(entry, arduino_folder)
+            digest.update(f'{name}|{stat.st_size}|{stat.st_mtime_ns}\n'.encode('utf-8'))
+    return digest.hexdigest()
+
+
+class BuildCache:
+    def __init__(self, directory=None, max_bytes=DEFAULT_MAX_BYTES):
+        self.directory = directory or user_cache_dir('builds')
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(sketch_text, fqbn, fingerprint):
+        digest = hashlib.sha256()
+        for part in (normalize_sketch(sketch_text), fqbn, fingerprint):
+            digest.update(part.encode('utf-8'))
+            digest.update(b'\0')
+        return digest.hexdigest()
+
+    def get(self, key):
+        """Retorna la ruta del .hex guardado para la clave, o None."""
+        path = self._path(key)
+        try:
+            # La fecha de modificación marca el último uso (orden LRU)
+            os.utime(path)
+        except OSError:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return path
+
+    def put(self, key, hex_path):
+        """Copia un .hex recién compilado a la caché y desaloja si hace falta."""
+        os.makedirs(self.directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        os.close(fd)
+        try:
+            shutil.copyfile(hex_path, tmp_path)
+            os.replace(tmp_path, self._path(key))
+        except OSError:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        self.evict()
+        return self._path(key)
+
+    def evict(self):
+        """Borra las entradas menos usadas hasta quedar dentro de max_bytes."""
+        entries = []
+        try:
+            names = os.listdir(self.directory)
+        except OSError:
+            return
+        for name in names:
+            if not name.endswith('.hex'):
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime_ns, stat.st_size, path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+
+    def clear(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def size(self):
+        try:
+            return sum(entry.stat().st_size for entry in os.scandir(self.directory)
+                       if entry.name.endswith('.hex'))
+        except OSError:
+            return 0
+
+    def _path(self, key):
+        return os.path.join(self.directory, key + '.hex')
@@ -0,0 +1,48 @@
+"""
+Carpetas de compilación aisladas por ventana
+
+Cada ventana del IDE recibe su propio BuildWorkspace: una carpeta temporal
+con el sketch generado y la carpeta build de arduino-builder. Así dos
+ventanas no se pisan el extracted_code.ino ni el .hex. El núcleo de Arduino
+precompilado se guarda aparte, en la CoreCache del usuario y separado por
+placa (FQBN), para reutilizarlo entre ventanas y sesiones. Esa carpeta sí es
+compartida: mientras el núcleo de una placa no existe, las compilaciones que
+lo crearían (de cualquier ventana o de la precompilación) se turnan con
+CoreCache.build_lock.
+
+Estructura:
+
+    <temporal>/fabblocks_build_XXXX/
+        extracted_code/extracted_code.ino
+        build/extracted_code.ino.hex
+
+Autor: Código Abierto Fab Blocks IDE
+Licencia: MIT
+"""
+import os
+import shutil
+import tempfile
+
+from core.core_cache import CoreCache
+
+SKETCH_NAME = 'extracted_code'
+
+
+class BuildWorkspace:
+    def __init__(self, root=None, core_cache=None):
+        self.root = tempfile.mkdtemp(prefix='fabblocks_build_', dir=root)
+        self.core_cache = core_cache or CoreCache()
+        self.sketch_dir = os.path.join(self.root, SKETCH_NAME)
+        self.sketch_path = os.path.join(self.sketch_dir, SKETCH_NAME + '.ino')
+        self.build_path = os.path.join(self.root, 'build')
+        self.hex_path = os.path.join(self.build_path, SKETCH_NAME + '.ino.hex')
+        os.makedirs(self.sketch_dir, exist_ok=True)
+        os.makedirs(self.build_path, exist_ok=True)
+
+    def core_cache_dir(self, fqbn):
+        """Carpeta persistente del núcleo precompilado de una placa."""
+        return self.core_cache.directory(fqbn)
+
+    def close(self):
+        """Borra la carpeta temporal (la caché de núcleos se conserva)."""
+        shutil.rmtree(self.root, ignore_errors=True)
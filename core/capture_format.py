@@ -0,0 +1,138 @@
+"""
+Formato binario columnar para capturas del graficador (.fabcap)
+
+Estructura del archivo (little-endian):
+
+    MAGIC                8 bytes  b'FABCAP01'
+    largo del encabezado uint32
+    encabezado           JSON utf-8: {"version": 1, "rows": N, "columns": [...]}
+    relleno              hasta múltiplo de 8 bytes
+    tiempo               float64[N]
+    valores              float32[N] por cada columna, una tras otra
+
+Como las columnas quedan contiguas, load_capture las abre con np.memmap sin
+leer ni convertir texto.
+
+Durante la captura CaptureWriter agrega bloques de filas a un archivo
+temporal (<ruta>.part), ya que pueden aparecer variables nuevas a mitad de la
+sesión; al cerrar se reescribe en formato columnar y se borra el temporal.
+
+Autor: Código Abierto Fab Blocks IDE
+Licencia: MIT
+"""
+import json
+import os
+import struct
+from collections import namedtuple
+
+import numpy as np
+
+MAGIC = b'FABCAP01'
+CAPTURE_EXTENSION = '.fabcap'
+
+# Captura cargada: nombres de columnas, tiempos (N,) y valores (columnas, N)
+Capture = namedtuple('Capture', ['columns', 'time', 'values'])
+
+_CHUNK_HEADER = struct.Struct('<II')
+
+
+class CaptureWriter:
+    def __init__(self, path):
+        self.path = path
+        self.columns = []
+        self.rows = 0
+        self._part_path = path + '.part'
+        self._part = open(self._part_path, 'wb')
+
+    def append(self, times, values, columns):
+        """
+        Agrega un bloque de filas.
+
+        Args:
+            times (array): Tiempos, forma (n,)
+            values (array): Valores, forma (n, len(columns))
+            columns (list): Nombres de todas las columnas conocidas hasta ahora
+        """
+        times = np.asarray(times, dtype='<f8')
+        values = np.asarray(values, dtype='<f4').reshape(len(times), -1)
+        if not len(times):
+            return
+        if len(columns) > len(self.columns):
+            self.columns = list(columns)
+        self._part.write(_CHUNK_HEADER.pack(len(times), values.shape[1]))
+        self._part.write(times.tobytes())
+        self._part.write(np.ascontiguousarray(values).tobytes())
+        self.rows += len(times)
+
+    def close(self):
+        """Convierte los bloques al formato columnar final y retorna la ruta."""
+        self._part.close()
+        columns = len(self.columns)
+        header = json.dumps({'version': 1, 'rows': self.rows, 'columns': self.columns}).encode('utf-8')
+        data_offset = _aligned(len(MAGIC) + 4 + len(header))
+        total = data_offset + self.rows * (8 + 4 * columns)
+
+        with open(self.path, 'wb') as out:
+            out.write(MAGIC)
+            out.write(struct.pack('<I', len(header)))
+            out.write(header)
+            out.truncate(total)
+        if self.rows:
+            time_col = np.memmap(self.path, dtype='<f8', mode='r+', offset=data_offset, shape=(self.rows,))
+            value_cols = None
+            if columns:
+                value_cols = np.memmap(self.path, dtype='<f4', mode='r+',
+                                       offset=data_offset + 8 * self.rows, shape=(columns, self.rows))
+            row = 0
+            with open(self._part_path, 'rb') as part:
+                while True:
+                    chunk = part.read(_CHUNK_HEADER.size)
+                    if not chunk:
+                        break
+                    n, cols = _CHUNK_HEADER.unpack(chunk)
+                    time_col[row:row + n] = np.frombuffer(part.read(8 * n), dtype='<f8')
+                    block = np.frombuffer(part.read(4 * n * cols), dtype='<f4').reshape(n, cols)
+                    if value_cols is not None:
+                        value_cols[:cols, row:row + n] = block.T
+                        value_cols[cols:, row:row + n] = np.nan
+                    row += n
+            time_col.flush()
+            del time_col
+            if value_cols is not None:
+                value_cols.flush()
+                del value_cols
+        os.remove(self._part_path)
+        return self.path
+
+
+def load_capture(path):
+    """
+    Abre una captura .fabcap sin copiar los datos (np.memmap de solo lectura).
+
+    Returns:
+        Capture: columnas, tiempos (N,) float64 y valores (columnas, N) float32
+
+    Raises:
+        ValueError: Si el archivo no es una captura válida
+    """
+    with open(path, 'rb') as file:
+        if file.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path} no es una captura {CAPTURE_EXTENSION}")
+        (header_len,) = struct.unpack('<I', file.read(4))
+        header = json.loads(file.read(header_len).decode('utf-8'))
+    rows = header['rows']
+    columns = header['columns']
+    if not rows:
+        return Capture(columns, np.empty(0), np.empty((len(columns), 0), dtype=np.float32))
+    data_offset = _aligned(len(MAGIC) + 4 + header_len)
+    time = np.memmap(path, dtype='<f8', mode='r', offset=data_offset, shape=(rows,))
+    if columns:
+        values = np.memmap(path, dtype='<f4', mode='r', offset=data_offset + 8 * rows,
+                           shape=(len(columns), rows))
+    else:
+        values = np.empty((0, rows), dtype=np.float32)
+    return Capture(columns, time, values)
+
+
+def _aligned(offset, alignment=8):
+    return (offset + alignment - 1) // alignment * alignment
@@ -0,0 +1,229 @@
+"""
+Generación de código Arduino a partir de proyectos .fab sin ventana
+
+El generador de código es el de Blockly (Blockly.Arduino, en html/), así que
+convertir un .fab en sketch necesita un motor JavaScript con el editor
+cargado. CodeGenerator lo hace sin interfaz y evitando arrancarlo cuando se
+puede:
+
+- un .ino se usa tal cual, sin generar nada;
+- el código generado se guarda en GeneratedCodeCache con una clave que
+  combina el XML del proyecto y la huella de los archivos del editor, así
+  que mientras html/ no cambie cada proyecto se genera una sola vez;
+- si hace falta generar, WebEngineGenerator abre una única página
+  QWebEnginePage fuera de pantalla (la primera vez que se necesita) y la
+  reutiliza para todos los proyectos de la ejecución.
+
+    generator = CodeGenerator(resource_path('html'))
+    code = generator.generate_file('examples/Arduino/01-variables.fab')
+    generator.close()
+
+Autor: Código Abierto Fab Blocks IDE
+Licencia: MIT
+"""
+import hashlib
+import json
+import os
+
+from core.build_cache import user_cache_dir
+
+# Tiempo máximo para cargar el editor o generar un proyecto (segundos)
+ENGINE_TIMEOUT = 30.0
+
+_ENGINE_EXTENSIONS = ('.js', '.html', '.json')
+
+
+def engine_fingerprint(html_dir):
+    """
+    Huella de los archivos del editor (ruta, fecha y tamaño de .js, .html y
+    .json). Cambia al actualizar el motor y con eso invalida el código
+    generado.
+    """
+    digest = hashlib.sha256()
+    for root, dirs, files in os.walk(html_dir):
+        dirs.sort()
+        for name in sorted(files):
+            if not name.endswith(_ENGINE_EXTENSIONS):
+                continue
+            path = os.path.join(root, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            relative = os.path.relpath(path, html_dir).replace(os.sep, '/')
+            digest.update(f'{relative}:{stat.st_mtime_ns}:{stat.st_size}\n'.encode())
+    return digest.hexdigest()[:16]
+
+
+class GeneratedCodeCache:
+    """Código generado por proyecto, guardado como <clave>.ino."""
+
+    def __init__(self, directory=None):
+        self.directory = directory or user_cache_dir('generated')
+        os.makedirs(self.directory, exist_ok=True)
+
+    @staticmethod
+    def key(xml, fingerprint):
+        digest = hashlib.sha256()
+        digest.update(xml.strip().encode('utf-8'))
+        digest.update(b'\0')
+        digest.update(fingerprint.encode())
+        return digest.hexdigest()
+
+    def get(self, key):
+        try:
+            with open(self._path(key), encoding='utf-8') as file:
+                return file.read()
+        except OSError:
+            return None
+
+    def put(self, key, code):
+        # Escritura atómica: otro proceso puede estar leyendo la misma clave
+        path = self._path(key)
+        temp_path = f'{path}.{os.getpid()}.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as file:
+            file.write(code)
+        os.replace(temp_path, path)
+
+    def _path(self, key):
+        return os.path.join(self.directory, f'{key}.ino')
+
+
+class WebEngineGenerator:
+    """Editor de Blockly cargado en una página fuera de pantalla."""
+
+    def __init__(self, html_dir, timeout=ENGINE_TIMEOUT):
+        self.html_dir = html_dir
+        self.timeout = timeout
+        self._app = None
+        self._page = None
+        self._server = None
+        # Si el editor no arrancó no se reintenta en cada proyecto
+        self._error = None
+
+    def generate(self, xml):
+        """Carga el XML en el workspace y retorna Blockly.Arduino.workspaceToCode."""
+        if self._error is not None:
+            raise RuntimeError(self._error)
+        if self._page is None:
+            try:
+                self._start()
+            except RuntimeError as e:
+                self._error = str(e)
+                self.close()
+                raise
+        # json.dumps produce un literal de cadena JavaScript válido
+        code = self._evaluate(f'''
+            (function() {{
+                try {{
+                    var workspace = Blockly.getMainWorkspace();
+                    workspace.clear();
+                    Blockly.Xml.domToWorkspace(workspace, Blockly.Xml.textToDom({json.dumps(xml)}));
+                    return Blockly.Arduino.workspaceToCode(workspace);
+                }} catch (e) {{
+                    return null;
+                }}
+            }})();''')
+        if not isinstance(code, str):
+            raise RuntimeError("El editor no pudo generar el código del proyecto")
+        return code
+
+    def close(self):
+        if self._page is not None:
+            self._page.deleteLater()
+            self._page = None
+        if self._server is not None:
+            self._server.stop()
+            self._server = None
+
+    def _start(self):
+        index = os.path.join(self.html_dir, 'index.html')
+        if not os.path.exists(index):
+            raise RuntimeError(f"No se encontró el editor en {index}")
+        os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+        # QtWebEngineWidgets debe importarse antes de crear la QApplication
+        from PyQt5.QtCore import QUrl
+        try:
+            from PyQt5.QtWebEngineWidgets import QWebEnginePage
+        except ImportError as e:
+            raise RuntimeError(f"QtWebEngine no está disponible: {e}") from e
+        from PyQt5.QtWidgets import QApplication
+        from core.server import LocalHTTPServer
+
+        self._app = QApplication.instance() or QApplication(['fab_cli'])
+        self._server = LocalHTTPServer(directory=self.html_dir, host='127.0.0.1', port=0)
+        self._server.start()
+        if self._server.running:
+            url = QUrl(f'http://127.0.0.1:{self._server.port}/index.html')
+        else:
+            url = QUrl.fromLocalFile(index)
+        self._page = QWebEnginePage()
+        loaded = self._wait(lambda done: (self._page.loadFinished.connect(done), self._page.load(url)))
+        if not loaded:
+            raise RuntimeError(f"No se pudo cargar el editor desde {url.toString()}")
+        ready = self._evaluate('''
+            typeof Blockly !== 'undefined' && !!Blockly.Arduino
+                && !!Blockly.getMainWorkspace();''')
+        if not ready:
+            raise RuntimeError("El editor se cargó sin el generador Blockly.Arduino")
+
+    def _evaluate(self, script):
+        return self._wait(lambda done: self._page.runJavaScript(script, done))
+
+    def _wait(self, start):
+        """Ejecuta start(done) y espera a que se llame done(valor) o al tiempo límite."""
+        from PyQt5.QtCore import QEventLoop, QTimer
+
+        loop = QEventLoop()
+        result = {}
+
+        def done(value):
+            result['value'] = value
+            loop.quit()
+
+        QTimer.singleShot(int(self.timeout * 1000), loop.quit)
+        start(done)
+        if 'value' not in result:
+            loop.exec_()
+        if 'value' not in result:
+            raise RuntimeError(f"Tiempo agotado esperando al editor ({self.timeout:.0f} s)")
+        return result['value']
+
+
+class CodeGenerator:
+    def __init__(self, html_dir, cache=None, engine=None):
+        """
+        Args:
+            html_dir (str): Carpeta del editor (html/)
+            cache (GeneratedCodeCache): Caché del código; None usa la del usuario
+            engine: Objeto con generate(xml) y close(); None usa WebEngineGenerator
+        """
+        self.html_dir = html_dir
+        self.cache = cache or GeneratedCodeCache()
+        self.engine = engine
+        self._fingerprint = None
+
+    def generate_file(self, path):
+        """Retorna el sketch de un .fab o .ino. Lanza RuntimeError si no se puede generar."""
+        with open(path, encoding='utf-8') as file:
+            content = file.read()
+        if path.lower().endswith('.ino'):
+            return content
+        return self.generate(content)
+
+    def generate(self, xml):
+        if self._fingerprint is None:
+            self._fingerprint = engine_fingerprint(self.html_dir)
+        key = self.cache.key(xml, self._fingerprint)
+        code = self.cache.get(key)
+        if code is not None:
+            return code
+        if self.engine is None:
+            self.engine = WebEngineGenerator(self.html_dir)
+        code = self.engine.generate(xml)
+        self.cache.put(key, code)
+        return code
+
+    def close(self):
+        if self.engine is not None:
+            self.engine.close()
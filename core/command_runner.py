@@ -1,15 +1,179 @@
-from PyQt5.QtCore import QThread, pyqtSignal
+"""
+Ejecución de comandos externos (arduino-builder, avrdude) en segundo plano
+
+CommandRunner ejecuta un comando (lista de argumentos, sin shell) en un
+hilo propio y:
+
+- lee la salida en bloques y emite output_received una vez por bloque con
+  todas las líneas completas que llegaron, en lugar de una señal por línea;
+- informa el código de salida y la duración con completed(código, segundos);
+  el código es None si el programa no se pudo iniciar;
+- cancela el comando junto con todos sus procesos hijos: en POSIX el
+  comando corre en su propio grupo de procesos y se mata el grupo; en
+  Windows se usa taskkill /T sobre el árbol de procesos;
+- con lock (un FileLock) espera a tomar el bloqueo antes de iniciar el
+  comando y lo suelta al terminar, p. ej. para que una sola compilación a
+  la vez cree el núcleo de una placa (ver CoreCache.build_lock).
+
+Autor: Código Abierto Fab Blocks IDE
+Licencia: MIT
+"""
+import codecs
+import logging
+import os
+import signal
 import subprocess
+import sys
+import time
+from PyQt5.QtCore import QThread, pyqtSignal
+
+# Tamaño máximo de cada lectura de la salida del comando
+READ_CHUNK_BYTES = 64 * 1024
+# Aumento de "nice" de los comandos de prioridad baja (POSIX)
+LOW_PRIORITY_NICE = 10
+# Cada cuánto se revisa la cancelación mientras se espera el bloqueo (segundos)
+LOCK_WAIT_STEP = 0.1
+
 
 class CommandRunner(QThread):
-    output_received = pyqtSignal(str)
+    # Líneas completas leídas en un mismo bloque de salida
+    output_received = pyqtSignal(list)
+    # Porcentaje de avance informado por el comando (ver log_parser)
+    progress_changed = pyqtSignal(float)
+    # Código de salida (None si no se pudo iniciar) y duración en segundos
+    completed = pyqtSignal(object, float)
 
-    def __init__(self, command):
+    def __init__(self, command, low_priority=False, log_parser=None, lock=None, lock_message=None):
         super().__init__()
-        self.command = command
+        self.command = list(command)
+        # Ejecutar con prioridad baja del sistema (p. ej. compilaciones de fondo)
+        self.low_priority = low_priority
+        # Objeto con feed(línea) -> (texto, avance) y finish(), p. ej. BuilderLogParser
+        self.log_parser = log_parser
+        # FileLock que se toma antes de iniciar el comando; lock_message se
+        # muestra si hay que esperarlo
+        self.lock = lock
+        self.lock_message = lock_message
+        self.process = None
+        self.returncode = None
+        self.elapsed = 0.0
+        self._cancelled = False
+
+    @property
+    def succeeded(self):
+        return self.returncode == 0 and not self._cancelled
 
     def run(self):
-        process = subprocess.Popen(self.command, shell=True, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True)
-        for line in process.stdout:
-            self.output_received.emit(line.strip())
+        started = time.monotonic()
+        try:
+            if self._wait_for_lock():
+                self._execute()
+        finally:
+            if self.lock is not None:
+                self.lock.release()
+            self.elapsed = time.monotonic() - started
+            logging.debug(f"{os.path.basename(self.command[0])} terminó con código "
+                          f"{self.returncode} en {self.elapsed:.2f} s")
+            self.completed.emit(self.returncode, self.elapsed)
+
+    def cancel(self):
+        """Detiene el comando y sus hijos; run() termina al cerrarse su salida."""
+        self._cancelled = True
+        if self.process is not None and self.process.poll() is None:
+            self._kill()
+
+    def _wait_for_lock(self):
+        """Toma self.lock si hay uno; retorna False si se canceló mientras esperaba."""
+        if self.lock is None or self.lock.acquire(timeout=0):
+            return True
+        if self.lock_message:
+            self.output_received.emit([self.lock_message])
+        while not self._cancelled:
+            if self.lock.acquire(timeout=LOCK_WAIT_STEP):
+                return True
+        return False
+
+    def _execute(self):
+        kwargs = process_tree_kwargs()
+        if sys.platform == 'win32' and self.low_priority:
+            kwargs['creationflags'] |= subprocess.BELOW_NORMAL_PRIORITY_CLASS
+        try:
+            self.process = subprocess.Popen(self.command, stdout=subprocess.PIPE,
+                                            stderr=subprocess.STDOUT, **kwargs)
+        except OSError as e:
+            self.output_received.emit([f"{self.command[0]}: {e}"])
+            return
+        if self.low_priority and sys.platform != 'win32':
+            # Se baja la prioridad del grupo ya iniciado (incluye a los hijos que
+            # haya creado) en lugar de usar preexec_fn, que no es seguro con hilos
+            try:
+                niceness = os.getpriority(os.PRIO_PROCESS, self.process.pid) + LOW_PRIORITY_NICE
+                os.setpriority(os.PRIO_PGRP, self.process.pid, min(niceness, 19))
+            except OSError as e:
+                logging.debug(f"No se pudo bajar la prioridad de {self.command[0]}: {e}")
+        if self._cancelled:
+            self._kill()
+        decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+        pending = ''
+        fd = self.process.stdout.fileno()
+        while True:
+            chunk = os.read(fd, READ_CHUNK_BYTES)
+            # La última parte sin salto de línea espera al siguiente bloque
+            lines = (pending + decoder.decode(chunk, final=not chunk)).split('\n')
+            pending = lines.pop()
+            if not chunk and pending:
+                lines.append(pending)
+            self._emit_lines(lines)
+            if not chunk:
+                break
+        self.process.stdout.close()
+        self.returncode = self.process.wait()
+        if self.log_parser is not None:
+            self.log_parser.finish()
+
+    def _emit_lines(self, lines):
+        if self.log_parser is not None:
+            progress = None
+            texts = []
+            for line in lines:
+                text, value = self.log_parser.feed(line.strip())
+                if value is not None:
+                    progress = value
+                if text is not None:
+                    texts.append(text)
+            if progress is not None:
+                self.progress_changed.emit(progress)
+            lines = texts
+        else:
+            lines = [line.strip() for line in lines]
+        if lines:
+            self.output_received.emit(lines)
+
+    def _kill(self):
+        kill_process_tree(self.process)
+
+
+def process_tree_kwargs():
+    """
+    Argumentos de Popen para un comando que se puede cancelar con
+    kill_process_tree: en Windows sin consola propia (la salida se muestra en
+    el IDE) y en POSIX con un grupo de procesos propio que incluye a los hijos.
+    """
+    if sys.platform == 'win32':
+        return {'creationflags': subprocess.CREATE_NO_WINDOW}
+    return {'start_new_session': True}
+
+
+def kill_process_tree(process):
+    """Mata un proceso iniciado con process_tree_kwargs() y sus hijos."""
+    if process.poll() is not None:
+        return
+    if sys.platform == 'win32':
+        subprocess.run(['taskkill', '/F', '/T', '/PID', str(process.pid)],
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                       creationflags=subprocess.CREATE_NO_WINDOW)
+        return
+    try:
+        os.killpg(process.pid, signal.SIGKILL)
+    except OSError:
         process.kill()
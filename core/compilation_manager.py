@@ -2,9 +2,10 @@
 Gestión de compilación y carga para Fab Blocks IDE
 
 Este módulo maneja todo el proceso de compilación y carga de código:
-1. Extrae el código del workspace de Blockly
+1. Genera el código directamente del workspace de Blockly (workspaceToCode)
 2. Lo guarda en formato .ino (Arduino)
-3. Compila usando arduino-builder
+3. Compila usando arduino-builder (o reutiliza el .hex de la caché de
+   compilación si el código, la placa y la herramienta no cambiaron)
 4. Carga el binario compilado en la placa mediante avrdude
 
 Flujo de compilación:
@@ -22,15 +23,32 @@ Soporte multiidioma: Utiliza i18n para mensajes de compilación ES/EN
 Autor: Código Abierto Fab Blocks IDE
 Licencia: MIT
 """
+import logging
 import os
+import shutil
 import sys
+import time
 from PyQt5.QtCore import QTimer
-import serial.tools.list_ports
 from core.command_runner import CommandRunner
-from core.utils import release_all_serial_ports
+from core.batch_upload import BatchUploader, DEFAULT_WORKERS, DEFAULT_RETRIES
+from core.builder_log import BuilderLogParser
+from core.port_inventory import get_port_inventory
+from core.port_leases import get_port_leases
+from core.build_cache import BuildCache, normalize_sketch, toolchain_fingerprint
+from core.build_workspace import BuildWorkspace
+from core.core_cache import CoreCache
+from core.compile_pipeline import (CompilePipeline, ACCEPTED, DUPLICATE, format_timings,
+                                   STAGE_WRITE, STAGE_COMPILE, STAGE_UPLOAD)
 from core.i18n import get_text
 
 
+# Sketch vacío para precompilar el núcleo de la placa en segundo plano
+PREWARM_SKETCH = 'void setup() {\n}\n\nvoid loop() {\n}\n'
+
+# Parte de la barra de progreso que corresponde a la compilación (el resto es la carga)
+COMPILE_PROGRESS_SHARE = 80
+
+
 # Mapeo de configuración por placa: especifica CPU, velocidad baudrate, etc.
 BOARD_CPU_MAPPING = {
     'Arduino Uno': {
@@ -66,6 +84,41 @@ BOARD_CPU_MAPPING = {
 }
 
 
+def build_compile_command(arduino_folder, fqbn, workspace):
+    """Construye el comando de arduino-builder (lista de argumentos) para un BuildWorkspace"""
+    exe_ext = '.exe' if sys.platform == 'win32' else ''
+    avr_tools = f'{arduino_folder}/hardware/tools/avr'
+    return [
+        f'{arduino_folder}/arduino-builder{exe_ext}', '-compile', '-logger=machine',
+        '-hardware', f'{arduino_folder}/hardware',
+        '-tools', f'{arduino_folder}/tools-builder',
+        '-tools', avr_tools,
+        '-built-in-libraries', f'{arduino_folder}/libraries',
+        '-fqbn', fqbn, '-vid-pid', '1A86_7523', '-ide-version=10815',
+        '-build-path', workspace.build_path,
+        '-warnings=none', '-build-cache', workspace.core_cache_dir(fqbn),
+        '-prefs=build.warn_data_percentage=75',
+        f'-prefs=runtime.tools.arduinoOTA.path={avr_tools}',
+        f'-prefs=runtime.tools.arduinoOTA-1.3.0.path={avr_tools}',
+        f'-prefs=runtime.tools.avrdude.path={avr_tools}',
+        f'-prefs=runtime.tools.avrdude-6.3.0-arduino17.path={avr_tools}',
+        f'-prefs=runtime.tools.avr-gcc.path={avr_tools}',
+        f'-prefs=runtime.tools.avr-gcc-7.3.0-atmel3.6.1-arduino7.path={avr_tools}',
+        '-verbose', workspace.sketch_path,
+    ]
+
+
+def build_upload_command(arduino_folder, upload_cpu, processor, port, hex_path):
+    """Construye el comando de avrdude (lista de argumentos)"""
+    exe_ext = '.exe' if sys.platform == 'win32' else ''
+    return [
+        f'{arduino_folder}/hardware/tools/avr/bin/avrdude{exe_ext}',
+        f'-C{arduino_folder}/hardware/tools/avr/etc/avrdude.conf',
+        '-v', f'-p{upload_cpu}', f'-c{processor}', f'-P{port}', '-b115200', '-D',
+        f'-Uflash:w:{hex_path}:i',
+    ]
+
+
 class CompilationManager:
     """Gestiona el proceso de compilación y carga"""
     
@@ -74,109 +127,341 @@ class CompilationManager:
         self.config_manager = config_manager
         self.runner_com = None
         self.runner_up = None
+        self.runner_batch = None
+        self._batch_done = 0
         self.progress_timer = None
+        self.core_cache = CoreCache(max_bytes=config_manager.get_number('core_cache_mb') * 1024 * 1024)
+        # Carpeta propia de esta ventana para el sketch y la compilación
+        self.workspace = BuildWorkspace(core_cache=self.core_cache)
+        self.build_cache = BuildCache(max_bytes=config_manager.get_number('build_cache_mb') * 1024 * 1024)
+        # Clave y hora de inicio de la compilación en curso, para guardar su .hex
+        self._pending_cache_key = None
+        self._compile_started = None
+        # Placa y núcleos guardados al iniciar la compilación en curso
+        self._compile_fqbn = None
+        self._core_archives = None
+        # Compilación de fondo que precompila el núcleo de la placa seleccionada
+        self.runner_prewarm = None
+        self.prewarm_workspace = None
+        # Etapas extraer -> escribir -> compilar -> cargar de cada clic
+        self.pipeline = CompilePipeline(on_cancel=self._stop_job)
     
     def compile(self):
         """Inicia el proceso de compilación"""
-        release_all_serial_ports()
+        job = self.pipeline.request()
+        if job is None:
+            return
         self.window.console.clear()
         self.window.write_to_console(get_text('message.compiling'))
         
         selected_board = self.window.combo.currentText()
         self.window.write_to_console(f"{get_text('message.board_selected')} {selected_board}")
         
-        # Extraer código del bloque HTML
-        self.window.webview.page().runJavaScript('''
-            var elements = document.getElementsByClassName('hljs cpp');
-            var info = [];
-            for (var i = 0; i < elements.length; i++) {
-                info.push(elements[i].innerText);
-            }
-            info;
-        ''', self._on_code_extracted_for_compile)
+        # Generar el código desde el workspace de Blockly
+        self._extract_code(lambda code: self._on_code_extracted_for_compile(job, code))
         
         # Mostrar puertos disponibles
-        ports = serial.tools.list_ports.comports()
-        serial_ports = [port.device for port in ports]
+        serial_ports = get_port_inventory().devices()
         self.window.write_to_console(f"{get_text('message.available_ports')} {serial_ports}")
-        
-        self._run_compile()
     
     def upload(self):
         """Inicia el proceso de carga"""
-        release_all_serial_ports()
+        job = self.pipeline.request()
+        if job is None:
+            return
         self.window.console.clear()
         
         # Extraer código primero
-        self.window.webview.page().runJavaScript('''
-            var elements = document.getElementsByClassName('hljs cpp');
-            var info = [];
-            for (var i = 0; i < elements.length; i++) {
-                info.push(elements[i].innerText);
-            }
-            info;
-        ''', self._on_code_extracted_for_upload)
-    
-    def _on_code_extracted_for_compile(self, info):
+        self._extract_code(lambda code: self._on_code_extracted_for_upload(job, code))
+    
+    def upload_batch(self, ports, max_workers=DEFAULT_WORKERS, retries=DEFAULT_RETRIES, listener=None):
+        """
+        Compila una vez y carga el programa en varios puertos en paralelo.
+        
+        Args:
+            ports (list): Puertos de destino
+            max_workers (int): Cargas simultáneas como máximo
+            retries (int): Reintentos por puerto que falla
+            listener: Objeto con attach(uploader), llamado al empezar las
+                cargas, y batch_aborted(), si no llegan a empezar
+        
+        Returns:
+            bool: False si otra compilación todavía está extrayendo el código
+        """
+        job = self.pipeline.request()
+        if job is None:
+            return False
+        job.batch = {'ports': list(ports), 'max_workers': max_workers,
+                     'retries': retries, 'listener': listener}
+        self.window.console.clear()
+        self.window.write_to_console(get_text('message.batch_upload', count=len(job.batch['ports'])))
+        self._extract_code(lambda code: self._on_code_extracted_for_upload(job, code))
+        return True
+    
+    def cancel(self):
+        """Cancela la compilación o carga en curso (menú Programa > Cancelar)."""
+        pending = self.pipeline.pending
+        self.pipeline.cancel()
+        if pending is not None:
+            # Todavía extraía el código: no hay procesos que detener
+            self.window.write_to_console(get_text('message.build_cancelled'))
+            self._batch_aborted(pending)
+    
+    def _extract_code(self, callback):
+        """
+        Obtiene el código del sketch con Blockly.Arduino.workspaceToCode en
+        una sola llamada a JavaScript. Solo si el generador no responde se
+        recurre al texto del panel de código resaltado.
+        """
+        def on_generated(code):
+            if code is None:
+                logging.warning("Generador de Blockly no disponible; se usa el panel de código")
+                self.window.js_bridge.get_cpp_code(callback)
+            else:
+                callback(code)
+        
+        self.window.js_bridge.get_arduino_code(on_generated)
+    
+    def _on_code_extracted_for_compile(self, job, info):
         """Callback cuando el código es extraído para compilar"""
-        from core.file_operations import FileOperations
-        FileOperations.save_extracted_code(info)
+        if self._accept_job(job, info):
+            self._run_compile(job)
     
-    def _on_code_extracted_for_upload(self, info):
+    def _on_code_extracted_for_upload(self, job, info):
         """Callback cuando el código es extraído para cargar"""
+        if self._accept_job(job, info):
+            self.window.write_to_console(get_text('message.compile_first'))
+            self._run_compile(job)
+    
+    def _accept_job(self, job, info):
+        """
+        Decide si el trabajo sigue (descarta clics repetidos y reemplaza un
+        trabajo con código viejo) y escribe el sketch. Retorna True si sigue.
+        """
+        code = '\n'.join(info) if isinstance(info, list) else str(info)
+        ports = tuple(job.batch['ports']) if job.batch else self.window.combo_puertos.currentText()
+        key = (normalize_sketch(code), self.window.combo.currentText(), ports)
+        result = self.pipeline.accept(job, key)
+        if result == DUPLICATE:
+            self.window.write_to_console(get_text('message.build_in_progress'))
+        if result != ACCEPTED:
+            self._batch_aborted(job)
+            return False
+        job.begin(STAGE_WRITE)
         from core.file_operations import FileOperations
-        FileOperations.save_extracted_code(info)
-        self.window.write_to_console(get_text('message.compile_first'))
-        self._run_compile()
+        FileOperations.save_extracted_code(code, self.workspace.sketch_path)
+        return True
+    
+    def _stop_job(self, job):
+        """Detiene los procesos de un trabajo cancelado o reemplazado."""
+        logging.debug(f"Compilación {job.id} cancelada en etapa {job.stage}")
+        for runner in (self.runner_com, self.runner_up, self.runner_batch):
+            if runner and runner.isRunning():
+                runner.cancel()
+                runner.wait()
+        if self.progress_timer:
+            self.progress_timer.stop()
+        self._pending_cache_key = None
+        self._compile_fqbn = None
+        self.window.write_to_console(get_text('message.build_cancelled'))
+        if job.stage != STAGE_UPLOAD:
+            self._batch_aborted(job)
+    
+    def _batch_aborted(self, job):
+        """Avisa que una carga en varias placas terminó antes de empezar las cargas."""
+        if job.batch and job.batch['listener'] is not None:
+            job.batch['listener'].batch_aborted()
     
-    def _run_compile(self):
+    def _run_compile(self, job):
         """Ejecuta la compilación"""
-        self._update_progress()
+        self.window.progress_bar.setValue(0)
         
         selected_board = self.window.combo.currentText()
         board_info = BOARD_CPU_MAPPING.get(selected_board)
         
         if not board_info:
             self.window.write_to_console(f"{get_text('error.unknown_board')} {selected_board}")
+            job.finish()
+            self._batch_aborted(job)
             return
         
         TEXT_CPU = board_info['TEXT_CPU']
-        
-        if self.runner_com and self.runner_com.isRunning():
-            self.runner_com.terminate()
-            self.runner_com.wait()
+        job.begin(STAGE_COMPILE)
         
         arduino_dev = self.config_manager.get_value('compiler_location')
         arduino_folder = os.path.dirname(arduino_dev)
-        current_folder = os.getcwd()
         
-        command = self._build_compile_command(
-            arduino_folder, TEXT_CPU, current_folder
-        )
+        if self._use_cached_build(arduino_folder, TEXT_CPU):
+            self._on_compile_finished(job)
+            return
         
-        self.runner_com = CommandRunner(command)
-        self.runner_com.output_received.connect(self.window.updateOutput)
-        self.runner_com.finished.connect(self._on_compile_finished)
-        self.runner_com.start()
+        command = build_compile_command(arduino_folder, TEXT_CPU, self.workspace)
         
-        self.progress_timer = QTimer(self.window)
-        self.progress_timer.timeout.connect(self._update_progress_bar)
-        self.progress_timer.start(200)
+        self.cancel_prewarm()
+        self._compile_started = time.time()
+        self._compile_fqbn = TEXT_CPU
+        self._core_archives = self.core_cache.archives(TEXT_CPU)
+        # Sin núcleo en la caché, otra ventana o una precompilación pueden estar
+        # creándolo en la misma carpeta: esta compilación espera su turno
+        lock = None if self._core_archives else self.core_cache.build_lock(TEXT_CPU)
+        # El avance y las etapas salen de la salida -logger=machine de arduino-builder
+        log_parser = BuilderLogParser()
+        self.runner_com = CommandRunner(command, log_parser=log_parser, lock=lock,
+                                        lock_message=get_text('message.core_build_wait'))
+        self.runner_com.output_received.connect(self._on_output)
+        self.runner_com.progress_changed.connect(self._on_build_progress)
+        self.runner_com.completed.connect(
+            lambda returncode, seconds: self._on_compile_finished(job, log_parser.timings, returncode))
+        self.runner_com.start()
+    
+    def _on_output(self, lines):
+        """Muestra en la consola un bloque de salida de un comando."""
+        self.window.updateOutput('\n'.join(lines))
+    
+    def _on_build_progress(self, percent):
+        """Avance real de arduino-builder (0-100) en la parte de compilación de la barra."""
+        self.window.progress_bar.setValue(int(percent * COMPILE_PROGRESS_SHARE / 100))
+    
+    def prewarm(self):
+        """
+        Compila en segundo plano, con prioridad baja, un sketch vacío para la
+        placa seleccionada, de modo que su núcleo quede en la caché antes de
+        la primera compilación real. No hace nada si ya hay una compilación
+        en curso o si el núcleo de esa placa ya está compilado.
+        """
+        if self.runner_com and self.runner_com.isRunning():
+            return
+        self.cancel_prewarm()
+        board_info = BOARD_CPU_MAPPING.get(self.window.combo.currentText())
+        arduino_dev = self.config_manager.get_value('compiler_location')
+        if not board_info or not arduino_dev:
+            return
+        fqbn = board_info['TEXT_CPU']
+        if self.core_cache.archives(fqbn):
+            return
+        if self.prewarm_workspace is None:
+            self.prewarm_workspace = BuildWorkspace(core_cache=self.core_cache)
+        from core.file_operations import FileOperations
+        FileOperations.save_extracted_code(PREWARM_SKETCH, self.prewarm_workspace.sketch_path)
+        command = build_compile_command(os.path.dirname(arduino_dev), fqbn, self.prewarm_workspace)
+        logging.debug(f"Precompilando núcleo para {fqbn}")
+        self.runner_prewarm = CommandRunner(command, low_priority=True, lock=self.core_cache.build_lock(fqbn))
+        self.runner_prewarm.start()
+    
+    def cancel_prewarm(self):
+        """Cancela la compilación de fondo si sigue en curso."""
+        if self.runner_prewarm and self.runner_prewarm.isRunning():
+            logging.debug("Precompilación de núcleo cancelada")
+            self.runner_prewarm.cancel()
+            self.runner_prewarm.wait()
+        self.runner_prewarm = None
+    
+    def close(self):
+        """Cancela las compilaciones en curso y borra las carpetas temporales."""
+        self.pipeline.cancel()
+        for runner in (self.runner_com, self.runner_up, self.runner_batch):
+            if runner and runner.isRunning():
+                runner.cancel()
+                runner.wait()
+        self.cancel_prewarm()
+        self.workspace.close()
+        if self.prewarm_workspace is not None:
+            self.prewarm_workspace.close()
+    
+    def _use_cached_build(self, arduino_folder, fqbn):
+        """
+        Busca en la caché un .hex para el sketch y la placa actuales; si
+        existe lo copia a la carpeta build y retorna True.
+        """
+        self._pending_cache_key = None
+        try:
+            with open(self.workspace.sketch_path, 'r') as file:
+                sketch = file.read()
+        except OSError:
+            return False
+        key = self.build_cache.key(sketch, fqbn, toolchain_fingerprint(arduino_folder))
+        cached = self.build_cache.get(key)
+        if cached is None:
+            self._pending_cache_key = key
+            return False
+        try:
+            os.makedirs(self.workspace.build_path, exist_ok=True)
+            shutil.copyfile(cached, self.workspace.hex_path)
+        except OSError:
+            self._pending_cache_key = key
+            return False
+        self.window.write_to_console(get_text('message.build_cache_hit'))
+        return True
+    
+    def _store_build(self):
+        """Guarda en la caché el .hex producido por la compilación que terminó."""
+        key, self._pending_cache_key = self._pending_cache_key, None
+        if key is None:
+            return
+        hex_path = self.workspace.hex_path
+        try:
+            # Solo si el .hex es de esta compilación (no uno anterior que quedó)
+            if os.path.getmtime(hex_path) >= self._compile_started:
+                self.build_cache.put(key, hex_path)
+        except OSError:
+            pass
+    
+    def _record_core_cache(self):
+        """Cuenta si la compilación que terminó reutilizó el núcleo de la placa."""
+        fqbn, self._compile_fqbn = self._compile_fqbn, None
+        if fqbn is not None:
+            self.core_cache.record_build(fqbn, self._core_archives)
     
-    def _on_compile_finished(self):
-        """Callback cuando la compilación finaliza"""
+    def _on_compile_finished(self, job, stage_timings=None, returncode=0):
+        """
+        Callback cuando la compilación finaliza; solo carga si compiló bien.
+        
+        Args:
+            stage_timings (dict): Segundos por etapa de arduino-builder
+                (None si se usó un binario de la caché)
+            returncode (int): Código de salida de arduino-builder (None si
+                no se pudo iniciar)
+        """
+        if not self.pipeline.is_current(job):
+            return
+        if stage_timings:
+            summary = format_timings(stage_timings)
+            logging.info(f"Etapas de compilación {job.id}: {summary}")
+            self.window.write_to_console(get_text('message.build_stages', timings=summary))
+        if returncode != 0:
+            self._pending_cache_key = None
+            self._compile_fqbn = None
+            self.window.write_to_console(get_text('message.compile_failed', code=returncode))
+            self.window.progress_bar.setValue(0)
+            job.finish()
+            self._batch_aborted(job)
+            return
+        self._store_build()
+        self._record_core_cache()
         self.window.write_to_console(get_text('message.then_upload'))
         if self.progress_timer:
             self.progress_timer.stop()
-        self._run_upload()
+        if job.batch:
+            self._run_batch_upload(job)
+        else:
+            self._run_upload(job)
     
-    def _run_upload(self):
+    def _on_upload_finished(self, job, returncode=0):
+        """Callback cuando la carga finaliza: informa el resultado y la duración de cada etapa."""
+        if not self.pipeline.is_current(job):
+            return
+        job.finish()
+        if returncode != 0:
+            self.window.write_to_console(get_text('message.upload_failed', code=returncode))
+        logging.info(f"Compilación {job.id}: {job.summary()}")
+        self.window.write_to_console(get_text('message.stage_timings', timings=job.summary()))
+    
+    def _run_upload(self, job):
         """Ejecuta la carga del código"""
-        self._update_progress()
+        self.window.progress_bar.setValue(COMPILE_PROGRESS_SHARE)
         
         arduino_dev = self.config_manager.get_value('compiler_location')
         arduino_folder = os.path.dirname(arduino_dev)
-        current_folder = os.getcwd()
         
         selected_board = self.window.combo.currentText()
         selected_port = self.window.combo_puertos.currentText()
@@ -185,61 +470,81 @@ class CompilationManager:
         
         if not board_info:
             self.window.write_to_console(f"{get_text('error.unknown_board')} {selected_board}")
+            job.finish()
             return
         
+        job.begin(STAGE_UPLOAD)
         TEXT_CPU = board_info['UPLOAD_CPU']
         PROCESSOR = board_info['PROCESSOR']
         
-        command = self._build_upload_command(
-            arduino_folder, TEXT_CPU, PROCESSOR, selected_port, current_folder
+        self._release_ports([selected_port])
+        
+        command = build_upload_command(
+            arduino_folder, TEXT_CPU, PROCESSOR, selected_port, self.workspace.hex_path
         )
         
         self.runner_up = CommandRunner(command)
-        self.runner_up.output_received.connect(self.window.updateOutput)
+        self.runner_up.output_received.connect(self._on_output)
+        self.runner_up.completed.connect(lambda returncode, seconds: self._on_upload_finished(job, returncode))
         self.runner_up.start()
         
         self.progress_timer = QTimer(self.window)
         self.progress_timer.timeout.connect(self._update_progress_bar)
         self.progress_timer.start(200)
     
-    def _build_compile_command(self, arduino_folder, text_cpu, current_folder):
-        """Construye el comando de compilación"""
-        exe_ext = '.exe' if sys.platform == 'win32' else ''
-        return (f'{arduino_folder}/arduino-builder{exe_ext} -compile -logger=machine '
-                f'-hardware {arduino_folder}/hardware '
-                f'-tools {arduino_folder}/tools-builder '
-                f'-tools {arduino_folder}/hardware/tools/avr '
-                f'-built-in-libraries {arduino_folder}/libraries '
-                f'-fqbn {text_cpu} -vid-pid 1A86_7523 -ide-version=10815 '
-                f'-build-path {current_folder}/build '
-                f'-warnings=none -build-cache {current_folder}/Temp/arduino_cache_914083 '
-                f'-prefs=build.warn_data_percentage=75 '
-                f'-prefs=runtime.tools.arduinoOTA.path={arduino_folder}/hardware/tools/avr '
-                f'-prefs=runtime.tools.arduinoOTA-1.3.0.path={arduino_folder}/hardware/tools/avr '
-                f'-prefs=runtime.tools.avrdude.path={arduino_folder}/hardware/tools/avr '
-                f'-prefs=runtime.tools.avrdude-6.3.0-arduino17.path={arduino_folder}/hardware/tools/avr '
-                f'-prefs=runtime.tools.avr-gcc.path={arduino_folder}/hardware/tools/avr '
-                f'-prefs=runtime.tools.avr-gcc-7.3.0-atmel3.6.1-arduino7.path={arduino_folder}/hardware/tools/avr '
-                f'-verbose {current_folder}/extracted_code.ino')
-    
-    def _build_upload_command(self, arduino_folder, text_cpu, processor, 
-                              selected_port, current_folder):
-        """Construye el comando de carga"""
-        exe_ext = '.exe' if sys.platform == 'win32' else ''
-        return (f'{arduino_folder}/hardware/tools/avr/bin/avrdude{exe_ext} '
-                f'-C{arduino_folder}/hardware/tools/avr/etc/avrdude.conf '
-                f'-v -p{text_cpu} -c{processor} -P{selected_port} -b115200 -D '
-                f'-Uflash:w:{current_folder}/build/extracted_code.ino.hex:i')
-    
-    def _update_progress(self):
-        """Actualiza la barra de progreso"""
-        current_value = 0
-        target_value = 80
-        step = 40
+    def _run_batch_upload(self, job):
+        """Carga el binario compilado en todos los puertos del trabajo, en paralelo."""
+        self.window.progress_bar.setValue(COMPILE_PROGRESS_SHARE)
+        arduino_folder = os.path.dirname(self.config_manager.get_value('compiler_location'))
+        board_info = BOARD_CPU_MAPPING[self.window.combo.currentText()]
+        upload_cpu = board_info['UPLOAD_CPU']
+        processor = board_info['PROCESSOR']
+        ports = job.batch['ports']
         
-        if current_value < target_value:
-            new_value = current_value + step
-            self.window.progress_bar.setValue(new_value)
+        job.begin(STAGE_UPLOAD)
+        self._release_ports(ports)
+        
+        def make_command(port):
+            return build_upload_command(arduino_folder, upload_cpu, processor, port, self.workspace.hex_path)
+        
+        self._batch_done = 0
+        self.runner_batch = BatchUploader(ports, make_command, job.batch['max_workers'], job.batch['retries'])
+        self.runner_batch.port_finished.connect(self._on_batch_port_finished)
+        self.runner_batch.finished.connect(lambda: self._on_batch_finished(job))
+        if job.batch['listener'] is not None:
+            job.batch['listener'].attach(self.runner_batch)
+        self.runner_batch.start()
+    
+    def _on_batch_port_finished(self, port, ok, attempts, seconds):
+        """Informa el resultado de un puerto y avanza la parte de carga de la barra."""
+        key = 'message.batch_port_ok' if ok else 'message.batch_port_failed'
+        self.window.write_to_console(get_text(key, port=port, attempts=attempts, seconds=f'{seconds:.1f}'))
+        self._batch_done += 1
+        total = len(self.runner_batch.ports)
+        self.window.progress_bar.setValue(
+            COMPILE_PROGRESS_SHARE + (100 - COMPILE_PROGRESS_SHARE) * self._batch_done // total)
+    
+    def _on_batch_finished(self, job):
+        """Resumen de la carga en varias placas."""
+        if not self.pipeline.is_current(job):
+            return
+        failed = self.runner_batch.failed_ports()
+        total = len(self.runner_batch.ports)
+        self.window.write_to_console(get_text('message.batch_summary', ok=total - len(failed), total=total))
+        if failed:
+            self.window.write_to_console(get_text('message.batch_failed_ports', ports=', '.join(failed)))
+        self._on_upload_finished(job)
+    
+    def _release_ports(self, ports):
+        """
+        Cierra los puertos de destino que este proceso tiene abiertos (p. ej.
+        el monitor). Los puertos se liberan a la vez, cada uno con su plazo.
+        """
+        for port, (released, failed) in get_port_leases().release_many(ports).items():
+            for owner in released:
+                self.window.write_to_console(get_text('message.port_released', port=port, owner=owner))
+            for owner in failed:
+                self.window.write_to_console(get_text('message.port_release_failed', port=port, owner=owner))
     
     def _update_progress_bar(self):
         """Actualiza la barra de progreso gradualmente"""
@@ -0,0 +1,162 @@
+"""
+Canal de compilación por etapas
+
+Cada clic en Compilar o Subir crea un CompileJob que avanza por las etapas
+extraer -> escribir -> compilar -> cargar. CompilePipeline decide qué
+trabajo manda:
+
+- Un clic mientras otro trabajo todavía extrae el código se descarta
+  (ambos leerían el mismo workspace). Si la extracción no responde en
+  EXTRACT_TIMEOUT segundos (p. ej. la página se recargó y el callback de
+  JavaScript nunca llega), ese trabajo se da por perdido y el clic vale.
+- Cuando el código extraído, la placa y el puerto son iguales a los del
+  trabajo en curso, el nuevo trabajo se descarta: ya se está compilando
+  exactamente eso.
+- Si son distintos, el trabajo en curso se cancela (on_cancel detiene sus
+  procesos) y el nuevo toma su lugar, para no gastar tiempo en código viejo.
+
+Las etapas de un trabajo cancelado o reemplazado se ignoran al terminar
+(ver is_current). Cada trabajo mide la duración de sus etapas.
+
+Autor: Código Abierto Fab Blocks IDE
+Licencia: MIT
+"""
+import time
+
+STAGE_EXTRACT = 'extract'
+STAGE_WRITE = 'write'
+STAGE_COMPILE = 'compile'
+STAGE_UPLOAD = 'upload'
+
+# Resultados de CompilePipeline.accept
+ACCEPTED = 'accepted'
+DUPLICATE = 'duplicate'
+STALE = 'stale'
+
+# Tiempo máximo de la extracción antes de aceptar otro clic (segundos)
+EXTRACT_TIMEOUT = 10.0
+
+
+def format_timings(timings):
+    """Duraciones en texto, p. ej. 'extract 12 ms, compile 3.40 s'."""
+    parts = []
+    for stage, seconds in timings.items():
+        if seconds < 1:
+            parts.append(f'{stage} {seconds * 1000:.0f} ms')
+        else:
+            parts.append(f'{stage} {seconds:.2f} s')
+    return ', '.join(parts)
+
+
+class CompileJob:
+    def __init__(self, job_id, clock=time.perf_counter):
+        self.id = job_id
+        self.key = None
+        self.stage = None
+        self.timings = {}
+        self.cancelled = False
+        self.done = False
+        # Opciones de la carga en varias placas (None para un solo puerto)
+        self.batch = None
+        self._clock = clock
+        self._stage_started = None
+
+    @property
+    def active(self):
+        return not (self.cancelled or self.done)
+
+    def begin(self, stage):
+        """Cierra la etapa actual (guardando su duración) y empieza otra."""
+        self._end_stage()
+        self.stage = stage
+        self._stage_started = self._clock()
+
+    def finish(self):
+        self._end_stage()
+        self.done = True
+
+    def cancel(self):
+        self._end_stage()
+        self.cancelled = True
+
+    def summary(self):
+        return format_timings(self.timings)
+
+    def _end_stage(self):
+        if self.stage is not None:
+            elapsed = self._clock() - self._stage_started
+            self.timings[self.stage] = self.timings.get(self.stage, 0.0) + elapsed
+        self.stage = None
+
+
+class CompilePipeline:
+    def __init__(self, on_cancel=None, clock=time.perf_counter):
+        """
+        Args:
+            on_cancel (callable): on_cancel(job), detiene los procesos de un
+                trabajo que fue cancelado o reemplazado
+        """
+        self.on_cancel = on_cancel
+        self.current = None
+        self.pending = None
+        self._pending_since = None
+        self._clock = clock
+        self._next_id = 0
+
+    def request(self):
+        """
+        Registra un clic. Retorna el nuevo trabajo (ya en la etapa de
+        extracción) o None si otro trabajo está extrayendo el código desde
+        hace menos de EXTRACT_TIMEOUT segundos.
+        """
+        if self.pending is not None:
+            if self._clock() - self._pending_since < EXTRACT_TIMEOUT:
+                return None
+            # Su resultado, si llega, se descarta como STALE
+            self.pending.cancel()
+        self._next_id += 1
+        job = CompileJob(self._next_id, self._clock)
+        job.begin(STAGE_EXTRACT)
+        self.pending = job
+        self._pending_since = self._clock()
+        return job
+
+    def accept(self, job, key):
+        """
+        Recibe el resultado de la extracción de un trabajo.
+
+        Args:
+            key: Identifica lo que se va a compilar (código, placa, puerto)
+
+        Returns:
+            str: ACCEPTED si el trabajo sigue, DUPLICATE si el trabajo en
+                curso ya compila lo mismo, STALE si fue cancelado
+        """
+        if job is not self.pending:
+            return STALE
+        self.pending = None
+        job.key = key
+        if self.current is not None and self.current.active:
+            if self.current.key == key:
+                job.cancel()
+                return DUPLICATE
+            self._cancel(self.current)
+        self.current = job
+        return ACCEPTED
+
+    def is_current(self, job):
+        return job is self.current and job.active
+
+    def cancel(self):
+        """Cancela el trabajo en extracción y el trabajo en curso."""
+        if self.pending is not None:
+            self.pending.cancel()
+            self.pending = None
+        if self.current is not None and self.current.active:
+            self._cancel(self.current)
+
+    def _cancel(self, job):
+        # on_cancel recibe el trabajo todavía en su etapa, antes de marcarlo
+        if self.on_cancel is not None:
+            self.on_cancel(job)
+        job.cancel()
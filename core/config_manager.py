@@ -1,4 +1,18 @@
 import json
+import logging
+
+# Ajustes numéricos de config.json: (valor por defecto, mínimo, máximo).
+# Se muestran en Preferencias y se documentan en el README.
+NUMERIC_SETTINGS = {
+    # Muestras por canal que conserva el gráfico serial (plot_buffer.DEFAULT_CAPACITY)
+    'plot_capacity': (200000, 1000, 5000000),
+    # Cuadros por segundo del gráfico serial (monitor_plotter.RENDER_FPS)
+    'plot_fps': (30, 5, 120),
+    # Tamaño máximo de la caché de núcleos precompilados, en MB
+    'core_cache_mb': (256, 32, 4096),
+    # Tamaño máximo de la caché de programas compilados (.hex), en MB
+    'build_cache_mb': (64, 8, 4096),
+}
 
 class ConfigManager:
     def __init__(self, filename='config.json'):
@@ -23,6 +37,20 @@ class ConfigManager:
     def get_value(self, key):
         return self.data.get(key, None)
 
+    # Obtener un ajuste de NUMERIC_SETTINGS ajustado a su rango
+    def get_number(self, key):
+        default, minimum, maximum = NUMERIC_SETTINGS[key]
+        value = self.data.get(key)
+        if value is None:
+            return default
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            logging.warning(f"config.json: {key}={value!r} no es un número; se usa {default}")
+            return default
+        clamped = int(min(max(value, minimum), maximum))
+        if clamped != value:
+            logging.warning(f"config.json: {key}={value!r} fuera de [{minimum}, {maximum}]; se usa {clamped}")
+        return clamped
+
     # Establecer el valor de una clave de configuración
     def set_value(self, key, value):
         self.data[key] = value
@@ -0,0 +1,175 @@
+"""
+Consola de salida con escritura por cuadro para Fab Blocks IDE
+
+Una compilación con -verbose imprime miles de líneas. Agregarlas una por una
+a un QTextEdit provoca un reacomodo del documento por línea y congela la
+ventana. ConsoleView:
+
+- junta las líneas recibidas y las escribe una vez por cuadro (FRAME_MS)
+  con una sola inserción del cursor;
+- conserva solo las últimas max_lines líneas: el documento descarta las más
+  antiguas (maximumBlockCount) y las pendientes van en un deque acotado;
+- guarda la salida completa en un archivo de registro y, cuando se
+  descartaron líneas, muestra un enlace para abrirlo. Los registros quedan
+  en la caché del usuario después de cerrar la ventana; al crear uno nuevo
+  se borran los más antiguos, dejando los últimos MAX_KEPT_LOGS.
+
+Mantiene append() y clear() de QTextEdit, que es lo que usa el resto del IDE.
+
+Autor: Código Abierto Fab Blocks IDE
+Licencia: MIT
+"""
+import logging
+import os
+from collections import deque
+
+from PyQt5.QtCore import QTimer, QUrl
+from PyQt5.QtGui import QTextCursor
+from PyQt5.QtWidgets import QWidget, QTextEdit, QLabel, QVBoxLayout
+
+from core.build_cache import user_cache_dir
+from core.i18n import get_text
+
+# Líneas que conserva la consola antes de descartar las más antiguas
+DEFAULT_CONSOLE_LINES = 5000
+# Intervalo entre escrituras en pantalla (~60 cuadros por segundo)
+FRAME_MS = 16
+# Registros de consola que se conservan en log_dir (de todas las ventanas)
+MAX_KEPT_LOGS = 20
+
+_log_counter = 0
+
+
+class ConsoleView(QWidget):
+    def __init__(self, parent=None, max_lines=DEFAULT_CONSOLE_LINES, log_dir=None):
+        super().__init__(parent)
+        self.max_lines = max_lines
+        self.log_dir = log_dir or user_cache_dir('logs')
+        self.log_path = None
+        self._log_file = None
+        self._log_failed = False
+        self._pending = deque(maxlen=max_lines)
+        self._total_lines = 0
+        self._shown_lines = 0
+
+        self.text_edit = QTextEdit(self)
+        self.text_edit.setReadOnly(True)
+        self.text_edit.setUndoRedoEnabled(False)
+        self.text_edit.document().setMaximumBlockCount(max_lines)
+
+        self.log_link = QLabel(self)
+        self.log_link.setOpenExternalLinks(True)
+        self.log_link.hide()
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.setSpacing(0)
+        layout.addWidget(self.text_edit)
+        layout.addWidget(self.log_link)
+
+        self._flush_timer = QTimer(self)
+        self._flush_timer.setSingleShot(True)
+        self._flush_timer.setInterval(FRAME_MS)
+        self._flush_timer.timeout.connect(self.flush)
+
+    def append(self, text):
+        """Agrega una o más líneas (separadas por saltos de línea); se muestran en el próximo cuadro."""
+        lines = str(text).split('\n')
+        self._pending.extend(lines)
+        self._total_lines += len(lines)
+        self._write_log(lines)
+        if not self._flush_timer.isActive():
+            self._flush_timer.start()
+
+    def flush(self):
+        """Escribe las líneas pendientes con una sola inserción."""
+        self._flush_timer.stop()
+        if self._log_file is not None:
+            self._log_file.flush()
+        if not self._pending:
+            return
+        text = '\n'.join(self._pending)
+        self._pending.clear()
+        scrollbar = self.text_edit.verticalScrollBar()
+        at_bottom = scrollbar.value() >= scrollbar.maximum() - 4
+        cursor = QTextCursor(self.text_edit.document())
+        cursor.movePosition(QTextCursor.End)
+        if self._shown_lines:
+            text = '\n' + text
+        cursor.insertText(text)
+        self._shown_lines = self._total_lines
+        if at_bottom:
+            scrollbar.setValue(scrollbar.maximum())
+        if self._total_lines > self.max_lines and self.log_path and self.log_link.isHidden():
+            url = QUrl.fromLocalFile(self.log_path).toString()
+            self.log_link.setText(f'<a href="{url}">{get_text("console.full_log")}</a>')
+            self.log_link.show()
+
+    def clear(self):
+        """Vacía la consola y empieza un registro nuevo."""
+        self._flush_timer.stop()
+        self._pending.clear()
+        self._total_lines = 0
+        self._shown_lines = 0
+        self.text_edit.clear()
+        self.log_link.hide()
+        if self._log_file is not None:
+            self._log_file.seek(0)
+            self._log_file.truncate()
+
+    def toPlainText(self):
+        self.flush()
+        return self.text_edit.toPlainText()
+
+    def close_log(self):
+        """Cierra el archivo de registro (al cerrar la ventana); el archivo se conserva."""
+        if self._log_file is None:
+            return
+        self._log_file.close()
+        self._log_file = None
+
+    def change_language(self):
+        if not self.log_link.isHidden():
+            url = QUrl.fromLocalFile(self.log_path).toString()
+            self.log_link.setText(f'<a href="{url}">{get_text("console.full_log")}</a>')
+
+    def _write_log(self, lines):
+        if self._log_file is None and not self._open_log():
+            return
+        self._log_file.write('\n'.join(lines) + '\n')
+
+    def _open_log(self):
+        global _log_counter
+        if self._log_failed:
+            return False
+        _log_counter += 1
+        path = os.path.join(self.log_dir, f'console-{os.getpid()}-{_log_counter}.log')
+        try:
+            os.makedirs(self.log_dir, exist_ok=True)
+            _prune_logs(self.log_dir, MAX_KEPT_LOGS - 1)
+            self._log_file = open(path, 'w', encoding='utf-8')
+        except OSError as e:
+            logging.warning(f"No se pudo crear el registro de la consola: {e}")
+            # No volver a intentarlo en cada línea
+            self._log_failed = True
+            return False
+        self.log_path = path
+        return True
+
+
+def _prune_logs(log_dir, keep):
+    """Borra los registros de consola más antiguos hasta dejar keep."""
+    logs = []
+    for entry in os.scandir(log_dir):
+        if entry.name.startswith('console-') and entry.name.endswith('.log'):
+            try:
+                logs.append((entry.stat().st_mtime, entry.path))
+            except OSError:
+                pass
+    logs.sort(reverse=True)
+    for _, path in logs[keep:]:
+        try:
+            os.remove(path)
+        except OSError:
+            # Abierto por otra ventana (Windows) o ya borrado
+            pass
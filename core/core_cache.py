@@ -0,0 +1,174 @@
+"""
+Caché de núcleos de Arduino precompilados, por placa
+
+arduino-builder guarda el núcleo compilado (core_*.a) en la carpeta que se le
+pasa con -build-cache. CoreCache administra esas carpetas dentro de la caché
+del usuario, una por FQBN:
+
+    <caché del usuario>/cores/
+        arduino_avr_uno/        (carpeta -build-cache de esa placa)
+            .last_used          (marca de último uso, para el orden LRU)
+        arduino_avr_uno.lock    (bloqueo de la compilación del núcleo)
+        stats.json              (aciertos y fallos acumulados por placa)
+
+Después de cada compilación record_build compara los archivos .a antes y
+después: si no apareció ninguno nuevo el núcleo se reutilizó (acierto). Si el
+total supera max_bytes se borran las placas usadas hace más tiempo.
+
+La primera compilación de una placa, que crea su núcleo, se hace bajo
+build_lock(fqbn): dos arduino-builder compilando el mismo núcleo en la misma
+carpeta -build-cache se pisan los archivos. Una vez creado el núcleo, las
+compilaciones que solo lo leen pueden correr a la vez.
+
+Varios procesos (ventanas del IDE, la precompilación, validate_examples)
+actualizan stats.json a la vez: cada actualización lee, suma y escribe bajo
+un FileLock (stats.lock), y la escritura reemplaza el archivo de una vez, así
+que nunca se lee a medio escribir.
+
+Autor: Código Abierto Fab Blocks IDE
+Licencia: MIT
+"""
+import json
+import os
+import re
+import shutil
+import tempfile
+
+from core.build_cache import user_cache_dir
+from core.file_lock import FileLock
+
+# Tamaño máximo por defecto de todos los núcleos precompilados
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+_STAMP = '.last_used'
+_STATS = 'stats.json'
+_STATS_LOCK = 'stats.lock'
+
+
+class CoreCache:
+    def __init__(self, root=None, max_bytes=DEFAULT_MAX_BYTES):
+        self.root = root or user_cache_dir('cores')
+        self.max_bytes = max_bytes
+
+    def directory(self, fqbn):
+        """Carpeta -build-cache de una placa; la marca como usada."""
+        path = self._board_dir(fqbn)
+        os.makedirs(path, exist_ok=True)
+        with open(os.path.join(path, _STAMP), 'w'):
+            pass
+        return path
+
+    def build_lock(self, fqbn):
+        """FileLock (sin tomar) para compilar el núcleo de una placa que aún no está en la caché."""
+        return FileLock(self._board_dir(fqbn) + '.lock')
+
+    def archives(self, fqbn):
+        """Núcleos compilados (rutas relativas de los .a) de una placa."""
+        path = self._board_dir(fqbn)
+        found = set()
+        for folder, _, files in os.walk(path):
+            for name in files:
+                if name.endswith('.a'):
+                    found.add(os.path.relpath(os.path.join(folder, name), path))
+        return found
+
+    def record_build(self, fqbn, archives_before):
+        """
+        Registra el resultado de una compilación y aplica el límite de tamaño.
+
+        Args:
+            fqbn (str): Placa compilada
+            archives_before (set): archives(fqbn) antes de compilar
+
+        Returns:
+            bool: True si se reutilizó un núcleo ya compilado
+        """
+        hit = bool(archives_before) and self.archives(fqbn) <= archives_before
+        with FileLock(os.path.join(self.root, _STATS_LOCK)):
+            # Se relee bajo el bloqueo para no pisar lo que sumó otro proceso
+            stats = self._load_stats()
+            board = stats.setdefault(fqbn, {'hits': 0, 'misses': 0})
+            board['hits' if hit else 'misses'] += 1
+            self._save_stats(stats)
+        self.evict(keep=fqbn)
+        return hit
+
+    def stats(self):
+        """
+        Returns:
+            dict: hits, misses, bytes y boards (placas con núcleo guardado)
+        """
+        stats = self._load_stats()
+        sizes = self._board_sizes()
+        return {
+            'hits': sum(board['hits'] for board in stats.values()),
+            'misses': sum(board['misses'] for board in stats.values()),
+            'bytes': sum(size for _, size, _ in sizes),
+            'boards': len(sizes),
+        }
+
+    def size(self):
+        return sum(size for _, size, _ in self._board_sizes())
+
+    def evict(self, keep=None):
+        """Borra las placas menos usadas hasta quedar dentro de max_bytes."""
+        sizes = self._board_sizes()
+        total = sum(size for _, size, _ in sizes)
+        keep_dir = self._board_dir(keep) if keep else None
+        for _, size, path in sorted(sizes):
+            if total <= self.max_bytes:
+                break
+            if path == keep_dir:
+                continue
+            shutil.rmtree(path, ignore_errors=True)
+            total -= size
+
+    def clear(self):
+        """Borra todos los núcleos y las estadísticas."""
+        shutil.rmtree(self.root, ignore_errors=True)
+
+    def _board_dir(self, fqbn):
+        return os.path.join(self.root, re.sub(r'[^\w.-]+', '_', fqbn))
+
+    def _board_sizes(self):
+        """Lista de (último uso, bytes, carpeta) por placa."""
+        result = []
+        try:
+            entries = list(os.scandir(self.root))
+        except OSError:
+            return result
+        for entry in entries:
+            if not entry.is_dir():
+                continue
+            total = 0
+            for folder, _, files in os.walk(entry.path):
+                for name in files:
+                    try:
+                        total += os.path.getsize(os.path.join(folder, name))
+                    except OSError:
+                        pass
+            try:
+                last_used = os.path.getmtime(os.path.join(entry.path, _STAMP))
+            except OSError:
+                last_used = 0
+            result.append((last_used, total, entry.path))
+        return result
+
+    def _load_stats(self):
+        try:
+            with open(os.path.join(self.root, _STATS), 'r') as file:
+                return json.load(file)
+        except (OSError, ValueError):
+            return {}
+
+    def _save_stats(self, stats):
+        os.makedirs(self.root, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.root, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w') as file:
+                json.dump(stats, file)
+            os.replace(tmp_path, os.path.join(self.root, _STATS))
+        except OSError:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
@@ -0,0 +1,91 @@
+"""
+Bloqueo entre procesos con un archivo
+
+Varias ventanas del IDE, la precompilación de fondo, fab_cli y los procesos
+de validate_examples comparten la caché del usuario. FileLock coordina a
+esos procesos con un bloqueo del sistema operativo sobre un archivo
+(flock en POSIX, msvcrt.locking en Windows), que se libera solo si el
+proceso termina sin soltarlo.
+
+    with FileLock(os.path.join(carpeta, '.lock')):
+        ...
+
+El bloqueo es por archivo abierto: dos FileLock del mismo proceso sobre la
+misma ruta también se excluyen entre sí.
+
+Autor: Código Abierto Fab Blocks IDE
+Licencia: MIT
+"""
+import os
+import sys
+import time
+
+if sys.platform == 'win32':
+    import msvcrt
+else:
+    import fcntl
+
+# Pausa entre intentos mientras otro proceso tiene el bloqueo (segundos)
+POLL_INTERVAL = 0.05
+
+
+class FileLock:
+    def __init__(self, path):
+        self.path = path
+        self._file = None
+
+    def acquire(self, timeout=None):
+        """
+        Toma el bloqueo esperando a lo sumo timeout segundos (None espera
+        lo necesario, 0 no espera). Retorna True si lo obtuvo.
+        """
+        if self._file is not None:
+            raise RuntimeError(f"El bloqueo {self.path} ya fue tomado")
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        file = open(self.path, 'a+b')
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while not _try_lock(file):
+            if deadline is not None and time.monotonic() >= deadline:
+                file.close()
+                return False
+            time.sleep(POLL_INTERVAL)
+        self._file = file
+        return True
+
+    def release(self):
+        if self._file is None:
+            return
+        _unlock(self._file)
+        self._file.close()
+        self._file = None
+
+    @property
+    def locked(self):
+        return self._file is not None
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.release()
+
+
+def _try_lock(file):
+    try:
+        if sys.platform == 'win32':
+            file.seek(0)
+            msvcrt.locking(file.fileno(), msvcrt.LK_NBLCK, 1)
+        else:
+            fcntl.flock(file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        return True
+    except OSError:
+        return False
+
+
+def _unlock(file):
+    if sys.platform == 'win32':
+        file.seek(0)
+        msvcrt.locking(file.fileno(), msvcrt.LK_UNLCK, 1)
+    else:
+        fcntl.flock(file.fileno(), fcntl.LOCK_UN)
@@ -0,0 +1,152 @@
+"""
+Compilación y carga sin interfaz gráfica
+
+HeadlessBuilder hace con subprocess lo mismo que CompilationManager hace con
+la ventana: guarda el sketch en un BuildWorkspace propio, reutiliza el .hex
+de la BuildCache si el código, la placa y la herramienta no cambiaron,
+compila con arduino-builder (núcleo precompilado en la CoreCache) y carga con
+avrdude. Cada paso retorna un diccionario serializable a JSON, pensado para
+la línea de comandos (fab_cli) y la validación de ejemplos.
+
+    builder = HeadlessBuilder('/opt/arduino-1.8.19')
+    result = builder.compile(code, 'Arduino Uno')
+    if result['ok']:
+        builder.upload(result['hex_path'], 'Arduino Uno', '/dev/ttyUSB0')
+
+Autor: Código Abierto Fab Blocks IDE
+Licencia: MIT
+"""
+import contextlib
+import os
+import subprocess
+import threading
+import time
+
+from core.build_cache import BuildCache, toolchain_fingerprint
+from core.build_workspace import BuildWorkspace
+from core.builder_log import BuilderLogParser
+from core.command_runner import kill_process_tree, process_tree_kwargs
+from core.compilation_manager import BOARD_CPU_MAPPING, build_compile_command, build_upload_command
+from core.core_cache import CoreCache
+
+# Líneas finales de la salida que se guardan en el resultado
+OUTPUT_TAIL_LINES = 40
+
+
+class HeadlessBuilder:
+    def __init__(self, arduino_folder, build_cache=None, core_cache=None, timeout=None):
+        """
+        Args:
+            arduino_folder (str): Carpeta de Arduino (la que contiene arduino-builder)
+            build_cache (BuildCache): Caché de .hex; None usa la del usuario
+            core_cache (CoreCache): Caché de núcleos; None usa la del usuario
+            timeout (float): Tiempo máximo de cada comando en segundos
+        """
+        self.arduino_folder = arduino_folder
+        self.build_cache = build_cache or BuildCache()
+        self.core_cache = core_cache or CoreCache()
+        self.timeout = timeout
+        self._fingerprint = None
+
+    def compile(self, code, board):
+        """
+        Compila un sketch para una placa de BOARD_CPU_MAPPING.
+
+        Returns:
+            dict: ok, cached, returncode, seconds, stages (segundos por
+                etapa), hex_path (en la caché) y output (últimas líneas)
+        """
+        result = {'ok': False, 'cached': False, 'returncode': None, 'seconds': 0.0,
+                  'stages': {}, 'hex_path': None, 'output': []}
+        board_info = BOARD_CPU_MAPPING.get(board)
+        if board_info is None:
+            result['output'] = [f"Placa desconocida: {board}"]
+            return result
+        fqbn = board_info['TEXT_CPU']
+        started = time.perf_counter()
+        if self._fingerprint is None:
+            self._fingerprint = toolchain_fingerprint(self.arduino_folder)
+        key = self.build_cache.key(code, fqbn, self._fingerprint)
+        cached = self.build_cache.get(key)
+        if cached is not None:
+            result.update(ok=True, cached=True, returncode=0, hex_path=cached,
+                          seconds=time.perf_counter() - started)
+            return result
+
+        workspace = BuildWorkspace(core_cache=self.core_cache)
+        try:
+            with open(workspace.sketch_path, 'w') as file:
+                file.write(code)
+            archives = self.core_cache.archives(fqbn)
+            parser = BuilderLogParser()
+            # Si el núcleo todavía no existe, solo una compilación a la vez lo
+            # crea (también respecto de las ventanas del IDE)
+            with contextlib.nullcontext() if archives else self.core_cache.build_lock(fqbn):
+                returncode, output = _run(build_compile_command(self.arduino_folder, fqbn, workspace),
+                                          self.timeout, parser)
+            result['stages'] = parser.finish()
+            result['returncode'] = returncode
+            result['output'] = output[-OUTPUT_TAIL_LINES:]
+            if returncode == 0 and os.path.exists(workspace.hex_path):
+                result['ok'] = True
+                result['hex_path'] = self.build_cache.put(key, workspace.hex_path)
+                self.core_cache.record_build(fqbn, archives)
+        finally:
+            workspace.close()
+        result['seconds'] = time.perf_counter() - started
+        return result
+
+    def upload(self, hex_path, board, port):
+        """
+        Carga un .hex con avrdude.
+
+        Returns:
+            dict: ok, returncode, seconds y output (últimas líneas)
+        """
+        board_info = BOARD_CPU_MAPPING[board]
+        started = time.perf_counter()
+        command = build_upload_command(self.arduino_folder, board_info['UPLOAD_CPU'],
+                                       board_info['PROCESSOR'], port, hex_path)
+        returncode, output = _run(command, self.timeout)
+        return {'ok': returncode == 0, 'returncode': returncode,
+                'seconds': time.perf_counter() - started,
+                'output': output[-OUTPUT_TAIL_LINES:]}
+
+
+def _run(command, timeout, log_parser=None):
+    """
+    Ejecuta un comando leyendo su salida a medida que llega (para medir las
+    etapas con log_parser). Retorna (código o None si no se pudo ejecutar o
+    se agotó el tiempo, líneas).
+    """
+    try:
+        process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                                   text=True, errors='replace', **process_tree_kwargs())
+    except OSError as e:
+        return None, [f"{command[0]}: {e}"]
+    expired = threading.Event()
+
+    def expire():
+        expired.set()
+        kill_process_tree(process)
+
+    timer = None
+    if timeout is not None:
+        timer = threading.Timer(timeout, expire)
+        timer.start()
+    lines = []
+    try:
+        for line in process.stdout:
+            line = line.rstrip()
+            if log_parser is not None:
+                line, _ = log_parser.feed(line.strip())
+                if line is None:
+                    continue
+            lines.append(line)
+        returncode = process.wait()
+    finally:
+        if timer is not None:
+            timer.cancel()
+    if expired.is_set():
+        return None, lines + [f"Tiempo agotado ({timeout} s)"]
+    return returncode, lines
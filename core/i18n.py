@@ -85,6 +85,14 @@ TRANSLATIONS = {
         'es': 'Subir',
         'en': 'Upload'
     },
+    'menu.cancel_build': {
+        'es': 'Cancelar compilación',
+        'en': 'Cancel Build'
+    },
+    'menu.batch_upload': {
+        'es': 'Subir a varias placas...',
+        'en': 'Upload to Several Boards...'
+    },
     'menu.show_code': {
         'es': 'Mostrar Código',
         'en': 'Show Code'
@@ -219,6 +227,62 @@ TRANSLATIONS = {
         'es': 'Selección de placa: ',
         'en': 'Board selection: '
     },
+    'message.build_cache_hit': {
+        'es': 'Sin cambios desde la última compilación: se usa el binario guardado',
+        'en': 'No changes since the last build: using the cached binary'
+    },
+    'message.core_build_wait': {
+        'es': 'Otra compilación está preparando el núcleo de esta placa; esperando a que termine...',
+        'en': 'Another build is preparing the core for this board; waiting for it to finish...'
+    },
+    'message.compile_failed': {
+        'es': 'Error de compilación (código {code}): no se carga el programa',
+        'en': 'Compilation failed (code {code}): the program is not uploaded'
+    },
+    'message.upload_failed': {
+        'es': 'Error al cargar el programa (código {code})',
+        'en': 'Upload failed (code {code})'
+    },
+    'console.full_log': {
+        'es': 'Se muestran las últimas líneas. Registro completo guardado en archivo',
+        'en': 'Showing the latest lines. Full log saved to file'
+    },
+    'message.build_in_progress': {
+        'es': 'Ya se está compilando este mismo programa',
+        'en': 'This same program is already being built'
+    },
+    'message.build_cancelled': {
+        'es': 'Compilación anterior cancelada',
+        'en': 'Previous build cancelled'
+    },
+    'message.build_stages': {
+        'es': 'Etapas de compilación: {timings}',
+        'en': 'Build stages: {timings}'
+    },
+    'message.batch_upload': {
+        'es': 'Subir a {count} placas:',
+        'en': 'Upload to {count} boards:'
+    },
+    'message.batch_port_ok': {
+        'es': '{port}: cargado ({attempts} intento(s), {seconds} s)',
+        'en': '{port}: uploaded ({attempts} attempt(s), {seconds} s)'
+    },
+    'message.batch_port_failed': {
+        'es': '{port}: falló la carga ({attempts} intento(s), {seconds} s)',
+        'en': '{port}: upload failed ({attempts} attempt(s), {seconds} s)'
+    },
+    'message.batch_summary': {
+        'es': 'Placas cargadas: {ok} de {total}',
+        'en': 'Boards uploaded: {ok} of {total}'
+    },
+    'message.batch_failed_ports': {
+        'es': 'Puertos con errores: {ports}',
+        'en': 'Ports with errors: {ports}'
+    },
+    'message.stage_timings': {
+        'es': 'Tiempos: {timings}',
+        'en': 'Timings: {timings}'
+    },
     'message.available_ports': {
         'es': 'Puertos serie disponibles: ',
         'en': 'Available serial ports: '
@@ -257,6 +321,14 @@ TRANSLATIONS = {
         'es': 'No hay puertos COM disponibles',
         'en': 'No COM ports available'
     },
+    'message.port_released': {
+        'es': 'Puerto {port} liberado ({owner})',
+        'en': 'Port {port} released ({owner})'
+    },
+    'message.port_release_failed': {
+        'es': 'No se pudo liberar el puerto {port} ({owner}); la carga puede fallar',
+        'en': 'Could not release port {port} ({owner}); the upload may fail'
+    },
     
     # ========== PLACAS ==========
     'board.uno': {
@@ -450,6 +522,88 @@ TRANSLATIONS = {
         'en': 'Could not save INO file: {error}'
     },
     
+    # ========== CARGA EN VARIAS PLACAS ==========
+    'batch.title': {
+        'es': 'Subir a varias placas',
+        'en': 'Upload to Several Boards'
+    },
+    'batch.ports': {
+        'es': 'Puertos de destino:',
+        'en': 'Target ports:'
+    },
+    'batch.workers': {
+        'es': 'Cargas simultáneas:',
+        'en': 'Simultaneous uploads:'
+    },
+    'batch.retries': {
+        'es': 'Reintentos:',
+        'en': 'Retries:'
+    },
+    'batch.column_port': {
+        'es': 'Puerto',
+        'en': 'Port'
+    },
+    'batch.column_status': {
+        'es': 'Estado',
+        'en': 'Status'
+    },
+    'batch.column_attempts': {
+        'es': 'Intentos',
+        'en': 'Attempts'
+    },
+    'batch.column_time': {
+        'es': 'Tiempo',
+        'en': 'Time'
+    },
+    'batch.upload': {
+        'es': 'Subir',
+        'en': 'Upload'
+    },
+    'batch.retry_failed': {
+        'es': 'Reintentar fallidos',
+        'en': 'Retry Failed'
+    },
+    'batch.cancel': {
+        'es': 'Cancelar',
+        'en': 'Cancel'
+    },
+    'batch.no_ports': {
+        'es': 'Marque al menos un puerto',
+        'en': 'Check at least one port'
+    },
+    'batch.status_compiling': {
+        'es': 'Compilando',
+        'en': 'Compiling'
+    },
+    'batch.status_waiting': {
+        'es': 'En espera',
+        'en': 'Waiting'
+    },
+    'batch.status_uploading': {
+        'es': 'Cargando',
+        'en': 'Uploading'
+    },
+    'batch.status_ok': {
+        'es': 'Listo',
+        'en': 'Done'
+    },
+    'batch.status_failed': {
+        'es': 'Falló',
+        'en': 'Failed'
+    },
+    'batch.summary': {
+        'es': 'Placas cargadas: {ok} de {total}',
+        'en': 'Boards uploaded: {ok} of {total}'
+    },
+    'batch.output': {
+        'es': 'Salida del puerto seleccionado:',
+        'en': 'Output of the selected port:'
+    },
+    'batch.attempt': {
+        'es': '--- Intento {attempt} ---',
+        'en': '--- Attempt {attempt} ---'
+    },
+    
     # ========== MONITOR SERIE / GRÁFICO SERIAL ==========
     'monitor.title': {
         'es': 'Monitor Serial',
@@ -527,6 +681,46 @@ TRANSLATIONS = {
         'es': 'Gráfico',
         'en': 'Graph'
     },
+    'monitor.record': {
+        'es': 'Grabar',
+        'en': 'Record'
+    },
+    'monitor.recording_saved': {
+        'es': 'Captura guardada en: {path}',
+        'en': 'Capture saved to: {path}'
+    },
+    'monitor.search': {
+        'es': 'Buscar en los datos recibidos (Enter para el siguiente)',
+        'en': 'Search received data (Enter for next)'
+    },
+    'monitor.port_released': {
+        'es': 'Conexión con {port} cerrada para cargar el programa',
+        'en': 'Connection to {port} closed to upload the program'
+    },
+    'monitor.load_capture': {
+        'es': 'Cargar captura',
+        'en': 'Load capture'
+    },
+    'monitor.capture_loaded': {
+        'es': 'Captura cargada: {path} ({rows} muestras)',
+        'en': 'Capture loaded: {path} ({rows} samples)'
+    },
+    'monitor.capture_error': {
+        'es': 'No se pudo cargar la captura: {error}',
+        'en': 'Could not load capture: {error}'
+    },
+    'monitor.capture_busy': {
+        'es': 'Desconecta el puerto antes de cargar una captura',
+        'en': 'Disconnect the port before loading a capture'
+    },
+    'monitor.parse_error': {
+        'es': 'Dato ignorado en "{line}": {field} ({reason})',
+        'en': 'Value ignored in "{line}": {field} ({reason})'
+    },
+    'monitor.parse_errors_more': {
+        'es': ' y {count} más en este cuadro',
+        'en': ' and {count} more in this frame'
+    },
     
     # ========== EJEMPLOS ==========
     'example.arduino.variables': {
@@ -56,10 +56,20 @@ class JavaScriptBridge:
             xml;''', callback)
     
     def get_arduino_code(self, callback):
+        """
+        Genera el código Arduino directamente desde el workspace, en una sola
+        llamada y sin depender de que el panel de código esté visible o
+        resaltado. El callback recibe None si el generador no está cargado.
+        """
         self.window.webview.page().runJavaScript('''
-            var workspace = Blockly.getMainWorkspace();
-            var arduinoCode = Blockly.Arduino.workspaceToCode(workspace);
-            arduinoCode;''', callback)
+            (function() {
+                try {
+                    var workspace = Blockly.getMainWorkspace();
+                    return Blockly.Arduino.workspaceToCode(workspace);
+                } catch (e) {
+                    return null;
+                }
+            })();''', callback)
     
     def get_cpp_code(self, callback):
         self.window.webview.page().runJavaScript('''
@@ -0,0 +1,204 @@
+"""
+Vista de registro acotada para los paneles de texto del monitor serial
+
+LineRing guarda las últimas `capacity` líneas en un arreglo circular de
+tamaño fijo, por lo que la memoria no crece con la duración de la sesión.
+LogModel lo expone como modelo de Qt y LogView lo muestra en un QListView con
+filas de alto uniforme: Qt solo pide y dibuja las filas visibles, así que
+agregar una línea cuesta lo mismo con 10 o con 1.000.000 de líneas recibidas.
+
+Autor: Código Abierto Fab Blocks IDE
+Licencia: MIT
+"""
+from PyQt5.QtWidgets import QWidget, QListView, QLineEdit, QVBoxLayout, QAction, QApplication, QAbstractItemView
+from PyQt5.QtCore import Qt, QAbstractListModel, QModelIndex
+from PyQt5.QtGui import QKeySequence
+
+from core.i18n import get_text
+
+# Líneas que conserva cada panel antes de descartar las más antiguas
+DEFAULT_LOG_LINES = 100000
+
+
+class LineRing:
+    """Arreglo circular de líneas de capacidad fija."""
+
+    def __init__(self, capacity=DEFAULT_LOG_LINES):
+        if capacity <= 0:
+            raise ValueError("La capacidad debe ser mayor que cero")
+        self.capacity = capacity
+        self._lines = [None] * capacity
+        self._start = 0
+        self._count = 0
+
+    def __len__(self):
+        return self._count
+
+    def __getitem__(self, row):
+        if not 0 <= row < self._count:
+            raise IndexError(row)
+        return self._lines[(self._start + row) % self.capacity]
+
+    def extend(self, lines):
+        """
+        Agrega líneas al final descartando las más antiguas si no caben.
+
+        Returns:
+            int: Cantidad de líneas antiguas descartadas
+        """
+        lines = list(lines[-self.capacity:])
+        n = len(lines)
+        if not n:
+            return 0
+        dropped = max(self._count + n - self.capacity, 0)
+        end = (self._start + self._count) % self.capacity
+        first = min(n, self.capacity - end)
+        self._lines[end:end + first] = lines[:first]
+        self._lines[:n - first] = lines[first:]
+        self._count = min(self._count + n, self.capacity)
+        self._start = (self._start + dropped) % self.capacity
+        return dropped
+
+    def lines(self):
+        """Retorna las líneas en orden, de la más antigua a la más reciente."""
+        end = self._start + self._count
+        if end <= self.capacity:
+            return self._lines[self._start:end]
+        return self._lines[self._start:] + self._lines[:end - self.capacity]
+
+    def find(self, text, start=0):
+        """
+        Busca `text` (sin distinguir mayúsculas) desde la fila `start`,
+        continuando desde el principio si llega al final.
+
+        Returns:
+            int: Fila encontrada o -1
+        """
+        needle = text.lower()
+        for offset in range(self._count):
+            row = (start + offset) % self._count
+            if needle in self[row].lower():
+                return row
+        return -1
+
+    def clear(self):
+        self._lines = [None] * self.capacity
+        self._start = 0
+        self._count = 0
+
+
+class LogModel(QAbstractListModel):
+    def __init__(self, capacity=DEFAULT_LOG_LINES, parent=None):
+        super().__init__(parent)
+        self.ring = LineRing(capacity)
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.ring)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and index.isValid():
+            return self.ring[index.row()]
+        return None
+
+    def append_lines(self, lines):
+        """
+        Agrega líneas al modelo.
+
+        Mientras el anillo no está lleno se insertan filas; una vez lleno la
+        cantidad de filas no cambia y solo se avisa que su contenido se
+        desplazó, sin que la vista recalcule nada proporcional al historial.
+        """
+        if not lines:
+            return
+        count = len(self.ring)
+        grow = min(len(lines), self.ring.capacity - count)
+        if grow:
+            self.beginInsertRows(QModelIndex(), count, count + grow - 1)
+            self.ring.extend(lines[:grow])
+            self.endInsertRows()
+        if len(lines) > grow:
+            self.ring.extend(lines[grow:])
+            self.dataChanged.emit(self.index(0), self.index(len(self.ring) - 1), [Qt.DisplayRole])
+
+    def clear(self):
+        self.beginResetModel()
+        self.ring.clear()
+        self.endResetModel()
+
+
+class LogView(QWidget):
+    """
+    Panel de texto de solo lectura con capacidad fija y búsqueda opcional.
+
+    Ofrece append, clear y toPlainText como QTextEdit para reemplazarlo
+    directamente. Si la vista está al final sigue a las líneas nuevas; si el
+    usuario subió para leer, la posición se mantiene.
+    """
+
+    def __init__(self, parent=None, capacity=DEFAULT_LOG_LINES, searchable=False):
+        super().__init__(parent)
+        self.model = LogModel(capacity, self)
+
+        self.view = QListView(self)
+        self.view.setModel(self.model)
+        self.view.setUniformItemSizes(True)
+        # Distribuye el cálculo de posiciones entre eventos en vez de rehacerlo entero
+        self.view.setLayoutMode(QListView.Batched)
+        self.view.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.view.setSelectionMode(QAbstractItemView.ExtendedSelection)
+
+        copy_action = QAction(self.view)
+        copy_action.setShortcut(QKeySequence.Copy)
+        copy_action.setShortcutContext(Qt.WidgetShortcut)
+        copy_action.triggered.connect(self.copy_selection)
+        self.view.addAction(copy_action)
+
+        self.search_edit = QLineEdit(self)
+        self.search_edit.setPlaceholderText(get_text('monitor.search'))
+        self.search_edit.returnPressed.connect(self.find_next)
+        self.search_edit.setVisible(searchable)
+
+        layout = QVBoxLayout()
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.addWidget(self.search_edit)
+        layout.addWidget(self.view)
+        self.setLayout(layout)
+
+    def append(self, text):
+        """Agrega texto; cada salto de línea crea una fila nueva."""
+        self.append_lines(text.split('\n'))
+
+    def append_lines(self, lines):
+        scrollbar = self.view.verticalScrollBar()
+        at_bottom = scrollbar.value() >= scrollbar.maximum()
+        self.model.append_lines(lines)
+        if at_bottom:
+            self.view.scrollToBottom()
+
+    def clear(self):
+        self.model.clear()
+
+    def toPlainText(self):
+        return '\n'.join(self.model.ring.lines())
+
+    def find_next(self):
+        """Selecciona la siguiente línea que contiene el texto buscado."""
+        text = self.search_edit.text()
+        if not text or not len(self.model.ring):
+            return -1
+        current = self.view.currentIndex()
+        start = current.row() + 1 if current.isValid() else 0
+        row = self.model.ring.find(text, start)
+        if row >= 0:
+            index = self.model.index(row)
+            self.view.setCurrentIndex(index)
+            self.view.scrollTo(index, QAbstractItemView.PositionAtCenter)
+        return row
+
+    def copy_selection(self):
+        rows = sorted(index.row() for index in self.view.selectionModel().selectedIndexes())
+        if rows:
+            QApplication.clipboard().setText('\n'.join(self.model.ring[row] for row in rows))
+
+    def change_language(self):
+        self.search_edit.setPlaceholderText(get_text('monitor.search'))
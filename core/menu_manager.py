@@ -4,7 +4,7 @@ Gestión de menús para Fab Blocks IDE
 Este módulo gestiona la creación y configuración de todos los menús de la 
 aplicación principal. Incluye:
 - Menú Archivo (nuevo, abrir, guardar, exportar)
-- Menú Programa (compilar, subir, mostrar/ocultar código)
+- Menú Programa (compilar, subir, subir a varias placas, mostrar/ocultar código)
 - Menú Herramientas (monitor serial, gráficos, placas, puertos)
 - Menú Ayuda (tutoriales, FAQ, contacto)
 
@@ -18,7 +18,7 @@ Autor: Código Abierto Fab Blocks IDE
 Licencia: MIT
 """
 from PyQt5.QtWidgets import QAction, QMenu
-from PyQt5.QtGui import QIcon
+from PyQt5.QtGui import QIcon, QKeySequence
 import webbrowser
 from core.i18n import get_text
 
@@ -199,16 +199,23 @@ class MenuManager:
         
         action_verify = QAction(get_text('menu.verify'), self.window)
         action_upload = QAction(get_text('menu.upload'), self.window)
+        action_batch_upload = QAction(get_text('menu.batch_upload'), self.window)
+        action_cancel_build = QAction(get_text('menu.cancel_build'), self.window)
+        action_cancel_build.setShortcut(QKeySequence('Ctrl+.'))
         action_show_code = QAction(get_text('menu.show_code'), self.window)
         action_hide_code = QAction(get_text('menu.hide_code'), self.window)
         
         action_verify.triggered.connect(self.window.compilar_clicked)
         action_upload.triggered.connect(self.window.subir_clicked)
+        action_batch_upload.triggered.connect(self.window.show_batch_upload_dialog)
+        action_cancel_build.triggered.connect(self.window.cancel_build)
         action_show_code.triggered.connect(self.window.show_code)
         action_hide_code.triggered.connect(self.window.hide_code)
         
         menu.addAction(action_verify)
         menu.addAction(action_upload)
+        menu.addAction(action_batch_upload)
+        menu.addAction(action_cancel_build)
         menu.addSeparator()
         menu.addAction(action_show_code)
         menu.addAction(action_hide_code)
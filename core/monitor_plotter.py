@@ -1,69 +1,217 @@
 import sys
-from PyQt5.QtWidgets import QApplication, QMainWindow, QTextEdit, QPushButton, QVBoxLayout, QWidget, QComboBox, QLabel, QHBoxLayout, QLineEdit
+from PyQt5.QtWidgets import QApplication, QMainWindow, QPushButton, QVBoxLayout, QWidget, QComboBox, QLabel, QHBoxLayout, QLineEdit, QCheckBox, QFileDialog
 from PyQt5.QtCore import QTimer, QObject, pyqtSignal, QThread
 import pyqtgraph as pg
-from collections import deque
+import numpy as np
 import time
-import serial.tools.list_ports
+import serial
 from PyQt5.QtSerialPort import QSerialPort
 import os
+import shutil
 import pyqtgraph.exporters
 from core.i18n import get_text
+from core.plot_buffer import DEFAULT_CAPACITY
+from core.plot_lod import LodPlotBuffer, CaptureLodView
+from core.telemetry_parser import TelemetryParser
+from core.serial_recorder import SerialRecorder
+from core.capture_format import CaptureWriter, load_capture, CAPTURE_EXTENSION
+from core.log_view import LogView
+from core.port_inventory import get_port_inventory
+from core.ui_components import PortListUpdater
+from core.port_leases import get_port_leases
+
+# Tiempo máximo que el hilo lector bloquea esperando datos (ms)
+READ_WAIT_MS = 20
+# Intervalo mínimo entre lotes de líneas emitidos por el hilo lector (ms)
+BATCH_INTERVAL_MS = 16
+# Longitud máxima de una línea sin salto antes de entregarla igualmente
+MAX_LINE_BYTES = 64 * 1024
+# Intervalo de entrega de lotes de líneas al hilo de la interfaz (~60 fps)
+UI_FRAME_MS = 16
+# Cuadros por segundo del redibujado del gráfico
+RENDER_FPS = 30
+
+
+class LineSplitter:
+    """
+    Divide un flujo de bytes en líneas de forma incremental.
+
+    Los fragmentos pueden llegar cortados en cualquier punto; la parte final
+    sin salto de línea se guarda hasta el siguiente fragmento.
+    """
+
+    def __init__(self, max_line_bytes=MAX_LINE_BYTES):
+        self.max_line_bytes = max_line_bytes
+        self._buffer = b''
+
+    def feed(self, chunk):
+        """Agrega bytes recibidos y retorna la lista de líneas completas."""
+        data = self._buffer + chunk
+        parts = data.split(b'\n')
+        self._buffer = parts.pop()
+        if len(self._buffer) > self.max_line_bytes:
+            parts.append(self._buffer)
+            self._buffer = b''
+        lines = []
+        for part in parts:
+            line = part.decode('utf-8', errors='ignore').strip()
+            if line:
+                lines.append(line)
+        return lines
+
+    def flush(self):
+        """Retorna la línea incompleta pendiente (si existe) y vacía el buffer."""
+        line = self._buffer.decode('utf-8', errors='ignore').strip()
+        self._buffer = b''
+        return [line] if line else []
+
 
 class SerialReaderThread(QThread):
-    data_received = pyqtSignal(str)
+    """
+    Hilo lector del puerto serial.
+
+    En cada despertar drena todos los bytes disponibles, los divide en líneas
+    y las emite en lotes (como máximo un lote cada BATCH_INTERVAL_MS), de modo
+    que el ritmo de lectura depende del baudrate y no de una pausa fija.
+    """
+    lines_received = pyqtSignal(list)
 
-    def __init__(self, serial_port):
+    def __init__(self, serial_port, wait_ms=READ_WAIT_MS, batch_interval_ms=BATCH_INTERVAL_MS):
         super().__init__()
         self.serial = serial_port
         self.running = True
+        self.wait_ms = wait_ms
+        self.batch_interval = batch_interval_ms / 1000.0
+        self.splitter = LineSplitter()
+        # SerialRecorder opcional que recibe las líneas con su tiempo de lectura
+        self.recorder = None
 
     def run(self):
+        pending = []
+        last_emit = time.monotonic()
         while self.running:
-            if self.serial.waitForReadyRead(100):  # Esperar hasta 100 ms para datos
-                data = self.serial.readLine().data().decode('utf-8', errors='ignore').strip()
-                if data:
-                    self.data_received.emit(data)
-            self.msleep(100)  # Pausar 100 ms para evitar sobrecarga
+            if self.serial.waitForReadyRead(self.wait_ms):
+                lines = self.splitter.feed(self.serial.readAll().data())
+                if lines:
+                    if self.recorder is not None:
+                        self.recorder.write_lines(lines)
+                    pending.extend(lines)
+            now = time.monotonic()
+            if pending and now - last_emit >= self.batch_interval:
+                self.lines_received.emit(pending)
+                pending = []
+                last_emit = now
+        tail = self.splitter.flush()
+        if tail and self.recorder is not None:
+            self.recorder.write_lines(tail)
+        pending.extend(tail)
+        if pending:
+            self.lines_received.emit(pending)
 
 class SerialMonitor(QObject):
-    data_received = pyqtSignal(str)
+    """
+    Abre el puerto serial y entrega las líneas recibidas al hilo de la interfaz.
+
+    Los lotes que llegan del hilo lector se acumulan y se emiten juntos en
+    lines_received como máximo una vez por cuadro (UI_FRAME_MS), aunque la
+    interfaz se haya retrasado.
+    """
+    lines_received = pyqtSignal(list)
     port_opened = pyqtSignal()
     port_closed = pyqtSignal()
+    # Se cerró el puerto porque otro componente lo pidió (por ejemplo, una carga)
+    port_released = pyqtSignal(str)
 
     def __init__(self, parent=None):
         super().__init__(parent)
         self.serial = QSerialPort()
         self.thread = None
+        # Grabador opcional (SerialRecorder) activo mientras el puerto está abierto
+        self.recorder = None
+        # Arriendo del puerto en el registro del proceso mientras está abierto
+        self.lease = None
+        self._pending_lines = []
+        self._flush_timer = QTimer(self)
+        self._flush_timer.setSingleShot(True)
+        self._flush_timer.setInterval(UI_FRAME_MS)
+        self._flush_timer.timeout.connect(self._flush_lines)
 
     def open_port(self, port_name, baudrate):
         self.serial.setPortName(port_name)
         self.serial.setBaudRate(baudrate)
         if self.serial.open(QSerialPort.ReadWrite):
             self.thread = SerialReaderThread(self.serial)
-            self.thread.data_received.connect(self.data_received.emit)
+            if self.recorder is not None:
+                self.recorder.start(port_name)
+                self.thread.recorder = self.recorder
+            self.thread.lines_received.connect(self._on_lines_received)
             self.thread.start()
+            self.lease = get_port_leases().acquire(port_name, get_text('monitor.title'),
+                                                   self._release_lease, self._stop_reader)
             self.port_opened.emit()
             return True
         else:
             return False
 
-    def close_port(self):
+    def _on_lines_received(self, lines):
+        self._pending_lines.extend(lines)
+        if not self._flush_timer.isActive():
+            self._flush_timer.start()
+
+    def _flush_lines(self):
+        if self._pending_lines:
+            lines = self._pending_lines
+            self._pending_lines = []
+            self.lines_received.emit(lines)
+
+    def close_port(self, timeout=None):
+        """
+        Cierra el puerto.
+
+        Args:
+            timeout (float): Espera máxima por el hilo lector (segundos);
+                             si no termina a tiempo el puerto queda abierto
+
+        Returns:
+            bool: True si el puerto quedó cerrado
+        """
         if self.thread:
             self.thread.running = False
-            self.thread.wait()
+            if timeout is None:
+                self.thread.wait()
+            elif not self.thread.wait(int(timeout * 1000)):
+                return False
             self.thread = None
+        if self.lease is not None:
+            self.lease.drop()
+            self.lease = None
+        if self.recorder is not None:
+            self.recorder.stop()
+        self._flush_timer.stop()
+        self._flush_lines()
         self.serial.close()
         self.port_closed.emit()
+        return True
+
+    def _stop_reader(self):
+        """Pide al hilo lector que termine, sin esperarlo (ver PortLeaseRegistry.release_many)."""
+        if self.thread:
+            self.thread.running = False
+
+    def _release_lease(self, timeout):
+        port_name = self.lease.port
+        if not self.close_port(timeout):
+            return False
+        self.port_released.emit(port_name)
+        return True
 
 class MainWindow(QMainWindow):
-    def __init__(self):
+    def __init__(self, plot_capacity=None, render_fps=None):
         super().__init__()
         self.setWindowTitle(get_text('monitor.title'))
         self.setGeometry(100, 100, 800, 600)
 
-        self.text_edit = QTextEdit(self)
-        self.text_edit.setReadOnly(True)
+        self.text_edit = LogView(self, searchable=True)
 
         self.plot = pg.PlotWidget(self)
         self.plot.hide()
@@ -75,8 +223,12 @@ class MainWindow(QMainWindow):
         self.graph_button = QPushButton(get_text('monitor.graph'), self)
         self.graph_button.clicked.connect(self.toggle_graph)
 
+        # Grabación opcional de la sesión a data_serial/ mientras el puerto está abierto
+        self.record_checkbox = QCheckBox(get_text('monitor.record'), self)
+
         self.port_combo = QComboBox(self)
         self.baud_combo = QComboBox(self)
+        self.port_inventory = get_port_inventory()
 
         self.populate_port_combo()
         self.populate_baud_combo()
@@ -84,8 +236,7 @@ class MainWindow(QMainWindow):
         port_label = QLabel(get_text('monitor.port'))
         baud_label = QLabel(get_text('monitor.baudrate'))
         self.console_label = QLabel(get_text('monitor.console'))
-        self.console_text = QTextEdit(self)
-        self.console_text.setReadOnly(True)
+        self.console_text = LogView(self)
         self.console_text.setMaximumHeight(100)
 
         self.send_text = QLineEdit(self)
@@ -95,6 +246,9 @@ class MainWindow(QMainWindow):
         self.clear_button = QPushButton(get_text('monitor.clear'), self)
         self.clear_button.clicked.connect(self.clear_data)
 
+        self.load_button = QPushButton(get_text('monitor.load_capture'), self)
+        self.load_button.clicked.connect(self.load_capture_file)
+
         layout = QVBoxLayout()
 
         send_layout = QHBoxLayout()
@@ -127,9 +281,11 @@ class MainWindow(QMainWindow):
         button_layout.addWidget(self.baud_combo)
         button_layout.addWidget(self.start_button)
         button_layout.addWidget(self.graph_button)
+        button_layout.addWidget(self.record_checkbox)
         button_layout.addWidget(save_label)
         button_layout.addWidget(self.save_option_combo)
         button_layout.addWidget(self.save_button)
+        button_layout.addWidget(self.load_button)
         button_layout.addWidget(self.folder_name_edit)  # Nuevo: Agregar el campo para el nombre de la carpeta
 
         layout.addLayout(button_layout)
@@ -141,20 +297,40 @@ class MainWindow(QMainWindow):
         self.setCentralWidget(central_widget)
 
         self.serial_monitor = SerialMonitor()
-        self.serial_monitor.data_received.connect(self.display_data)
+        self.serial_monitor.lines_received.connect(self.display_batch)
         self.serial_monitor.port_opened.connect(self.populate_port_combo)
         self.serial_monitor.port_closed.connect(self.populate_port_combo)
-
-        self.timer = QTimer(self)
-        self.timer.timeout.connect(self.update_ports)
-        self.timer.start(1000)
-
-        self.dataX = deque(maxlen=300)
-        self.dataY = []
+        self.serial_monitor.port_closed.connect(self._on_port_closed)
+        self.serial_monitor.port_released.connect(self._on_port_released)
+
+        self.port_inventory.subscribe(self.update_ports)
+
+        # Muestras graficadas: tiempos + una fila por variable (buffer circular)
+        self.plot_capacity = plot_capacity or DEFAULT_CAPACITY
+        self.plot_buffer = LodPlotBuffer(self.plot_capacity)
+        self.curve_names = []
+        # Captura binaria (.fabcap) de las muestras mientras se graba la sesión
+        self.capture_writer = None
+        # Curvas con datos nuevos desde el último cuadro dibujado
+        self._dirty_curves = set()
+        self._x_range_dirty = False
+        # Rango X y ancho en píxeles del último cuadro dibujado
+        self._rendered_view = None
+        # El eje X sigue a las últimas muestras hasta que el usuario mueve o
+        # hace zoom con el mouse; el botón "A" del gráfico lo reactiva
+        self._follow_latest = True
+        self.plot.getViewBox().sigRangeChangedManually.connect(self._on_manual_range)
+
+        # El gráfico se redibuja a ritmo fijo, independiente de la llegada de datos
+        self.render_timer = QTimer(self)
+        self.render_timer.setInterval(int(1000 / (render_fps or RENDER_FPS)))
+        self.render_timer.timeout.connect(self._render_frame)
+        self.render_timer.start()
         self.curves = []
         self.colors = ['y', 'g', 'b', 'r', 'w']
 
-        self.variable_indices = {}
+        # Columnas (variables) y esquema de las líneas recibidas
+        self.telemetry_parser = TelemetryParser()
 
         self.start_time = None
         self.last_update_time = None
@@ -165,9 +341,7 @@ class MainWindow(QMainWindow):
         self.graph_visible = False
 
     def populate_port_combo(self):
-        ports = [port.device for port in serial.tools.list_ports.comports()]
-        self.port_combo.clear()
-        self.port_combo.addItems(ports)
+        PortListUpdater.sync_combo(self.port_combo, self.port_inventory.devices())
 
     def populate_baud_combo(self):
         baudrates = ['9600', '19200', '38400', '57600', '115200']
@@ -179,14 +353,30 @@ class MainWindow(QMainWindow):
         baudrate = int(self.baud_combo.currentText())
         if self.serial_monitor.serial.isOpen():
             self.serial_monitor.close_port()
-            self.start_button.setText(get_text('monitor.connect'))
             self.console_text.append(get_text('monitor.connection_closed', port=port_name))
         else:
+            if isinstance(self.plot_buffer, CaptureLodView):
+                # Las muestras en vivo no se mezclan con una captura cargada
+                self._reset_plot()
             try:
+                if self.record_checkbox.isChecked():
+                    self.serial_monitor.recorder = SerialRecorder(self.data_folder)
+                else:
+                    self.serial_monitor.recorder = None
                 if self.serial_monitor.open_port(port_name, baudrate):
+                    self.record_checkbox.setEnabled(False)
+                    if self.serial_monitor.recorder is not None:
+                        self.capture_writer = CaptureWriter(
+                            self.serial_monitor.recorder.base_path + CAPTURE_EXTENSION
+                        )
                     self.start_button.setText(get_text('monitor.disconnect'))
-                    self.start_time = time.time()
-                    self.last_update_time = self.start_time
+                    # Al reconectar, las muestras nuevas continúan después de la
+                    # última graficada: LodPlotBuffer.visible busca en los
+                    # tiempos con búsqueda binaria y necesita que estén ordenados
+                    now = time.time()
+                    x = self.plot_buffer.x_view()
+                    self.start_time = now - (x[-1] if len(x) else 0.0)
+                    self.last_update_time = now
                     self.console_text.append(get_text('monitor.connection_opened', port=port_name))
                 else:
                     self.console_text.append(get_text('monitor.connection_error', port=port_name))
@@ -201,6 +391,18 @@ class MainWindow(QMainWindow):
             except Exception as e:
                 self.console_text.append(f"Error inesperado al abrir {port_name}: {str(e)}")
 
+    def _on_port_closed(self):
+        self.start_button.setText(get_text('monitor.connect'))
+        self.record_checkbox.setEnabled(True)
+        recorder = self.serial_monitor.recorder
+        if recorder is not None:
+            for path in recorder.files:
+                self.console_text.append(get_text('monitor.recording_saved', path=path))
+        self._close_capture()
+
+    def _on_port_released(self, port_name):
+        self.console_text.append(get_text('monitor.port_released', port=port_name))
+
     def send_data(self):
         if self.serial_monitor.serial.isOpen():
             data = self.send_text.text()
@@ -209,53 +411,115 @@ class MainWindow(QMainWindow):
             self.send_text.clear()
 
     def display_data(self, data):
-        self.console_text.append(f'Datos recibidos: {data}')
-        self.text_edit.append(data)
+        self.display_batch([data])
+
+    def display_batch(self, lines):
+        """
+        Muestra y grafica un lote de líneas recibidas.
+
+        El texto se agrega con una sola llamada por panel y las muestras solo
+        se guardan en el buffer; el dibujo lo hace _render_frame. A cada línea
+        se le asigna un tiempo repartido entre el lote anterior y el actual.
+        """
+        if not lines:
+            return
+        self.console_text.append_lines([f'Datos recibidos: {line}' for line in lines])
+        self.text_edit.append_lines(lines)
 
         current_time = time.time()
-        tiempo_transcurrido = current_time - self.start_time
+        if self.start_time is None:
+            self.start_time = current_time
+        if self.last_update_time is None:
+            self.last_update_time = current_time
+        previous_time = self.last_update_time - self.start_time
+        step = (current_time - self.last_update_time) / len(lines)
 
-        try:
-            variables = data.split(',')
-            has_named_variables = False
-
-            for variable in variables:
-                if ':' in variable:
-                    has_named_variables = True
-                    break
-
-            if has_named_variables:
-                for variable in variables:
-                    name, value = variable.split(':')
-                    name = name.strip()
-                    value = float(value)
-                    if name not in self.variable_indices:
-                        self.variable_indices[name] = len(self.dataY)
-                        self.dataY.append(deque(maxlen=300))
-                        self.curves.append(self.plot.plot(pen=self.colors[len(self.dataY) - 1]))
-                        self.plot.plotItem.legend.addItem(self.curves[-1], name=name)
-                    self.dataY[self.variable_indices[name]].append(value)
-            else:
-                valores = [float(valor) for valor in variables]
-                num_valores = len(valores)
-                if num_valores > 0:
-                    while len(self.dataY) < num_valores:
-                        self.dataY.append(deque(maxlen=300))
-                        self.curves.append(self.plot.plot(pen=self.colors[len(self.dataY) - 1]))
-                        self.plot.plotItem.legend.addItem(self.curves[-1], name=f'Línea {len(self.dataY)}')
-                    for i, valor in enumerate(valores):
-                        self.dataY[i].append(valor)
+        times = previous_time + step * np.arange(1, len(lines) + 1)
+        self.last_update_time = current_time
+        self._add_samples(lines, times)
 
-            self.dataX.append(tiempo_transcurrido)
+    def _render_frame(self, force=False):
+        """
+        Redibuja las curvas que recibieron datos desde el último cuadro.
 
-            for i in range(len(self.dataY)):
-                self.curves[i].setData(list(self.dataX), list(self.dataY[i]))
+        Si cambió el rango visible o el ancho del gráfico se redibujan todas.
+        Cada curva recibe solo el tramo visible, en muestras crudas o desde un
+        nivel de detalle del buffer (ver LodPlotBuffer.visible).
 
+        Mientras el gráfico está oculto no se dibuja nada; los cambios quedan
+        pendientes hasta que se muestre (o hasta una llamada con force=True).
+        """
+        if not force and not self.plot.isVisible():
+            return
+        view_box = self.plot.getViewBox()
+        if not self._follow_latest and view_box.autoRangeEnabled()[0]:
+            self._follow_latest = True
+            self._x_range_dirty = True
+        x = self.plot_buffer.x_view()
+        if self._follow_latest and self._x_range_dirty and len(x):
+            tiempo_transcurrido = x[-1]
             self.plot.setXRange(max(0, tiempo_transcurrido - 10), max(80, tiempo_transcurrido))
-            self.last_update_time = current_time
+        self._x_range_dirty = False
+
+        x0, x1 = view_box.viewRange()[0]
+        columns = int(view_box.width()) or self.width()
+        view = (x0, x1, columns)
+        if view != self._rendered_view:
+            self._dirty_curves.update(range(len(self.curves)))
+            self._rendered_view = view
+        for i in sorted(self._dirty_curves):
+            self.curves[i].setData(*self.plot_buffer.visible(i, x0, x1, columns))
+        self._dirty_curves.clear()
+
+    def _on_manual_range(self, *args):
+        self._follow_latest = False
+
+    def _add_samples(self, lines, times):
+        """Convierte las líneas en muestras y las agrega al buffer del gráfico."""
+        result = self.telemetry_parser.parse_batch(lines)
+        if result.errors:
+            self._report_parse_errors(lines, result.errors)
+        for index, name in result.new_columns:
+            self._add_curve(name or f'Línea {index + 1}')
+        if not result.valid.any():
+            return
+        values = result.values[result.valid]
 
-        except ValueError:
-            pass
+        # Con el buffer lleno se descartan muestras antiguas de todas las curvas
+        if len(self.plot_buffer) + len(values) > self.plot_buffer.capacity:
+            changed = range(len(self.curves))
+        else:
+            changed = np.flatnonzero(~np.isnan(values).all(axis=0)).tolist()
+        self.plot_buffer.extend(times[result.valid], values)
+        if self.capture_writer is not None:
+            self.capture_writer.append(times[result.valid], values, self.curve_names)
+        self._dirty_curves.update(changed)
+        self._x_range_dirty = True
+
+    def _report_parse_errors(self, lines, errors):
+        """
+        Informa en la consola los campos mal formados del lote. Los lotes
+        llegan una vez por cuadro, así que se escribe a lo más un mensaje por
+        cuadro: el primer error y cuántos más hubo.
+        """
+        first = errors[0]
+        message = get_text('monitor.parse_error', line=lines[first.line],
+                           field=first.field, reason=first.reason)
+        if len(errors) > 1:
+            message += get_text('monitor.parse_errors_more', count=len(errors) - 1)
+        self.console_text.append(message)
+
+    def _add_curve(self, name):
+        """Crea el canal y la curva de una nueva variable; retorna su índice."""
+        index = self.plot_buffer.add_channel()
+        self._create_curve(index, name)
+        return index
+
+    def _create_curve(self, index, name):
+        curve = self.plot.plot(pen=self.colors[index % len(self.colors)], connect='finite')
+        self.curves.append(curve)
+        self.curve_names.append(name)
+        self.plot.plotItem.legend.addItem(curve, name=name)
 
     def update_ports(self):
         self.populate_port_combo()
@@ -269,6 +533,7 @@ class MainWindow(QMainWindow):
     def show_graph(self):
         self.text_edit.hide()
         self.plot.show()
+        self._render_frame()
         self.graph_button.setText(get_text('monitor.show_console'))
         self.graph_visible = True
         self.graph_button.clicked.disconnect()  # Desconectar el botón del método anterior
@@ -292,18 +557,44 @@ class MainWindow(QMainWindow):
         with open(filename, 'w') as file:
             file.write(self.text_edit.toPlainText())
 
+    def save_recording(self, folder_path):
+        """
+        Guarda en la carpeta los archivos de la grabación de la sesión.
+
+        Si la grabación terminó se crean enlaces duros (instantáneo); si sigue
+        activa se copian los archivos tras escribir lo pendiente.
+
+        Returns:
+            bool: False si no hay grabación que guardar
+        """
+        recorder = self.serial_monitor.recorder
+        if recorder is None or not recorder.files:
+            return False
+        recorder.flush()
+        for path in recorder.files:
+            target = os.path.join(folder_path, os.path.basename(path))
+            if os.path.exists(target):
+                os.remove(target)
+            try:
+                if recorder.active:
+                    raise OSError('grabación en curso')
+                os.link(path, target)
+            except OSError:
+                shutil.copyfile(path, target)
+        return True
+
     def save_plot_as_image(self, filename, width=1920, height=1080):
         try:
             exporter = pg.exporters.ImageExporter(self.plot.plotItem)
             exporter.params['width'] = width
 
-            # Ajustar el rango de visualización antes de exportar
+            # Dibujar las muestras pendientes y ajustar el rango antes de exportar
+            self._render_frame(force=True)
             self.plot.setXRange(0, 20)  # 20 segundos en el eje X
             
-            if self.dataY and any(len(data) > 0 for data in self.dataY):
-                min_value = min([min(data) for data in self.dataY if len(data) > 0])
-                max_value = max([max(data) for data in self.dataY if len(data) > 0])
-                self.plot.setYRange(min=min_value, max=max_value)
+            value_range = self.plot_buffer.value_range()
+            if value_range is not None:
+                self.plot.setYRange(min=value_range[0], max=value_range[1])
             else:
                 # Establecer un rango de altura predeterminado si no hay datos
                 self.plot.setYRange(0, 10)  # Puedes ajustar estos valores según sea necesario
@@ -340,14 +631,16 @@ class MainWindow(QMainWindow):
         height = 1080  # Altura deseada para la imagen
 
         if option == "Texto":
-            file_path = os.path.join(folder_path, 'contenido.txt')
-            self.save_text_edit_content(file_path)
+            if not self.save_recording(folder_path):
+                file_path = os.path.join(folder_path, 'contenido.txt')
+                self.save_text_edit_content(file_path)
         elif option == "Imagen":
             file_path = os.path.join(folder_path, 'grafico.png')
             self.save_plot_as_image(file_path, width, height)
         elif option == "Ambos":
-            text_file_path = os.path.join(folder_path, 'contenido.txt')
-            self.save_text_edit_content(text_file_path)
+            if not self.save_recording(folder_path):
+                text_file_path = os.path.join(folder_path, 'contenido.txt')
+                self.save_text_edit_content(text_file_path)
             image_file_path = os.path.join(folder_path, 'grafico.png')
             self.save_plot_as_image(image_file_path, width, height)
 
@@ -356,13 +649,67 @@ class MainWindow(QMainWindow):
     def clear_data(self):
         self.text_edit.clear()
         self.console_text.clear()
+        self._reset_plot()
+
+    def _reset_plot(self, buffer=None):
+        """Borra curvas y muestras; opcionalmente reemplaza el buffer (p. ej. por una captura)."""
         self.plot.clear()
-        self.dataX.clear()
-        self.dataY.clear()
+        if buffer is not None:
+            self.plot_buffer = buffer
+        elif isinstance(self.plot_buffer, LodPlotBuffer):
+            self.plot_buffer.clear()
+        else:
+            self.plot_buffer = LodPlotBuffer(self.plot_capacity)
         self.curves.clear()
-        self.variable_indices.clear()
+        self.curve_names.clear()
+        self._dirty_curves.clear()
+        self._x_range_dirty = False
+        self._rendered_view = None
+        self.telemetry_parser.reset()
         self.plot.addLegend(colCount=5)
 
+    def _close_capture(self):
+        if self.capture_writer is not None:
+            path = self.capture_writer.close()
+            self.capture_writer = None
+            self.console_text.append(get_text('monitor.recording_saved', path=path))
+
+    def load_capture_file(self):
+        path, _ = QFileDialog.getOpenFileName(
+            self, get_text('monitor.load_capture'), self.data_folder,
+            f"Capturas (*{CAPTURE_EXTENSION})"
+        )
+        if path:
+            self.replay_capture(path)
+
+    def replay_capture(self, path):
+        """
+        Muestra en el gráfico una captura .fabcap guardada.
+
+        La captura no se copia al buffer: el gráfico usa una CaptureLodView
+        sobre las columnas abiertas con np.memmap, que solo lee del archivo
+        los niveles de detalle y el tramo visible. Con el puerto abierto no se
+        carga, para no mezclarla con las muestras (y la grabación) en curso.
+        """
+        if self.serial_monitor.serial.isOpen():
+            self.console_text.append(get_text('monitor.capture_busy'))
+            return
+        try:
+            capture = load_capture(path)
+        except (OSError, ValueError) as e:
+            self.console_text.append(get_text('monitor.capture_error', error=str(e)))
+            return
+        self._reset_plot(CaptureLodView(capture.time, capture.values))
+        for index, name in enumerate(capture.columns):
+            self._create_curve(index, name)
+        self._dirty_curves.update(range(len(self.curves)))
+        self._follow_latest = False
+        if len(capture.time):
+            self.plot.setXRange(capture.time[0], capture.time[-1])
+        self.toggle_graph(True)
+        self._render_frame(force=True)
+        self.console_text.append(get_text('monitor.capture_loaded', path=path, rows=len(capture.time)))
+
     def change_language(self):
         """
         Actualiza los textos de la ventana del monitor cuando cambia el idioma.
@@ -382,13 +729,18 @@ class MainWindow(QMainWindow):
             self.graph_button.setText(get_text('monitor.show_graph'))
         
         self.send_button.setText(get_text('monitor.send'))
+        self.record_checkbox.setText(get_text('monitor.record'))
         self.clear_button.setText(get_text('monitor.clear'))
+        self.load_button.setText(get_text('monitor.load_capture'))
+        self.text_edit.change_language()
         self.save_button.setText(get_text('monitor.save'))
         self.console_label.setText(get_text('monitor.console'))
 
     def closeEvent(self, event):
         if self.serial_monitor.serial.isOpen():
             self.serial_monitor.close_port()
+        self._close_capture()
+        self.port_inventory.unsubscribe(self.update_ports)
         event.accept()
 
 def run_serial_monitor_app(show_graph=False):
@@ -0,0 +1,129 @@
+"""
+Buffer circular de muestras para el graficador serial
+
+Guarda el eje X (tiempo) y todas las series en arreglos NumPy preasignados,
+con una fila por canal. Cada muestra se escribe dos veces (en la posición i y
+en i + capacidad), de modo que las últimas `capacity` muestras siempre forman
+un bloque contiguo: las vistas que se entregan a pyqtgraph no copian datos.
+
+Los canales pueden agregarse en cualquier momento (nuevas variables); las
+muestras sin valor para un canal quedan como NaN.
+
+Autor: Código Abierto Fab Blocks IDE
+Licencia: MIT
+"""
+import numpy as np
+
+# Capacidad por defecto (muestras por canal)
+DEFAULT_CAPACITY = 200000
+
+
+class PlotRingBuffer:
+    def __init__(self, capacity=DEFAULT_CAPACITY, channels=0):
+        if capacity <= 0:
+            raise ValueError("capacity debe ser mayor que cero")
+        self.capacity = int(capacity)
+        self._x = np.empty(2 * self.capacity, dtype=np.float64)
+        self._y = np.full((channels, 2 * self.capacity), np.nan, dtype=np.float64)
+        self._pos = 0
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    @property
+    def channels(self):
+        return self._y.shape[0]
+
+    def add_channel(self):
+        """Agrega un canal vacío (NaN) y retorna su índice."""
+        row = np.full((1, 2 * self.capacity), np.nan, dtype=np.float64)
+        self._y = np.vstack([self._y, row])
+        return self.channels - 1
+
+    def append(self, x, values):
+        """
+        Agrega una muestra.
+
+        Args:
+            x (float): Tiempo de la muestra
+            values (sequence): Valores por canal; los canales faltantes quedan en NaN
+        """
+        pos = self._pos
+        mirror = pos + self.capacity
+        self._x[pos] = x
+        self._x[mirror] = x
+        n = len(values)
+        self._y[:n, pos] = values
+        self._y[:n, mirror] = values
+        self._y[n:, pos] = np.nan
+        self._y[n:, mirror] = np.nan
+        self._pos = (pos + 1) % self.capacity
+        self._size = min(self._size + 1, self.capacity)
+
+    def extend(self, xs, values):
+        """
+        Agrega varias muestras a la vez.
+
+        Args:
+            xs (array): Tiempos, forma (n,)
+            values (array): Valores, forma (n, canales_del_lote); columnas
+                faltantes quedan en NaN
+        """
+        xs = np.asarray(xs, dtype=np.float64)
+        values = np.asarray(values, dtype=np.float64).reshape(len(xs), -1)
+        n = len(xs)
+        if n == 0:
+            return
+        if n > self.capacity:
+            xs = xs[-self.capacity:]
+            values = values[-self.capacity:]
+            self._pos = (self._pos + n - self.capacity) % self.capacity
+            n = self.capacity
+        cols = values.shape[1]
+        # Hasta dos tramos contiguos (antes y después de dar la vuelta),
+        # escritos en la zona principal y en su espejo
+        first = min(n, self.capacity - self._pos)
+        segments = [(self._pos, 0, first)]
+        if first < n:
+            segments.append((0, first, n))
+        for start, lo, hi in segments:
+            for offset in (start, start + self.capacity):
+                stop = offset + hi - lo
+                self._x[offset:stop] = xs[lo:hi]
+                self._y[:cols, offset:stop] = values[lo:hi].T
+                self._y[cols:, offset:stop] = np.nan
+        self._pos = (self._pos + n) % self.capacity
+        self._size = min(self._size + n, self.capacity)
+
+    def _start(self):
+        return (self._pos - self._size) % self.capacity
+
+    def x_view(self):
+        """Vista contigua (sin copia) de los tiempos almacenados."""
+        start = self._start()
+        return self._x[start:start + self._size]
+
+    def y_view(self, channel):
+        """Vista contigua (sin copia) de los valores de un canal."""
+        start = self._start()
+        return self._y[channel, start:start + self._size]
+
+    def y_views(self):
+        """Vista 2-D (canales x muestras) de todos los canales."""
+        start = self._start()
+        return self._y[:, start:start + self._size]
+
+    def value_range(self):
+        """(mínimo, máximo) de todos los canales, o None si no hay valores."""
+        values = self.y_views()
+        if not values.size or np.isnan(values).all():
+            return None
+        return float(np.nanmin(values)), float(np.nanmax(values))
+
+    def clear(self, keep_channels=False):
+        """Descarta las muestras; opcionalmente conserva los canales."""
+        channels = self.channels if keep_channels else 0
+        self._y = np.full((channels, 2 * self.capacity), np.nan, dtype=np.float64)
+        self._pos = 0
+        self._size = 0
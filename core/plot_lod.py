@@ -0,0 +1,265 @@
+"""
+Niveles de detalle (LOD) para el graficador serial
+
+LodPlotBuffer extiende el buffer circular con una pirámide de diezmado
+mín/máx: el nivel 1 resume bloques de LOD_FACTOR muestras, el nivel 2 bloques
+de LOD_FACTOR² y así sucesivamente. Cada nivel es a su vez un par de buffers
+circulares (mínimos y máximos) que se actualiza al agregar muestras, sin
+recorrer el historial.
+
+visible() elige qué entregar a pyqtgraph según el rango visible y el ancho
+en píxeles: si las muestras crudas caben (a lo más POINTS_PER_COLUMN por
+columna) se usan tal cual; si no, se usa el nivel más fino que deje como
+máximo un bloque por columna, dibujado como pares mín/máx. Así el costo de
+dibujo no depende de cuánto tiempo lleve la captura.
+
+CaptureLodView ofrece la misma visible() para una captura .fabcap abierta con
+np.memmap: los niveles se calculan leyendo las columnas por bloques de
+CAPTURE_CHUNK_ROWS filas y las muestras crudas se leen del archivo solo para
+el tramo visible, sin copiar la captura a memoria.
+
+Autor: Código Abierto Fab Blocks IDE
+Licencia: MIT
+"""
+import numpy as np
+
+from core.plot_buffer import PlotRingBuffer, DEFAULT_CAPACITY
+
+# Muestras agrupadas por bloque entre un nivel y el siguiente
+LOD_FACTOR = 8
+# Un nivel solo se crea si tiene al menos esta cantidad de bloques
+MIN_LEVEL_BLOCKS = 64
+# Muestras crudas permitidas por columna de píxeles antes de pasar a un nivel
+POINTS_PER_COLUMN = 2
+# Filas de una captura leídas por bloque al construir sus niveles
+CAPTURE_CHUNK_ROWS = LOD_FACTOR ** 6
+
+
+def _reduce_blocks(ufunc, blocks):
+    """
+    Reduce cada bloque (eje 1) con fmin/fmax, que ignoran NaN sin advertencias.
+
+    Recorrer el eje corto con operaciones sobre filas completas es más rápido
+    que ufunc.reduce(axis=1) sobre datos intercalados.
+    """
+    result = blocks[:, 0].copy()
+    for k in range(1, blocks.shape[1]):
+        ufunc(result, blocks[:, k], out=result)
+    return result
+
+
+class _LodLevel:
+    """Un nivel de la pirámide: mín/máx por bloque de `block` muestras crudas."""
+
+    def __init__(self, block, capacity, channels):
+        self.block = block
+        self.mins = PlotRingBuffer(capacity, channels)
+        self.maxs = PlotRingBuffer(capacity, channels)
+        self._pending_x = np.empty(0, dtype=np.float64)
+        self._pending_min = np.empty((0, channels), dtype=np.float64)
+        self._pending_max = np.empty((0, channels), dtype=np.float64)
+
+    def add_channel(self):
+        self.mins.add_channel()
+        self.maxs.add_channel()
+        pad = np.full((len(self._pending_x), 1), np.nan)
+        self._pending_min = np.hstack([self._pending_min, pad])
+        self._pending_max = np.hstack([self._pending_max, pad])
+
+    def push(self, xs, mins, maxs):
+        """
+        Agrega filas del nivel inferior y retorna los bloques completados
+        (x, mínimos, máximos) para alimentar al nivel siguiente.
+        """
+        if len(self._pending_x):
+            xs = np.concatenate([self._pending_x, xs])
+            mins = np.concatenate([self._pending_min, mins])
+            maxs = np.concatenate([self._pending_max, maxs])
+        blocks = len(xs) // LOD_FACTOR
+        cut = blocks * LOD_FACTOR
+        self._pending_x = xs[cut:]
+        self._pending_min = mins[cut:]
+        self._pending_max = maxs[cut:]
+        if not blocks:
+            return None
+        channels = mins.shape[1]
+        block_x = xs[:cut:LOD_FACTOR]
+        block_min = _reduce_blocks(np.fmin, mins[:cut].reshape(blocks, LOD_FACTOR, channels))
+        block_max = _reduce_blocks(np.fmax, maxs[:cut].reshape(blocks, LOD_FACTOR, channels))
+        self.mins.extend(block_x, block_min)
+        self.maxs.extend(block_x, block_max)
+        return block_x, block_min, block_max
+
+    def view(self, channel):
+        """(x de cada bloque, mínimos, máximos) de un canal."""
+        return self.mins.x_view(), self.mins.y_view(channel), self.maxs.y_view(channel)
+
+
+class LodPlotBuffer(PlotRingBuffer):
+    def __init__(self, capacity=DEFAULT_CAPACITY, channels=0):
+        super().__init__(capacity, channels)
+        self.levels = self._build_levels(channels)
+
+    def _build_levels(self, channels):
+        levels = []
+        block = LOD_FACTOR
+        while self.capacity // block >= MIN_LEVEL_BLOCKS:
+            levels.append(_LodLevel(block, self.capacity // block + 2, channels))
+            block *= LOD_FACTOR
+        return levels
+
+    def add_channel(self):
+        for level in self.levels:
+            level.add_channel()
+        return super().add_channel()
+
+    def append(self, x, values):
+        row = np.full((1, self.channels), np.nan)
+        row[0, :len(values)] = values
+        self.extend([x], row)
+
+    def extend(self, xs, values):
+        xs = np.asarray(xs, dtype=np.float64)
+        values = np.asarray(values, dtype=np.float64).reshape(len(xs), -1)
+        if values.shape[1] < self.channels:
+            padded = np.full((len(xs), self.channels), np.nan)
+            padded[:, :values.shape[1]] = values
+            values = padded
+        super().extend(xs, values)
+        mins = maxs = values
+        for level in self.levels:
+            completed = level.push(xs, mins, maxs)
+            if completed is None:
+                break
+            xs, mins, maxs = completed
+
+    def clear(self, keep_channels=False):
+        super().clear(keep_channels)
+        self.levels = self._build_levels(self.channels)
+
+    def visible(self, channel, x0, x1, columns):
+        """
+        Retorna (x, y) para dibujar un canal en el rango [x0, x1].
+
+        Args:
+            channel (int): Índice del canal
+            x0, x1 (float): Rango visible del eje X
+            columns (int): Ancho del gráfico en píxeles
+        """
+        return _visible(self.x_view(), self.y_view(channel), self.levels, channel, x0, x1, columns)
+
+
+class _CaptureLevel:
+    """Un nivel de la pirámide de una captura: arreglos fijos (canales, bloques)."""
+
+    def __init__(self, block, x, mins, maxs):
+        self.block = block
+        self.x = x
+        self.mins = mins
+        self.maxs = maxs
+
+    def view(self, channel):
+        return self.x, self.mins[channel], self.maxs[channel]
+
+
+class CaptureLodView:
+    """
+    Vista de solo lectura de una captura para el gráfico.
+
+    Args:
+        time (array): Tiempos (N,), normalmente un np.memmap
+        values (array): Valores (canales, N), normalmente un np.memmap
+    """
+
+    def __init__(self, time, values):
+        self.time = time
+        self.values = values
+        self.levels = self._build_levels()
+
+    def __len__(self):
+        return len(self.time)
+
+    @property
+    def channels(self):
+        return self.values.shape[0]
+
+    def x_view(self):
+        return self.time
+
+    def visible(self, channel, x0, x1, columns):
+        """Como LodPlotBuffer.visible; solo lee del archivo el tramo visible."""
+        return _visible(self.time, self.values[channel], self.levels, channel, x0, x1, columns)
+
+    def value_range(self):
+        """(mínimo, máximo) de todos los canales, o None si no hay valores."""
+        if self.levels:
+            # El nivel más grueso resume todas las filas
+            level = self.levels[-1]
+            return _nan_range(level.mins, level.maxs)
+        values = np.asarray(self.values)
+        return _nan_range(values, values)
+
+    def _build_levels(self):
+        rows = len(self.time)
+        levels = []
+        if rows // LOD_FACTOR < MIN_LEVEL_BLOCKS:
+            return levels
+        # Primer nivel: se recorre la captura por bloques de filas
+        blocks = -(-rows // LOD_FACTOR)
+        mins = np.empty((self.channels, blocks), dtype=np.float32)
+        maxs = np.empty((self.channels, blocks), dtype=np.float32)
+        for start in range(0, rows, CAPTURE_CHUNK_ROWS):
+            chunk = np.asarray(self.values[:, start:start + CAPTURE_CHUNK_ROWS])
+            first = start // LOD_FACTOR
+            starts = np.arange(0, chunk.shape[1], LOD_FACTOR)
+            mins[:, first:first + len(starts)] = np.fmin.reduceat(chunk, starts, axis=1)
+            maxs[:, first:first + len(starts)] = np.fmax.reduceat(chunk, starts, axis=1)
+        levels.append(_CaptureLevel(LOD_FACTOR, np.array(self.time[::LOD_FACTOR]), mins, maxs))
+        # Los niveles siguientes se calculan desde el anterior, ya en memoria
+        while blocks // LOD_FACTOR >= MIN_LEVEL_BLOCKS:
+            previous = levels[-1]
+            starts = np.arange(0, blocks, LOD_FACTOR)
+            levels.append(_CaptureLevel(previous.block * LOD_FACTOR, previous.x[::LOD_FACTOR],
+                                        np.fmin.reduceat(previous.mins, starts, axis=1),
+                                        np.fmax.reduceat(previous.maxs, starts, axis=1)))
+            blocks = len(starts)
+        return levels
+
+
+def _visible(x, y, levels, channel, x0, x1, columns):
+    """
+    Elige entre muestras crudas y un nivel de detalle (ver el encabezado del
+    módulo). x e y pueden ser vistas del buffer o columnas de un np.memmap:
+    solo se lee el tramo visible.
+    """
+    i0, i1 = _visible_slice(x, x0, x1)
+    columns = max(int(columns), 1)
+    count = i1 - i0
+    if count <= columns * POINTS_PER_COLUMN or not levels:
+        return np.asarray(x[i0:i1]), np.asarray(y[i0:i1])
+
+    level = levels[-1]
+    for candidate in levels:
+        if count / candidate.block <= columns:
+            level = candidate
+            break
+    block_x, mins, maxs = level.view(channel)
+    j0, j1 = _visible_slice(block_x, x0, x1)
+    out_x = np.repeat(block_x[j0:j1], 2)
+    out_y = np.empty(len(out_x), dtype=np.float64)
+    out_y[0::2] = mins[j0:j1]
+    out_y[1::2] = maxs[j0:j1]
+    return out_x, out_y
+
+
+def _visible_slice(x, x0, x1):
+    """Índices del rango visible, con una muestra extra a cada lado."""
+    i0 = max(int(np.searchsorted(x, x0, side='left')) - 1, 0)
+    i1 = min(int(np.searchsorted(x, x1, side='right')) + 1, len(x))
+    return i0, i1
+
+
+def _nan_range(mins, maxs):
+    if not mins.size or np.isnan(mins).all():
+        return None
+    return float(np.nanmin(mins)), float(np.nanmax(maxs))
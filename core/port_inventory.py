@@ -0,0 +1,88 @@
+"""
+Inventario de puertos seriales compartido por todo el proceso
+
+Todas las ventanas (IDE y monitores) leen la lista de puertos desde una única
+instancia de PortInventory en lugar de enumerar cada una por su cuenta. El
+inventario mantiene un solo PortMonitor con los datos de cada puerto en caché
+(descripción, VID/PID, número de serie) y reenvía sus cambios en la señal
+changed(agregados, quitados).
+
+Uso típico en una ventana:
+
+    self.port_inventory = get_port_inventory()
+    self.port_inventory.subscribe(self.update_ports)
+    ...
+    self.port_inventory.unsubscribe(self.update_ports)   # en closeEvent
+
+El monitor se inicia con el primer suscriptor y se detiene con el último, así
+el costo de enumerar no depende de cuántas ventanas haya abiertas.
+
+Autor: Código Abierto Fab Blocks IDE
+Licencia: MIT
+"""
+from PyQt5.QtCore import QObject, pyqtSignal
+
+from core.port_monitor import PortMonitor
+
+
+class PortInventory(QObject):
+    # Dispositivos agregados y quitados; se emite en el hilo de la interfaz
+    changed = pyqtSignal(list, list)
+
+    def __init__(self, monitor=None):
+        super().__init__()
+        self.monitor = monitor or PortMonitor()
+        self.monitor.portChanged.connect(self.changed)
+        self._subscribers = []
+
+    def subscribe(self, callback):
+        """
+        Conecta `callback(agregados, quitados)` a los cambios de puertos.
+
+        La lista ya está disponible al retornar, así que la ventana puede
+        llenar sus controles de inmediato con ports() o devices().
+        """
+        if not self._subscribers:
+            self.monitor.start()
+        self._subscribers.append(callback)
+        self.changed.connect(callback)
+
+    def unsubscribe(self, callback):
+        if callback not in self._subscribers:
+            return
+        self._subscribers.remove(callback)
+        try:
+            self.changed.disconnect(callback)
+        except TypeError:
+            pass
+        if not self._subscribers:
+            self.monitor.stop()
+
+    def ports(self):
+        """Lista de PortInfo ordenada por dispositivo."""
+        ports = self._current()
+        return [ports[device] for device in sorted(ports)]
+
+    def devices(self):
+        return sorted(self._current())
+
+    def info(self, device):
+        """PortInfo de un dispositivo, o None si no está conectado."""
+        return self._current().get(device)
+
+    def _current(self):
+        # Sin suscriptores el monitor no está vigilando: enumerar en el momento
+        if not self.monitor.running:
+            self.monitor.check()
+        return self.monitor.ports
+
+
+_inventory = None
+
+
+def get_port_inventory():
+    """Retorna el inventario de puertos del proceso, creándolo si no existe."""
+    global _inventory
+    if _inventory is None:
+        _inventory = PortInventory()
+    return _inventory
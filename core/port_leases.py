@@ -0,0 +1,137 @@
+"""
+Registro de puertos seriales abiertos por este proceso
+
+Cada componente que abre un puerto (por ejemplo el QSerialPort del monitor
+serial) registra un arriendo con una función que sabe cerrarlo. Antes de
+cargar un programa se libera solo el puerto de destino, en lugar de abrir y
+cerrar todos los puertos del sistema:
+
+    lease = get_port_leases().acquire('/dev/ttyUSB0', 'Monitor serial', close_fn)
+    ...
+    lease.drop()                      # el dueño cerró el puerto por su cuenta
+
+    released, failed = get_port_leases().release('/dev/ttyUSB0')
+    results = get_port_leases().release_many(['COM3', 'COM4'])
+
+close_fn recibe el tiempo máximo (segundos) que puede tardar y retorna True
+si el puerto quedó cerrado. El dueño puede dar además stop_fn, que pide el
+cierre sin esperar (por ejemplo, avisar al hilo lector que termine): al
+liberar varios puertos se llama primero a stop_fn de todos los arriendos y
+luego se espera a cada uno, de modo que los puertos se cierran a la vez y
+cada uno tiene su propio plazo de RELEASE_TIMEOUT, en lugar de sumarse.
+
+Autor: Código Abierto Fab Blocks IDE
+Licencia: MIT
+"""
+import logging
+import threading
+import time
+
+# Tiempo máximo para liberar los arriendos de cada puerto (segundos)
+RELEASE_TIMEOUT = 2.0
+
+
+class PortLease:
+    def __init__(self, registry, port, owner, release, stop=None):
+        self.registry = registry
+        self.port = port
+        self.owner = owner
+        self._release = release
+        self._stop = stop
+
+    def drop(self):
+        """Quita el arriendo del registro sin llamar a la función de cierre."""
+        self.registry._remove(self)
+
+
+class PortLeaseRegistry:
+    def __init__(self):
+        self._leases = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, port, owner, release, stop=None):
+        """
+        Registra que `owner` tiene abierto `port`.
+
+        Args:
+            port (str): Dispositivo (COM3, /dev/ttyUSB0, ...)
+            owner (str): Nombre del dueño, para informar al usuario
+            release (callable): release(timeout) -> bool, cierra el puerto
+            stop (callable): stop() pide el cierre sin bloquear (opcional)
+        """
+        lease = PortLease(self, port, owner, release, stop)
+        with self._lock:
+            self._leases.setdefault(port, []).append(lease)
+        return lease
+
+    def holders(self, port):
+        """Nombres de los dueños que tienen abierto el puerto."""
+        with self._lock:
+            return [lease.owner for lease in self._leases.get(port, [])]
+
+    def release(self, port, timeout=RELEASE_TIMEOUT):
+        """
+        Cierra los arriendos de un puerto.
+
+        Returns:
+            tuple: (dueños liberados, dueños que no cerraron a tiempo)
+        """
+        return self.release_many([port], timeout)[port]
+
+    def release_many(self, ports, timeout=RELEASE_TIMEOUT):
+        """
+        Cierra a la vez los arriendos de varios puertos; cada puerto tiene su
+        propio plazo `timeout` contado desde que se pidió el cierre de todos.
+
+        Returns:
+            dict: {puerto: (dueños liberados, dueños que no cerraron a tiempo)}
+        """
+        with self._lock:
+            leases = {port: list(self._leases.get(port, [])) for port in ports}
+        started = time.monotonic()
+        for port_leases in leases.values():
+            for lease in port_leases:
+                if lease._stop is None:
+                    continue
+                try:
+                    lease._stop()
+                except Exception as e:
+                    logging.warning(f"No se pudo pedir el cierre de {lease.port} ({lease.owner}): {e}")
+        results = {}
+        for port, port_leases in leases.items():
+            deadline = started + timeout
+            released = []
+            failed = []
+            for lease in port_leases:
+                remaining = max(deadline - time.monotonic(), 0.0)
+                try:
+                    closed = lease._release(remaining)
+                except Exception as e:
+                    logging.warning(f"No se pudo liberar {port} ({lease.owner}): {e}")
+                    closed = False
+                if closed:
+                    self._remove(lease)
+                    released.append(lease.owner)
+                else:
+                    failed.append(lease.owner)
+            results[port] = (released, failed)
+        return results
+
+    def _remove(self, lease):
+        with self._lock:
+            leases = self._leases.get(lease.port, [])
+            if lease in leases:
+                leases.remove(lease)
+            if not leases:
+                self._leases.pop(lease.port, None)
+
+
+_registry = None
+
+
+def get_port_leases():
+    """Retorna el registro de arriendos del proceso, creándolo si no existe."""
+    global _registry
+    if _registry is None:
+        _registry = PortLeaseRegistry()
+    return _registry
@@ -1,18 +1,219 @@
+"""
+Detección de conexión y desconexión de puertos seriales
+
+PortMonitor vigila los puertos en un hilo propio y emite portChanged con las
+listas de dispositivos agregados y quitados. Según el sistema usa:
+
+- netlink: eventos uevent del kernel (Linux); el hilo duerme hasta que se
+  conecta o desconecta un dispositivo tty.
+- inotify: creación/borrado de nodos en /dev (Linux sin acceso a netlink).
+- polling: consulta comports() cada POLL_INTERVAL segundos (resto de sistemas).
+
+Con netlink o inotify la lista de puertos solo se vuelve a leer después de un
+evento, así que sin cambios el hilo no consume CPU. stop() despierta al hilo
+y espera a que termine.
+
+Autor: Código Abierto Fab Blocks IDE
+Licencia: MIT
+"""
+import ctypes
+import ctypes.util
+import logging
+import os
+import select
+import socket
+import struct
+import sys
+import threading
+from collections import namedtuple
+
 from PyQt5.QtCore import QObject, pyqtSignal
 import serial.tools.list_ports
-import time
 
-class PortMonitor(QObject):
-    portChanged = pyqtSignal()
+# Intervalo de consulta cuando no hay notificaciones del sistema (segundos)
+POLL_INTERVAL = 1.0
+# Espera tras un evento para agrupar ráfagas y dar tiempo a udev de crear el nodo
+SETTLE_DELAY = 0.3
+
+_NETLINK_KOBJECT_UEVENT = 15
+_IN_CREATE = 0x00000100
+_IN_DELETE = 0x00000200
+_IN_NONBLOCK = os.O_NONBLOCK
+_INOTIFY_EVENT = struct.Struct('iIII')
+# Prefijos de los nodos de /dev que pueden ser puertos seriales
+_SERIAL_PREFIXES = ('tty', 'rfcomm')
+
+
+# Datos de un puerto tal como los entrega pyserial al enumerar
+PortInfo = namedtuple('PortInfo', ['device', 'description', 'vid', 'pid', 'serial_number'])
+
+
+def _scan_ports():
+    """Enumera los puertos: dict dispositivo -> PortInfo."""
+    return {
+        port.device: PortInfo(port.device, port.description, port.vid, port.pid, port.serial_number)
+        for port in serial.tools.list_ports.comports()
+    }
+
+
+class _NetlinkWatcher:
+    """Eventos uevent del kernel; solo interesan los del subsistema tty."""
 
     def __init__(self):
+        self._socket = socket.socket(socket.AF_NETLINK, socket.SOCK_RAW, _NETLINK_KOBJECT_UEVENT)
+        try:
+            self._socket.bind((0, 1))
+            self._socket.setblocking(False)
+        except OSError:
+            self._socket.close()
+            raise
+
+    def fileno(self):
+        return self._socket.fileno()
+
+    def read(self):
+        """Lee los eventos pendientes; retorna True si alguno es de un tty."""
+        relevant = False
+        while True:
+            try:
+                message = self._socket.recv(8192)
+            except BlockingIOError:
+                return relevant
+            if b'\0SUBSYSTEM=tty\0' in message:
+                relevant = True
+
+    def close(self):
+        self._socket.close()
+
+
+class _InotifyWatcher:
+    """Creación y borrado de nodos tty*/rfcomm* en /dev."""
+
+    def __init__(self, path='/dev'):
+        libc = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True)
+        self._fd = libc.inotify_init1(_IN_NONBLOCK)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), 'inotify_init1')
+        if libc.inotify_add_watch(self._fd, path.encode(), _IN_CREATE | _IN_DELETE) < 0:
+            os.close(self._fd)
+            raise OSError(ctypes.get_errno(), 'inotify_add_watch')
+
+    def fileno(self):
+        return self._fd
+
+    def read(self):
+        relevant = False
+        while True:
+            try:
+                data = os.read(self._fd, 4096)
+            except BlockingIOError:
+                return relevant
+            offset = 0
+            while offset < len(data):
+                _, _, _, length = _INOTIFY_EVENT.unpack_from(data, offset)
+                offset += _INOTIFY_EVENT.size
+                name = data[offset:offset + length].rstrip(b'\0')
+                offset += length
+                if name.startswith(tuple(p.encode() for p in _SERIAL_PREFIXES)):
+                    relevant = True
+
+    def close(self):
+        os.close(self._fd)
+
+
+class PortMonitor(QObject):
+    # Dispositivos agregados y quitados desde la última notificación
+    portChanged = pyqtSignal(list, list)
+
+    def __init__(self, poll_interval=POLL_INTERVAL):
         super().__init__()
+        self.poll_interval = poll_interval
+        # Último resultado de la enumeración (dispositivo -> PortInfo); se
+        # reemplaza entero en cada lectura, por lo que es seguro leerlo desde otro hilo
+        self.ports = {}
+        self.backend = None
+        self._thread = None
+        self._stop = threading.Event()
+        self._wake_r, self._wake_w = os.pipe()
+
+    @property
+    def running(self):
+        return self._thread is not None
+
+    def start(self):
+        """
+        Lee los puertos en el hilo actual e inicia la vigilancia en segundo
+        plano; al retornar, self.ports ya está actualizado.
+        """
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self.check()
+        self._thread = threading.Thread(target=self._watch, daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=2.0):
+        """Despierta al hilo de vigilancia y espera a que termine."""
+        self._stop.set()
+        os.write(self._wake_w, b'\0')
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
 
     def run(self):
-        previous_ports = []
-        while True:
-            current_ports = [port.device for port in serial.tools.list_ports.comports()]
-            if current_ports != previous_ports:
-                self.portChanged.emit()
-                previous_ports = current_ports
-            time.sleep(1)
+        """Lee los puertos y vigila en el hilo actual hasta que se llame a stop()."""
+        self.check()
+        self._watch()
+
+    def _watch(self):
+        watcher = self._open_watcher()
+        try:
+            while not self._stop.is_set():
+                if watcher is None:
+                    if self._stop.wait(self.poll_interval):
+                        break
+                elif not self._wait_event(watcher):
+                    continue
+                if not self._stop.is_set():
+                    self.check()
+        finally:
+            if watcher is not None:
+                watcher.close()
+
+    def check(self):
+        """Vuelve a leer los puertos y emite portChanged si algo cambió."""
+        current = _scan_ports()
+        added = sorted(current.keys() - self.ports.keys())
+        removed = sorted(self.ports.keys() - current.keys())
+        self.ports = current
+        if added or removed:
+            self.portChanged.emit(added, removed)
+        return added, removed
+
+    def _wait_event(self, watcher):
+        """Bloquea hasta un evento de puerto serial; False si no hubo ninguno."""
+        ready, _, _ = select.select([watcher, self._wake_r], [], [])
+        if self._wake_r in ready:
+            os.read(self._wake_r, 64)
+            return False
+        if not watcher.read():
+            return False
+        # Agrupar la ráfaga de eventos de una misma conexión
+        while select.select([watcher, self._wake_r], [], [], SETTLE_DELAY)[0]:
+            if self._stop.is_set():
+                return False
+            watcher.read()
+        return True
+
+    def _open_watcher(self):
+        if sys.platform.startswith('linux'):
+            for backend, factory in (('netlink', _NetlinkWatcher), ('inotify', _InotifyWatcher)):
+                try:
+                    watcher = factory()
+                except (OSError, AttributeError) as e:
+                    logging.debug(f"PortMonitor: {backend} no disponible: {e}")
+                    continue
+                self.backend = backend
+                return watcher
+        self.backend = 'polling'
+        return None
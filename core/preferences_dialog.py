@@ -1,4 +1,16 @@
-from PyQt5.QtWidgets import QDialog, QVBoxLayout, QLabel, QLineEdit, QCheckBox, QComboBox, QPushButton, QFileDialog
+from PyQt5.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QFormLayout, QLabel, QLineEdit, QCheckBox,
+                             QComboBox, QPushButton, QFileDialog, QSpinBox)
+from core.build_cache import BuildCache
+from core.config_manager import NUMERIC_SETTINGS
+from core.core_cache import CoreCache
+
+# Etiqueta y unidad de cada ajuste numérico que se edita en el diálogo
+NUMERIC_LABELS = {
+    'plot_capacity': ("Muestras por canal del gráfico:", ""),
+    'plot_fps': ("Cuadros por segundo del gráfico:", ""),
+    'core_cache_mb': ("Tamaño máximo de la caché de núcleos:", " MB"),
+    'build_cache_mb': ("Tamaño máximo de la caché de programas:", " MB"),
+}
 
 class PreferencesDialog(QDialog):
     def __init__(self, config_manager, parent=None):
@@ -45,6 +57,31 @@ class PreferencesDialog(QDialog):
             if index != -1:
                 self.language_combo.setCurrentIndex(index)
 
+        # Ajustes numéricos, limitados a su rango válido
+        self.number_spins = {}
+        numbers_layout = QFormLayout()
+        for key, (label, suffix) in NUMERIC_LABELS.items():
+            _, minimum, maximum = NUMERIC_SETTINGS[key]
+            spin = QSpinBox()
+            spin.setRange(minimum, maximum)
+            spin.setSuffix(suffix)
+            spin.setValue(self.config_manager.get_number(key))
+            numbers_layout.addRow(label, spin)
+            self.number_spins[key] = spin
+        self.layout.addLayout(numbers_layout)
+        self.layout.addWidget(QLabel("Estos valores se aplican al abrir otra ventana del monitor o del IDE."))
+
+        # Estado de las cachés de compilación (núcleos por placa y programas .hex)
+        self.layout.addWidget(QLabel("Caché de compilación:"))
+        self.cache_stats_label = QLabel()
+        clear_cache_button = QPushButton("Vaciar caché")
+        clear_cache_button.clicked.connect(self.clear_build_caches)
+        cache_layout = QHBoxLayout()
+        cache_layout.addWidget(self.cache_stats_label, 1)
+        cache_layout.addWidget(clear_cache_button)
+        self.layout.addLayout(cache_layout)
+        self.update_cache_stats()
+
         # Botón para seleccionar la ubicación del archivo
         select_file_button = QPushButton("Seleccionar Archivo")
         select_file_button.clicked.connect(self.select_exe_file)
@@ -55,6 +92,22 @@ class PreferencesDialog(QDialog):
         save_button.clicked.connect(self.save_preferences)
         self.layout.addWidget(save_button)
 
+    # Método para mostrar aciertos, fallos y tamaño de las cachés
+    def update_cache_stats(self):
+        stats = CoreCache().stats()
+        builds_mb = BuildCache().size() / (1024 * 1024)
+        self.cache_stats_label.setText(
+            f"Núcleos: {stats['boards']} placas, {stats['bytes'] / (1024 * 1024):.1f} MB "
+            f"(aciertos: {stats['hits']}, fallos: {stats['misses']})\n"
+            f"Programas compilados: {builds_mb:.1f} MB"
+        )
+
+    # Método para borrar los núcleos precompilados y los binarios guardados
+    def clear_build_caches(self):
+        CoreCache().clear()
+        BuildCache().clear()
+        self.update_cache_stats()
+
     # Método para abrir el cuadro de diálogo de selección de archivos .exe
     def select_exe_file(self):
         file_dialog = QFileDialog()
@@ -79,4 +132,7 @@ class PreferencesDialog(QDialog):
         language = self.language_combo.itemText(language_index)
         self.config_manager.set_value('language', language)
 
+        for key, spin in self.number_spins.items():
+            self.config_manager.set_value(key, spin.value())
+
         self.close()
@@ -0,0 +1,119 @@
+"""
+Grabación continua de la sesión serial a disco
+
+SerialRecorder guarda cada línea recibida, con su tiempo monotónico desde el
+inicio de la grabación, en archivos de texto de solo-agregar dentro de
+data_serial/. Formato de cada línea del archivo:
+
+    <segundos>\t<línea recibida>
+
+Las líneas se encolan en memoria (write_lines es seguro desde cualquier hilo)
+y un hilo en segundo plano las escribe cada FLUSH_INTERVAL segundos. Cuando
+un archivo supera max_bytes se continúa en el siguiente (_000, _001, ...).
+
+Autor: Código Abierto Fab Blocks IDE
+Licencia: MIT
+"""
+import os
+import re
+import threading
+import time
+from datetime import datetime
+
+# Tamaño máximo de cada archivo de captura antes de rotar
+ROTATE_BYTES = 16 * 1024 * 1024
+# Intervalo de escritura en segundo plano (segundos)
+FLUSH_INTERVAL = 1.0
+
+
+class SerialRecorder:
+    def __init__(self, folder, max_bytes=ROTATE_BYTES, flush_interval=FLUSH_INTERVAL):
+        self.folder = folder
+        self.max_bytes = max_bytes
+        self.flush_interval = flush_interval
+        self.files = []
+        self._pending = []
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self._file = None
+        self._written = 0
+        self.base_path = None
+        self._t0 = None
+
+    @property
+    def active(self):
+        return self._thread is not None
+
+    def start(self, port_name):
+        """Abre el primer archivo de captura e inicia el hilo de escritura."""
+        os.makedirs(self.folder, exist_ok=True)
+        port = re.sub(r'\W+', '_', port_name).strip('_') or 'serial'
+        stamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        self.base_path = os.path.join(self.folder, f'captura_{stamp}_{port}')
+        self._t0 = time.monotonic()
+        self.files = []
+        self._open_next()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def write_lines(self, lines, timestamp=None):
+        """
+        Encola líneas para grabar.
+
+        Args:
+            lines (list): Líneas recibidas
+            timestamp (float): Valor de time.monotonic() al recibirlas
+        """
+        if not self.active or not lines:
+            return
+        if timestamp is None:
+            timestamp = time.monotonic()
+        with self._lock:
+            self._pending.append((timestamp - self._t0, lines))
+
+    def flush(self):
+        """Escribe en disco todo lo encolado hasta ahora."""
+        if self.active:
+            self._drain()
+
+    def stop(self):
+        """Detiene la grabación, escribe lo pendiente y retorna los archivos creados."""
+        if not self.active:
+            return self.files
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+        self._drain()
+        with self._write_lock:
+            self._file.close()
+            self._file = None
+        return self.files
+
+    def _run(self):
+        while not self._stop.wait(self.flush_interval):
+            self._drain()
+
+    def _drain(self):
+        with self._lock:
+            batches = self._pending
+            self._pending = []
+        with self._write_lock:
+            if self._file is None:
+                return
+            for elapsed, lines in batches:
+                data = ''.join(f'{elapsed:.6f}\t{line}\n' for line in lines).encode('utf-8')
+                self._file.write(data)
+                self._written += len(data)
+                if self._written >= self.max_bytes:
+                    self._file.close()
+                    self._open_next()
+            self._file.flush()
+
+    def _open_next(self):
+        path = f'{self.base_path}_{len(self.files):03d}.txt'
+        self._file = open(path, 'ab')
+        self._written = 0
+        self.files.append(path)
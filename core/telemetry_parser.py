@@ -0,0 +1,163 @@
+"""
+Parser de telemetría serial para el graficador
+
+Convierte lotes de líneas recibidas por el puerto serial en un arreglo NumPy
+(líneas x columnas). Acepta los dos formatos que usan los ejemplos:
+- Con nombre:  "temp:23.5,luz:512"
+- Posicional:  "23.5,512"
+
+La primera línea válida fija el esquema (nombres y orden de los campos). Con
+el esquema en caché, las líneas que lo respetan se convierten de una sola vez
+uniendo el lote y llamando a NumPy; el resto se procesa campo por campo. Un
+campo mal formado queda como NaN y se informa, sin descartar los demás
+valores de la línea.
+
+Autor: Código Abierto Fab Blocks IDE
+Licencia: MIT
+"""
+from collections import namedtuple
+
+import numpy as np
+
+# Error de un campo: índice de la línea en el lote, texto del campo y motivo
+FieldError = namedtuple('FieldError', ['line', 'field', 'reason'])
+
+# Resultado de parse_batch:
+#   values: arreglo (líneas, columnas) con NaN donde no hay valor
+#   valid: máscara de líneas con al menos un valor
+#   errors: lista de FieldError
+#   new_columns: lista de (índice, nombre) de columnas creadas en este lote;
+#                nombre es None para columnas posicionales
+ParseResult = namedtuple('ParseResult', ['values', 'valid', 'errors', 'new_columns'])
+
+_POSITIONAL = 'positional'
+_NAMED = 'named'
+
+
+class TelemetryParser:
+    def __init__(self):
+        # Nombre de cada columna (None para columnas posicionales)
+        self.columns = []
+        self._index = {}
+        # Esquema en caché: (_NAMED, nombres tal como llegan) o (_POSITIONAL, cantidad)
+        self._layout = None
+        self._layout_columns = None
+
+    def reset(self):
+        """Olvida columnas y esquema (por ejemplo al limpiar el gráfico)."""
+        self.columns = []
+        self._index = {}
+        self._layout = None
+        self._layout_columns = None
+
+    def parse_line(self, line):
+        """Procesa una sola línea; equivalente a parse_batch([line])."""
+        return self.parse_batch([line])
+
+    def parse_batch(self, lines):
+        n = len(lines)
+        first_new = len(self.columns)
+        errors = []
+
+        fast = None
+        pending = range(n)
+        if self._layout is not None:
+            fast, pending = self._parse_fast(lines)
+        slow = [(i, self._parse_slow(i, lines[i], errors)) for i in pending]
+
+        values = np.full((n, len(self.columns)), np.nan, dtype=np.float64)
+        valid = np.zeros(n, dtype=bool)
+        if fast is not None:
+            rows, columns, data = fast
+            values[np.ix_(rows, columns)] = data
+            valid[rows] = True
+        for i, (columns, data) in slow:
+            if len(data):
+                values[i, columns] = data
+                valid[i] = True
+        new_columns = [(i, self.columns[i]) for i in range(first_new, len(self.columns))]
+        return ParseResult(values, valid, errors, new_columns)
+
+    def _parse_fast(self, lines):
+        """
+        Convierte de una vez las líneas que respetan el esquema en caché.
+
+        Returns:
+            tuple: ((filas, columnas, datos) o None, índices de las líneas
+                   que deben procesarse campo por campo)
+        """
+        kind, layout = self._layout
+        fields = len(layout) if kind == _NAMED else layout
+        commas = fields - 1
+        text = ','.join(lines)
+        # En el formato con nombre basta contar las comas del lote: si alguna
+        # línea está desalineada, la comprobación de nombres lo detecta
+        if kind == _NAMED and text.count(',') == len(lines) * fields - 1:
+            matching = range(len(lines))
+            pending = []
+        else:
+            matching = [i for i, line in enumerate(lines) if line.count(',') == commas]
+            if not matching:
+                return None, range(len(lines))
+            matched = set(matching)
+            pending = [i for i in range(len(lines)) if i not in matched]
+            text = ','.join(lines[i] for i in matching)
+        try:
+            if kind == _NAMED:
+                tokens = text.replace(':', ',').split(',')
+                # Los nombres deben repetir el esquema en cada línea
+                if tokens[0::2] != list(layout) * len(matching):
+                    raise ValueError('esquema distinto')
+                data = np.array(tokens[1::2], dtype=np.float64)
+            else:
+                data = np.array(text.split(','), dtype=np.float64)
+        except ValueError:
+            return None, range(len(lines))
+        data = data.reshape(len(matching), fields)
+        return (np.asarray(matching, dtype=np.intp), self._layout_columns, data), pending
+
+    def _parse_slow(self, line_index, line, errors):
+        """Procesa una línea campo por campo, informando los campos inválidos."""
+        fields = line.split(',')
+        named = any(':' in field for field in fields)
+        columns = []
+        data = []
+        raw_names = []
+        for position, field in enumerate(fields):
+            if named:
+                name, sep, value = field.partition(':')
+                key = name.strip()
+                if not sep or not key:
+                    errors.append(FieldError(line_index, field, 'campo sin nombre'))
+                    continue
+            else:
+                key, value = position, field
+            try:
+                number = float(value)
+            except ValueError:
+                errors.append(FieldError(line_index, field, 'valor no numérico'))
+                continue
+            columns.append(self._column_for(key, named))
+            data.append(number)
+            if named:
+                raw_names.append(name)
+        if data and len(data) == len(fields):
+            self._remember_layout(named, raw_names, columns)
+        return columns, np.array(data, dtype=np.float64)
+
+    def _column_for(self, key, named):
+        if named:
+            if key not in self._index:
+                self._index[key] = len(self.columns)
+                self.columns.append(key)
+            return self._index[key]
+        while len(self.columns) <= key:
+            self.columns.append(None)
+        return key
+
+    def _remember_layout(self, named, raw_names, columns):
+        if named:
+            self._layout = (_NAMED, tuple(raw_names))
+        else:
+            self._layout = (_POSITIONAL, len(columns))
+        self._layout_columns = np.array(columns, dtype=np.intp)
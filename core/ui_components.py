@@ -5,6 +5,7 @@ Este módulo proporciona las clases y factory methods para crear componentes
 de la interfaz de usuario como:
 - Barra de herramientas con botones
 - ComboBoxes (selector de placas y puertos)
+- Actualización incremental de las listas de puertos
 - Barra de progreso
 - Widget de consola de salida
 
@@ -16,10 +17,11 @@ Licencia: MIT
 """
 from PyQt5.QtWidgets import (
     QHBoxLayout, QPushButton, QComboBox, QLabel,
-    QProgressBar, QTextEdit, QVBoxLayout
+    QProgressBar, QVBoxLayout
 )
 from PyQt5.QtGui import QIcon
 from PyQt5.QtCore import QSize
+from core.console_view import ConsoleView
 from core.i18n import get_text
 from core.utils import resource_path
 
@@ -147,6 +149,108 @@ class ComboBoxFactory:
         return combo
 
 
+class PortListUpdater:
+    """
+    Aplica a un ComboBox o menú solo las diferencias con la lista de puertos.
+
+    Los elementos existentes no se tocan, así que el puerto seleccionado se
+    conserva; si la lista no cambió no se hace ningún trabajo sobre el widget.
+    Las listas de dispositivos deben venir ordenadas (PortInventory.devices()).
+    """
+
+    @staticmethod
+    def sync_combo(combo, devices, placeholder=None):
+        """
+        Args:
+            combo (QComboBox): ComboBox de puertos
+            devices (list): Dispositivos conectados, ordenados
+            placeholder (str): Texto a mostrar (deshabilitado) si no hay puertos
+
+        Returns:
+            bool: True si se modificó el ComboBox
+        """
+        if not devices and placeholder is not None:
+            if not combo.isEnabled() and combo.count() == 1 and combo.itemText(0) == placeholder:
+                return False
+            combo.clear()
+            combo.addItem(placeholder)
+            combo.setEnabled(False)
+            return True
+        if not combo.isEnabled():
+            combo.clear()
+            combo.setEnabled(True)
+        current = [combo.itemText(i) for i in range(combo.count())]
+        if current == devices:
+            return False
+        wanted = set(devices)
+        for index in reversed(range(combo.count())):
+            if combo.itemText(index) not in wanted:
+                combo.removeItem(index)
+        for position, device in enumerate(devices):
+            if position >= combo.count() or combo.itemText(position) != device:
+                combo.insertItem(position, device)
+        return True
+
+    @staticmethod
+    def sync_menu(menu, devices, create_action, placeholder):
+        """
+        Args:
+            menu (QMenu): Menú de puertos
+            devices (list): Dispositivos conectados, ordenados
+            create_action (callable): Crea la QAction de un dispositivo
+            placeholder (str): Texto de la acción deshabilitada si no hay puertos
+
+        Returns:
+            bool: True si se modificó el menú
+        """
+        actions = menu.actions()
+        # Cada acción de puerto guarda su dispositivo en data(); la de "sin puertos", None
+        if [action.data() for action in actions] == (devices or [None]):
+            return False
+        wanted = set(devices)
+        for action in actions:
+            if action.data() not in wanted:
+                menu.removeAction(action)
+                action.deleteLater()
+        remaining = menu.actions()
+        for position, device in enumerate(devices):
+            if position < len(remaining) and remaining[position].data() == device:
+                continue
+            action = create_action(device)
+            action.setData(device)
+            before = remaining[position] if position < len(remaining) else None
+            menu.insertAction(before, action)
+            remaining.insert(position, action)
+        if not devices:
+            action = menu.addAction(placeholder)
+            action.setEnabled(False)
+        return True
+
+
+    @staticmethod
+    def sync_list(list_widget, devices, create_item):
+        """
+        Args:
+            list_widget (QListWidget): Lista de puertos (p. ej. con casillas)
+            devices (list): Dispositivos conectados, ordenados
+            create_item (callable): Crea el QListWidgetItem de un dispositivo
+
+        Returns:
+            bool: True si se modificó la lista
+        """
+        current = [list_widget.item(i).text() for i in range(list_widget.count())]
+        if current == devices:
+            return False
+        wanted = set(devices)
+        for index in reversed(range(list_widget.count())):
+            if list_widget.item(index).text() not in wanted:
+                list_widget.takeItem(index)
+        for position, device in enumerate(devices):
+            if position >= list_widget.count() or list_widget.item(position).text() != device:
+                list_widget.insertItem(position, create_item(device))
+        return True
+
+
 class ProgressBarFactory:    
     @staticmethod
     def create_progress_bar():
@@ -158,7 +262,7 @@ class ProgressBarFactory:
 class ConsoleWidget:
     @staticmethod
     def create_console():
-        console = QTextEdit()
+        # Escribe por cuadro y conserva solo las últimas líneas (ver core/console_view.py)
+        console = ConsoleView()
         console.setMaximumHeight(180)
-        console.setReadOnly(True)
         return console
@@ -1,7 +1,5 @@
 import os
 import sys
-import serial
-import serial.tools.list_ports
 from PyQt5.QtGui import QTextCursor
 
 def resource_path(relative_path):
@@ -43,22 +41,6 @@ def resource_path(relative_path):
     print(f"DEBUG resource_path: Fallback a modo desarrollo: {path}")
     return path
 
-def release_all_serial_ports():
-    # Obtener una lista de todos los puertos COM disponibles
-    ports = list(serial.tools.list_ports.comports())
-    
-    for port in ports:
-        try:
-            # Intentar abrir el puerto
-            ser = serial.Serial(port.device)
-            # Si se abre con éxito, cerrarlo inmediatamente
-            ser.close()
-            print(f"Puerto {port.device} liberado con éxito.")
-        except serial.SerialException:
-            print(f"No se pudo liberar el puerto {port.device}. Puede que ya esté cerrado o en uso por otra aplicación.")
-        except Exception as e:
-            print(f"Error al intentar liberar el puerto {port.device}: {str(e)}")
-
 class ConsoleOutput:
     def __init__(self, console):
         self.console = console
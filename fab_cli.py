@@ -0,0 +1,156 @@
+"""
+Compilación y carga de proyectos .fab desde la línea de comandos
+
+Genera el código de cada proyecto (o usa el .ino tal cual), lo compila para
+la placa elegida y, si se indica un puerto, lo carga; sin abrir la ventana
+del IDE. El resultado de cada proyecto se informa en JSON y al final se
+imprime un resumen en stderr.
+
+Uso:
+    python -m fab_cli examples/Arduino --board "Arduino Uno"
+    python -m fab_cli blink.fab --board "Arduino Nano" --port /dev/ttyUSB0
+    python -m fab_cli examples --report resultado.json
+
+El editor (html/) solo se carga si algún proyecto no tiene su código en la
+caché de código generado. Código de salida: 0 si todos los proyectos
+compilaron (y cargaron), 1 si alguno falló y 2 si los argumentos no son
+válidos.
+
+Autor: Código Abierto Fab Blocks IDE
+Licencia: MIT
+"""
+import argparse
+import contextlib
+import json
+import os
+import sys
+import time
+
+from core.code_generator import CodeGenerator
+from core.compilation_manager import BOARD_CPU_MAPPING
+from core.config_manager import ConfigManager
+from core.headless_build import HeadlessBuilder
+from core.utils import resource_path
+
+PROJECT_EXTENSIONS = ('.fab', '.ino')
+
+
+def collect_projects(paths):
+    """Archivos .fab/.ino indicados o encontrados (recursivamente) en las carpetas, en orden."""
+    projects = []
+    for path in paths:
+        if os.path.isdir(path):
+            found = []
+            for root, dirs, files in os.walk(path):
+                found.extend(os.path.join(root, name) for name in files
+                             if name.lower().endswith(PROJECT_EXTENSIONS))
+            projects.extend(sorted(found))
+        else:
+            projects.append(path)
+    return projects
+
+
+def build_project(path, board, generator, builder, port=None):
+    """
+    Genera, compila y opcionalmente carga un proyecto.
+
+    Returns:
+        dict: file, board, generate, compile, upload y error (el primer
+            paso que falló, o None)
+    """
+    record = {'file': path, 'board': board, 'generate': None,
+              'compile': None, 'upload': None, 'error': None}
+    started = time.perf_counter()
+    try:
+        code = generator.generate_file(path)
+    except (OSError, RuntimeError) as e:
+        record['generate'] = {'ok': False, 'seconds': time.perf_counter() - started}
+        record['error'] = f"generate: {e}"
+        return record
+    record['generate'] = {'ok': True, 'seconds': time.perf_counter() - started}
+
+    compiled = builder.compile(code, board)
+    record['compile'] = compiled
+    if not compiled['ok']:
+        record['error'] = f"compile: código {compiled['returncode']}"
+        return record
+    if port:
+        uploaded = builder.upload(compiled['hex_path'], board, port)
+        record['upload'] = uploaded
+        if not uploaded['ok']:
+            record['error'] = f"upload: código {uploaded['returncode']}"
+    return record
+
+
+def default_arduino_folder():
+    """Carpeta de Arduino configurada en el IDE (config.json), o None."""
+    compiler = ConfigManager().get_value('compiler_location')
+    return os.path.dirname(compiler) if compiler else None
+
+
+def default_resource(relative_path):
+    """resource_path sin sus mensajes de depuración en stdout, que queda para los resultados."""
+    with contextlib.redirect_stdout(sys.stderr):
+        return resource_path(relative_path)
+
+
+def print_summary(records, seconds, stream=None):
+    stream = stream or sys.stderr
+    for record in records:
+        status = 'OK   ' if record['error'] is None else 'FALLA'
+        detail = record['error'] or ''
+        compiled = record['compile']
+        if compiled is not None and compiled['ok']:
+            detail = 'caché' if compiled['cached'] else f"{compiled['seconds']:.1f} s"
+        print(f"{status} {record['file']}  {detail}", file=stream)
+    failed = sum(1 for record in records if record['error'] is not None)
+    print(f"{len(records) - failed}/{len(records)} proyectos correctos en {seconds:.1f} s",
+          file=stream)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='fab_cli', description=__doc__.splitlines()[1])
+    parser.add_argument('paths', nargs='+', help='archivos .fab/.ino o carpetas que los contienen')
+    parser.add_argument('--board', default='Arduino Uno', choices=sorted(BOARD_CPU_MAPPING))
+    parser.add_argument('--port', help='puerto serie donde cargar el programa')
+    parser.add_argument('--arduino', help='carpeta de Arduino (por defecto la configurada en el IDE)')
+    parser.add_argument('--html', help='carpeta del editor Blockly (por defecto html/ del IDE)')
+    parser.add_argument('--report', help='archivo JSON donde guardar el resultado (por defecto stdout)')
+    parser.add_argument('--timeout', type=float, help='tiempo máximo de cada comando en segundos')
+    args = parser.parse_args(argv)
+
+    arduino_folder = args.arduino or default_arduino_folder()
+    if not arduino_folder or not os.path.isdir(arduino_folder):
+        parser.error("indicar la carpeta de Arduino con --arduino")
+    projects = collect_projects(args.paths)
+    missing = [path for path in projects if not os.path.isfile(path)]
+    if missing:
+        parser.error(f"no existe: {', '.join(missing)}")
+    if not projects:
+        parser.error("no se encontraron proyectos .fab ni .ino")
+    if args.port and len(projects) > 1:
+        parser.error("--port solo admite un proyecto")
+
+    started = time.perf_counter()
+    generator = CodeGenerator(args.html or default_resource('html'))
+    builder = HeadlessBuilder(arduino_folder, timeout=args.timeout)
+    try:
+        records = [build_project(path, args.board, generator, builder, args.port)
+                   for path in projects]
+    finally:
+        generator.close()
+    seconds = time.perf_counter() - started
+
+    report = {'board': args.board, 'port': args.port, 'seconds': seconds, 'results': records}
+    if args.report:
+        with open(args.report, 'w', encoding='utf-8') as file:
+            json.dump(report, file, indent=2, ensure_ascii=False)
+    else:
+        json.dump(report, sys.stdout, indent=2, ensure_ascii=False)
+        print()
+    print_summary(records, seconds)
+    return 1 if any(record['error'] is not None for record in records) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -28,7 +28,6 @@ Repo: https://github.com/codigospace/Fab-Blocks-IDE
 """
 import sys
 import os
-import threading
 import webbrowser
 import logging
 from PyQt5.QtCore import QUrl, QTimer, Qt
@@ -77,9 +76,10 @@ def _log_exceptions(exc_type, exc_value, exc_tb):
 
 sys.excepthook = _log_exceptions
 from core.preferences_dialog import PreferencesDialog
+from core.batch_upload_dialog import BatchUploadDialog
 from core.server import LocalHTTPServer
-from core.utils import release_all_serial_ports, resource_path
-from core.port_monitor import PortMonitor
+from core.utils import resource_path
+from core.port_inventory import get_port_inventory
 from core.monitor_plotter import MainWindow as MonitorWindow
 from core.i18n import get_text, set_language
 from core.loading_spinner import SimpleLoadingOverlay
@@ -87,7 +87,8 @@ from core.loading_spinner import SimpleLoadingOverlay
 # Gestores de módulos
 from core.menu_manager import MenuManager
 from core.ui_components import (
-    ToolbarBuilder, ComboBoxFactory, ProgressBarFactory, ConsoleWidget
+    ToolbarBuilder, ComboBoxFactory, ProgressBarFactory, ConsoleWidget,
+    PortListUpdater
 )
 from core.file_operations import FileOperations
 from core.compilation_manager import CompilationManager
@@ -188,7 +189,7 @@ class WebViewer(QMainWindow):
         toolbar_builder = ToolbarBuilder(self)
         button_layout, graphic_serial, monitor_serial = toolbar_builder.build_toolbar()
         
-        # Arrancar monitor de puertos en hilo separado
+        # Suscribirse al inventario de puertos compartido
         self._start_port_monitor()
         
         # Crear overlay de carga que se muestra mientras carga HTML
@@ -229,14 +230,13 @@ class WebViewer(QMainWindow):
         pass
 
     def _start_port_monitor(self):
-        self.port_monitor = PortMonitor()
-        self.port_monitor_thread = threading.Thread(target=self.port_monitor.run)
-        self.port_monitor_thread.daemon = True
-        self.port_monitor.portChanged.connect(self.update_ports_menu)
-        self.port_monitor_thread.start()
+        self.port_inventory = get_port_inventory()
+        self.port_inventory.subscribe(self.update_ports_menu)
+        self.update_ports_menu()
 
     def _on_board_changed(self, index):
-        pass
+        # Precompilar el núcleo de la nueva placa mientras el usuario arma el programa
+        self.compilation_manager.prewarm()
 
     def _on_port_changed(self, index):
         pass
@@ -250,6 +250,8 @@ class WebViewer(QMainWindow):
         """Se ejecuta cuando termina de cargar el HTML"""
         if self.loading_overlay:
             self.loading_overlay.hide_loading()
+        if success:
+            self.compilation_manager.prewarm()
 
     def _update_basic_progress(self):
         pass
@@ -357,56 +359,49 @@ class WebViewer(QMainWindow):
         Actualiza el menú y ComboBox de puertos COM disponibles.
         
         Se llama automáticamente cuando:
-        - Cambia la detección de puertos (via PortMonitor)
+        - Cambia la detección de puertos (via PortInventory)
         - El usuario expande el menú de puertos
         
         Acciones:
-        - Detecta puertos COM usando pyserial
-        - Actualiza menú desplegable de puertos
-        - Actualiza ComboBox de selección de puerto
+        - Lee los puertos del inventario compartido (sin volver a enumerar)
+        - Agrega o quita solo los puertos que cambiaron en el menú y el ComboBox,
+          conservando el puerto seleccionado
         - Habilita/deshabilita según disponibilidad
         """
-        self.ports_menu.clear()
-        self.combo_puertos.clear()
-
-        import serial.tools.list_ports
-        ports = serial.tools.list_ports.comports()
-
-        if ports:
-            # Hay puertos disponibles
-            for port in ports:
-                from PyQt5.QtWidgets import QAction
-                port_action = QAction(port.device, self)
-                port_action.triggered.connect(self.update_ports_combo)
-                self.ports_menu.addAction(port_action)
-                self.combo_puertos.addItem(port.device)
-                self.combo_puertos.setEnabled(True)
-        else:
-            # No hay puertos conectados
-            from PyQt5.QtWidgets import QAction
-            no_ports_action = QAction("No hay puertos COM disponibles", self)
-            no_ports_action.setEnabled(False)
-            self.ports_menu.addAction(no_ports_action)
-            self.combo_puertos.addItem("No hay puertos COM disponibles")
-            self.combo_puertos.setEnabled(False)
+        devices = self.port_inventory.devices()
+        placeholder = get_text('message.no_ports_available')
+        PortListUpdater.sync_menu(self.ports_menu, devices, self._create_port_action, placeholder)
+        PortListUpdater.sync_combo(self.combo_puertos, devices, placeholder)
 
     def update_ports_combo(self):
-        self.combo_puertos.clear()
+        PortListUpdater.sync_combo(
+            self.combo_puertos, self.port_inventory.devices(), get_text('message.no_ports_available')
+        )
 
-        import serial.tools.list_ports
-        ports = serial.tools.list_ports.comports()
-
-        if ports:
-            for port in ports:
-                self.combo_puertos.addItem(port.device)
-        else:
-            self.combo_puertos.addItem("No hay puertos COM disponibles")
-            self.combo_puertos.setEnabled(False)
+    def _create_port_action(self, device):
+        port_action = QAction(device, self)
+        info = self.port_inventory.info(device)
+        if info is not None:
+            port_action.setToolTip(info.description)
+        port_action.triggered.connect(lambda checked=False, d=device: self.combo_puertos.setCurrentText(d))
+        return port_action
 
     def show_preferences_dialog(self):
         self.preferences_dialog = PreferencesDialog(self.config_manager, self)
         self.preferences_dialog.exec_()
 
+    def show_batch_upload_dialog(self):
+        """
+        Abre el diálogo para subir el programa a varias placas a la vez.
+        
+        El programa se compila una sola vez y avrdude se ejecuta en paralelo
+        sobre los puertos marcados (ver core/batch_upload.py).
+        """
+        if getattr(self, 'batch_upload_dialog', None) is None:
+            self.batch_upload_dialog = BatchUploadDialog(self.compilation_manager, self)
+        self.batch_upload_dialog.show()
+        self.batch_upload_dialog.raise_()
+
     def compilar_clicked(self):
         """
         Manejador del evento "compilar".
@@ -431,6 +426,14 @@ class WebViewer(QMainWindow):
         """
         self.compilation_manager.upload()
 
+    def cancel_build(self):
+        """
+        Manejador del evento "cancelar compilación" (Ctrl+.).
+        
+        Detiene la compilación o carga en curso junto con sus procesos hijos.
+        """
+        self.compilation_manager.cancel()
+
     def open_new_file_window(self):
         self.new_file_window = WebViewer(self.config_manager)
         if hasattr(self, 'local_http_server') and getattr(self.local_http_server, 'running', False):
@@ -511,7 +514,10 @@ class WebViewer(QMainWindow):
 
     def show_monitor_serial(self, show_graph_state):
         if self.monitor_window is None or not self.monitor_window.isVisible():
-            self.monitor_window = MonitorWindow()
+            self.monitor_window = MonitorWindow(
+                plot_capacity=self.config_manager.get_number('plot_capacity'),
+                render_fps=self.config_manager.get_number('plot_fps')
+            )
             self.monitor_window.show()
             self.monitor_window.toggle_graph(show_graph_state)
         else:
@@ -616,6 +622,8 @@ class WebViewer(QMainWindow):
         self.menu_manager.create_tools_menu()
         self.menu_manager.create_help_menu()
         
+        self.console.change_language()
+        
         # Actualizar ventana del monitor serial si está abierta
         if hasattr(self, 'monitor_window') and self.monitor_window is not None:
             self.monitor_window.change_language()
@@ -658,27 +666,22 @@ class WebViewer(QMainWindow):
         Manejador del evento de cierre de ventana.
         
         Limpieza al cerrar:
-        1. Detiene procesos de compilación en ejecución
-        2. Espera a que terminen (wait())
-        3. Acepta el evento de cierre
+        1. Cancela la suscripción al inventario de puertos
+        2. Mata las compilaciones, cargas y la precompilación de fondo en
+           curso (todo el grupo de procesos) y espera a que terminen
+        3. Borra las carpetas de compilación y el registro de la consola
+        4. Acepta el evento de cierre
         
         Esto previene que la aplicación quede con procesos zombie
         y asegura una limpieza ordenada.
         """
-        if hasattr(self, 'compilation_manager'):
-            # Cancelar compilación si está en progreso
-            if (hasattr(self.compilation_manager, 'runner_com') and 
-                self.compilation_manager.runner_com and
-                self.compilation_manager.runner_com.isRunning()):
-                self.compilation_manager.runner_com.terminate()
-                self.compilation_manager.runner_com.wait()
-            # Cancelar carga si está en progreso
-            if (hasattr(self.compilation_manager, 'runner_up') and 
-
-                self.compilation_manager.runner_up and
-                self.compilation_manager.runner_up.isRunning()):
-                self.compilation_manager.runner_up.terminate()
-                self.compilation_manager.runner_up.wait()
+        if hasattr(self, 'port_inventory'):
+            self.port_inventory.unsubscribe(self.update_ports_menu)
+        if self.compilation_manager is not None:
+            # Mata compilaciones y cargas en curso junto con sus procesos hijos
+            self.compilation_manager.close()
+        if getattr(self, 'console', None) is not None:
+            self.console.close_log()
         event.accept()
 
 if __name__ == '__main__':
@@ -0,0 +1,131 @@
+import os
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+import sys
+import time
+import pytest
+from core.batch_upload import BatchUploader
+
+# avrdude de prueba: escribe en el puerto -P, anota inicio y fin, y falla
+# el primer intento de los puertos listados en FAIL_ONCE
+FAKE_AVRDUDE = '''
+import os, sys, time
+port = [arg[2:] for arg in sys.argv[1:] if arg.startswith('-P')][0]
+log = os.environ['FAKE_LOG']
+with open(log, 'a') as f:
+    f.write('start %s %f\\n' % (port, time.time()))
+with open(port, 'w') as tty:
+    tty.write('flash\\n')
+time.sleep(0.2)
+with open(log, 'a') as f:
+    f.write('end %s %f\\n' % (port, time.time()))
+marker = log + '.' + os.path.basename(port)
+if port in os.environ.get('FAIL_ONCE', '').split(',') and not os.path.exists(marker):
+    open(marker, 'w').close()
+    print('avrdude: stk500_recv(): programmer is not responding')
+    sys.exit(1)
+if port in os.environ.get('FAIL_ALWAYS', '').split(','):
+    sys.exit(1)
+print('avrdude done.  Thank you.')
+'''
+
+@pytest.fixture
+def ptys():
+    pairs = [os.openpty() for _ in range(4)]
+    yield [os.ttyname(slave) for _, slave in pairs]
+    for master, slave in pairs:
+        os.close(master)
+        os.close(slave)
+
+@pytest.fixture
+def avrdude(tmp_path, monkeypatch):
+    script = tmp_path / 'avrdude.py'
+    script.write_text(FAKE_AVRDUDE)
+    log = tmp_path / 'log'
+    monkeypatch.setenv('FAKE_LOG', str(log))
+    return lambda port: [sys.executable, str(script), '-patmega328p', '-P' + port], log
+
+def max_concurrency(log):
+    events = []
+    for line in log.read_text().splitlines():
+        kind, _, stamp = line.split()
+        events.append((float(stamp), 0 if kind == 'end' else 1))
+    running = peak = 0
+    for _, starts in sorted(events):
+        running += 1 if starts else -1
+        peak = max(peak, running)
+    return peak
+
+def test_flashes_every_port_in_bounded_parallel(ptys, avrdude):
+    make_command, log = avrdude
+    uploader = BatchUploader(ptys, make_command, max_workers=2, retries=0)
+    started = time.monotonic()
+    results = uploader.flash_all()
+    elapsed = time.monotonic() - started
+    assert all(results[port].ok for port in ptys)
+    assert max_concurrency(log) == 2
+    assert elapsed < 4 * 0.2 + 1.0
+    assert results[ptys[0]].output[-1] == 'avrdude done.  Thank you.'
+
+def test_retries_failed_ports(ptys, avrdude, monkeypatch):
+    make_command, _ = avrdude
+    monkeypatch.setenv('FAIL_ONCE', ptys[1])
+    monkeypatch.setenv('FAIL_ALWAYS', ptys[2])
+    uploader = BatchUploader(ptys, make_command, max_workers=4, retries=1, retry_delay=0)
+    results = uploader.flash_all()
+    assert results[ptys[1]].ok and results[ptys[1]].attempts == 2
+    assert not results[ptys[2]].ok and results[ptys[2]].attempts == 2
+    assert results[ptys[0]].attempts == 1
+    assert uploader.failed_ports() == [ptys[2]]
+
+def test_missing_program_fails_port(ptys):
+    uploader = BatchUploader(ptys[:1], lambda port: ['/nonexistent/avrdude', '-P' + port], retries=0)
+    result = uploader.flash_all()[ptys[0]]
+    assert not result.ok and result.returncode is None
+
+def test_cancel_while_spawning_kills_process(ptys, monkeypatch):
+    import core.batch_upload
+    real_popen = core.batch_upload.subprocess.Popen
+    uploader = BatchUploader(ptys[:1], lambda port: [sys.executable, '-c', 'import time; time.sleep(30)'],
+                             retries=0)
+
+    def popen_then_cancel(*args, **kwargs):
+        # cancel() llega entre el arranque del proceso y su registro
+        process = real_popen(*args, **kwargs)
+        uploader.cancel()
+        return process
+
+    monkeypatch.setattr(core.batch_upload.subprocess, 'Popen', popen_then_cancel)
+    started = time.monotonic()
+    result = uploader.flash_all()[ptys[0]]
+    assert not result.ok
+    assert time.monotonic() - started < 5
+
+def test_cancel_before_spawning_starts_nothing(ptys, avrdude):
+    make_command, log = avrdude
+    uploader = BatchUploader(ptys[:1], make_command, retries=0)
+    uploader.make_command = lambda port: (uploader.cancel(), make_command(port))[1]
+    result = uploader.flash_all()[ptys[0]]
+    assert not result.ok and result.returncode is None
+    assert not log.exists()
+
+def test_dialog_shows_output_of_selected_port(qapp, ptys, avrdude):
+    from PyQt5.QtWidgets import QApplication
+    from core.batch_upload_dialog import BatchUploadDialog
+
+    class Manager:
+        def cancel(self):
+            pass
+
+    make_command, _ = avrdude
+    dialog = BatchUploadDialog(Manager())
+    uploader = BatchUploader(ptys[:2], make_command, retries=0)
+    dialog.attach(uploader)
+    dialog.results_table.selectRow(1)
+    uploader.start()
+    assert uploader.wait(5000)
+    QApplication.processEvents()
+    lines = dialog.output_view.toPlainText().splitlines()
+    assert lines == ['--- Intento 1 ---', 'avrdude done.  Thank you.']
+    dialog.results_table.selectRow(0)
+    assert dialog.output_view.toPlainText().splitlines()[-1] == 'avrdude done.  Thank you.'
@@ -0,0 +1,50 @@
+import os
+import pytest
+from core.build_cache import BuildCache, normalize_sketch, toolchain_fingerprint
+
+SKETCH = 'void setup() {\n}\n\nvoid loop() {\n}\n'
+
+def test_key_ignores_line_endings_and_trailing_spaces():
+    crlf = SKETCH.replace('\n', '  \r\n')
+    assert BuildCache.key(crlf, 'arduino:avr:uno', 'f') == BuildCache.key(SKETCH, 'arduino:avr:uno', 'f')
+    assert normalize_sketch('\n\nint a;  \n\n') == 'int a;\n'
+
+def test_key_depends_on_board_and_toolchain():
+    base = BuildCache.key(SKETCH, 'arduino:avr:uno', 'f1')
+    assert BuildCache.key(SKETCH, 'arduino:avr:nano', 'f1') != base
+    assert BuildCache.key(SKETCH, 'arduino:avr:uno', 'f2') != base
+    assert BuildCache.key(SKETCH + 'int x;', 'arduino:avr:uno', 'f1') != base
+
+def test_put_and_get(tmp_path):
+    cache = BuildCache(str(tmp_path / 'cache'))
+    key = cache.key(SKETCH, 'arduino:avr:uno', 'f')
+    assert cache.get(key) is None
+    hex_file = tmp_path / 'sketch.hex'
+    hex_file.write_text(':00000001FF\n')
+    cache.put(key, str(hex_file))
+    cached = cache.get(key)
+    assert open(cached).read() == ':00000001FF\n'
+    assert (cache.hits, cache.misses) == (1, 1)
+
+def test_evicts_least_recently_used(tmp_path):
+    cache = BuildCache(str(tmp_path / 'cache'), max_bytes=250)
+    hex_file = tmp_path / 'sketch.hex'
+    hex_file.write_bytes(b'x' * 100)
+    for i, key in enumerate(['a', 'b']):
+        cache.put(key, str(hex_file))
+        os.utime(cache._path(key), ns=(i * 10**9, i * 10**9))
+    # Usar 'a' la vuelve la más reciente; al agregar 'c' se desaloja 'b'
+    cache.get('a')
+    cache.put('c', str(hex_file))
+    assert cache.get('b') is None
+    assert cache.get('a') is not None
+    assert cache.size() == 200
+
+def test_fingerprint_changes_with_platform(tmp_path):
+    platform = tmp_path / 'hardware' / 'arduino' / 'avr' / 'platform.txt'
+    platform.parent.mkdir(parents=True)
+    platform.write_text('version=1.8.6\n')
+    before = toolchain_fingerprint(str(tmp_path))
+    assert toolchain_fingerprint(str(tmp_path)) == before
+    platform.write_text('version=1.8.19\n')
+    assert toolchain_fingerprint(str(tmp_path)) != before
@@ -0,0 +1,27 @@
+import os
+import pytest
+from core.build_workspace import BuildWorkspace
+from core.core_cache import CoreCache
+
+def test_workspaces_are_isolated(tmp_path):
+    first = BuildWorkspace(str(tmp_path), core_cache=CoreCache(str(tmp_path / 'cores')))
+    second = BuildWorkspace(str(tmp_path), core_cache=CoreCache(str(tmp_path / 'cores')))
+    assert first.sketch_path != second.sketch_path
+    assert first.build_path != second.build_path
+    assert os.path.isdir(first.sketch_dir) and os.path.isdir(second.build_path)
+    assert first.hex_path == os.path.join(first.build_path, 'extracted_code.ino.hex')
+
+def test_core_cache_is_shared_per_board(tmp_path):
+    first = BuildWorkspace(str(tmp_path), core_cache=CoreCache(str(tmp_path / 'cores')))
+    second = BuildWorkspace(str(tmp_path), core_cache=CoreCache(str(tmp_path / 'cores')))
+    uno = first.core_cache_dir('arduino:avr:uno')
+    assert uno == second.core_cache_dir('arduino:avr:uno')
+    assert uno != first.core_cache_dir('arduino:avr:nano')
+    assert ':' not in os.path.basename(uno)
+
+def test_close_keeps_core_cache(tmp_path):
+    workspace = BuildWorkspace(str(tmp_path), core_cache=CoreCache(str(tmp_path / 'cores')))
+    cores = workspace.core_cache_dir('arduino:avr:uno')
+    workspace.close()
+    assert not os.path.exists(workspace.root)
+    assert os.path.isdir(cores)
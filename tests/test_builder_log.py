@@ -0,0 +1,49 @@
+import pytest
+from core.builder_log import (BuilderLogParser, parse_machine_line, format_message,
+                              STAGE_PREPROCESS, STAGE_DISCOVERY, STAGE_CORE, STAGE_LINK, STAGE_SIZE)
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+    def __call__(self):
+        return self.now
+
+def test_parse_machine_line_decodes_arguments():
+    line = '===info ||| Using library {0} in folder: {1} ||| [Servo %2Fopt%2Farduino+1.8%2Flibraries%2FServo]'
+    level, message, args = parse_machine_line(line)
+    assert level == 'info'
+    assert args == ['Servo', '/opt/arduino 1.8/libraries/Servo']
+    assert format_message(message, args) == 'Using library Servo in folder: /opt/arduino 1.8/libraries/Servo'
+
+def test_plain_lines_pass_through():
+    parser = BuilderLogParser()
+    assert parse_machine_line('avr-g++ -c sketch.cpp') is None
+    assert parser.feed('sketch.ino:3: error: expected ;') == ('sketch.ino:3: error: expected ;', None)
+
+def test_progress_lines_are_hidden():
+    parser = BuilderLogParser()
+    assert parser.feed('===info ||| Progress {0} ||| [42.86]') == (None, pytest.approx(42.86))
+    assert parser.feed('===info ||| Progress {0} ||| [bad]') == (None, None)
+    assert parser.progress == pytest.approx(42.86)
+
+def test_stage_durations():
+    clock = FakeClock()
+    parser = BuilderLogParser(clock)
+    clock.now = 0.5
+    parser.feed('===info ||| Detecting libraries used... ||| []')
+    clock.now = 1.0
+    parser.feed('===info ||| Generating function prototypes... ||| []')
+    clock.now = 1.25
+    parser.feed('===info ||| Compiling core... ||| []')
+    clock.now = 4.25
+    parser.feed('===info ||| Linking everything together... ||| []')
+    clock.now = 4.75
+    text, _ = parser.feed('===info ||| Sketch uses {0} bytes ({2}%) of program storage space. Maximum is {1} bytes. ||| [924 32256 2]')
+    assert text == 'Sketch uses 924 bytes (2%) of program storage space. Maximum is 32256 bytes.'
+    clock.now = 4.8
+    timings = parser.finish()
+    assert timings[STAGE_PREPROCESS] == pytest.approx(0.75)
+    assert timings[STAGE_DISCOVERY] == pytest.approx(0.5)
+    assert timings[STAGE_CORE] == pytest.approx(3.0)
+    assert timings[STAGE_LINK] == pytest.approx(0.5)
+    assert timings[STAGE_SIZE] == pytest.approx(0.05)
@@ -0,0 +1,32 @@
+import pytest
+import numpy as np
+from core.capture_format import CaptureWriter, load_capture
+
+def test_roundtrip_with_column_added_mid_capture(tmp_path):
+    path = str(tmp_path / 'sesion.fabcap')
+    writer = CaptureWriter(path)
+    writer.append([0.0, 0.5], [[1.0], [2.0]], ['temp'])
+    writer.append([1.0], [[3.0, 30.0]], ['temp', 'luz'])
+    assert writer.close() == path
+    assert not (tmp_path / 'sesion.fabcap.part').exists()
+
+    capture = load_capture(path)
+    assert capture.columns == ['temp', 'luz']
+    assert isinstance(capture.time, np.memmap)
+    assert capture.time.tolist() == [0.0, 0.5, 1.0]
+    assert capture.values.dtype == np.float32
+    assert capture.values[0].tolist() == [1.0, 2.0, 3.0]
+    assert np.isnan(capture.values[1, :2]).all()
+    assert capture.values[1, 2] == 30.0
+
+def test_empty_capture(tmp_path):
+    path = str(tmp_path / 'vacia.fabcap')
+    CaptureWriter(path).close()
+    capture = load_capture(path)
+    assert len(capture.time) == 0
+
+def test_rejects_other_files(tmp_path):
+    path = tmp_path / 'texto.fabcap'
+    path.write_text('temp:1\n')
+    with pytest.raises(ValueError):
+        load_capture(str(path))
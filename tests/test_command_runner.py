@@ -0,0 +1,127 @@
+import os
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+import sys
+import time
+import pytest
+from PyQt5.QtCore import Qt
+from core.command_runner import CommandRunner
+from core.file_lock import FileLock
+
+def run_sync(command, **kwargs):
+    runner = CommandRunner(command, **kwargs)
+    batches = []
+    completed = []
+    runner.output_received.connect(batches.append)
+    runner.completed.connect(lambda code, seconds: completed.append((code, seconds)))
+    runner.run()
+    return runner, batches, completed
+
+def test_output_is_batched_by_chunk():
+    script = 'import sys\nsys.stdout.write("".join("line %d\\n" % i for i in range(2000)) + "tail")'
+    runner, batches, completed = run_sync([sys.executable, '-c', script])
+    lines = [line for batch in batches for line in batch]
+    assert lines == [f'line {i}' for i in range(2000)] + ['tail']
+    assert len(batches) < 100
+    assert completed[0][0] == 0 and runner.succeeded
+
+def test_reports_exit_code_and_time():
+    runner, _, completed = run_sync([sys.executable, '-c', 'import time, sys; time.sleep(0.1); sys.exit(3)'])
+    code, seconds = completed[0]
+    assert code == 3 and not runner.succeeded
+    assert seconds >= 0.1
+
+def test_arguments_are_not_interpreted_by_a_shell(tmp_path):
+    target = tmp_path / 'a b;echo x'
+    runner, batches, _ = run_sync([sys.executable, '-c', 'import sys; print(sys.argv[1])', str(target)])
+    assert batches == [[str(target)]]
+
+def test_missing_program():
+    runner, batches, completed = run_sync(['/nonexistent/arduino-builder', '-compile'])
+    assert completed[0][0] is None
+    assert batches[0][0].startswith('/nonexistent/arduino-builder')
+
+@pytest.mark.skipif(sys.platform == 'win32', reason='prioridad POSIX')
+def test_low_priority_lowers_child_and_grandchild():
+    # El hijo espera a que se aplique la prioridad y lanza un nieto que la hereda
+    script = ('import os, subprocess, sys, time; time.sleep(0.3); print(os.getpriority(os.PRIO_PROCESS, 0)); '
+              'sys.stdout.flush(); subprocess.run([sys.executable, "-c", "import os; print(os.getpriority(os.PRIO_PROCESS, 0))"])')
+    base = os.getpriority(os.PRIO_PROCESS, 0)
+    _, batches, completed = run_sync([sys.executable, '-c', script], low_priority=True)
+    values = [int(line) for batch in batches for line in batch]
+    assert completed[0][0] == 0
+    assert values == [min(base + 10, 19)] * 2
+
+def test_log_parser_filters_lines():
+    class Parser:
+        finished = False
+        def feed(self, line):
+            if line.startswith('progress'):
+                return None, float(line.split()[1])
+            return line.upper(), None
+        def finish(self):
+            self.finished = True
+    parser = Parser()
+    progress = []
+    runner = CommandRunner([sys.executable, '-c', 'print("progress 50"); print("ok")'], log_parser=parser)
+    runner.progress_changed.connect(progress.append)
+    batches = []
+    runner.output_received.connect(batches.append)
+    runner.run()
+    assert progress == [50.0]
+    assert [line for batch in batches for line in batch] == ['OK']
+    assert parser.finished
+
+@pytest.mark.skipif(sys.platform == 'win32', reason='grupos de procesos POSIX')
+def test_cancel_kills_child_processes(qapp, tmp_path):
+    pid_file = tmp_path / 'child.pid'
+    script = ('import subprocess, sys, time\n'
+              'child = subprocess.Popen([sys.executable, "-c", "import time; time.sleep(30)"])\n'
+              f'open({str(pid_file)!r}, "w").write(str(child.pid))\n'
+              'time.sleep(30)\n')
+    runner = CommandRunner([sys.executable, '-c', script])
+    runner.start()
+    deadline = time.monotonic() + 5
+    while not (pid_file.exists() and pid_file.read_text()) and time.monotonic() < deadline:
+        time.sleep(0.02)
+    child = int(pid_file.read_text())
+    runner.cancel()
+    assert runner.wait(5000)
+    assert runner.returncode == -9 and not runner.succeeded
+    deadline = time.monotonic() + 5
+    while time.monotonic() < deadline:
+        try:
+            os.kill(child, 0)
+        except ProcessLookupError:
+            break
+        time.sleep(0.02)
+    else:
+        pytest.fail('el proceso hijo sigue vivo')
+
+def test_waits_for_lock_before_starting(qapp, tmp_path):
+    path = str(tmp_path / 'core.lock')
+    holder = FileLock(path)
+    assert holder.acquire(timeout=0)
+    runner = CommandRunner([sys.executable, '-c', 'print("ok")'], lock=FileLock(path),
+                           lock_message='esperando')
+    batches = []
+    runner.output_received.connect(batches.append, Qt.DirectConnection)
+    runner.start()
+    time.sleep(0.3)
+    assert runner.isRunning() and runner.process is None
+    holder.release()
+    assert runner.wait(5000)
+    assert batches == [['esperando'], ['ok']] and runner.succeeded
+    assert not runner.lock.locked
+
+def test_cancel_while_waiting_for_lock(qapp, tmp_path):
+    path = str(tmp_path / 'core.lock')
+    holder = FileLock(path)
+    assert holder.acquire(timeout=0)
+    runner = CommandRunner([sys.executable, '-c', 'print("ok")'], lock=FileLock(path))
+    runner.start()
+    time.sleep(0.2)
+    runner.cancel()
+    assert runner.wait(5000)
+    assert runner.process is None and runner.returncode is None
+    holder.release()
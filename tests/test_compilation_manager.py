@@ -0,0 +1,170 @@
+import os
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+import pytest
+import core.compilation_manager
+from core.config_manager import ConfigManager
+from core.compilation_manager import CompilationManager
+from core.i18n import get_text
+
+SKETCH = 'void setup() {\n}\n\nvoid loop() {\n}\n'
+
+class FakeSignal:
+    def __init__(self):
+        self.slots = []
+    def connect(self, slot):
+        self.slots.append(slot)
+    def emit(self, *args):
+        for slot in self.slots:
+            slot(*args)
+
+class FakeRunner:
+    """CommandRunner de prueba: no ejecuta nada, la prueba decide cuándo termina."""
+    instances = []
+
+    def __init__(self, command, log_parser=None, low_priority=False, lock=None, lock_message=None):
+        self.command = command
+        self.lock = lock
+        self.output_received = FakeSignal()
+        self.progress_changed = FakeSignal()
+        self.completed = FakeSignal()
+        self.running = False
+        self.cancelled = False
+        FakeRunner.instances.append(self)
+
+    def start(self):
+        self.running = True
+
+    def isRunning(self):
+        return self.running
+
+    def cancel(self):
+        self.cancelled = True
+
+    def wait(self):
+        return True
+
+    def finish(self, returncode, hex_path=None):
+        # Como arduino-builder: deja el .hex solo si compiló bien
+        if returncode == 0 and hex_path:
+            with open(hex_path, 'w') as file:
+                file.write(':00000001FF\n')
+        self.running = False
+        self.completed.emit(returncode, 0.1)
+
+class FakeBridge:
+    def __init__(self):
+        self.callbacks = []
+    def get_arduino_code(self, callback):
+        self.callbacks.append(callback)
+    def deliver(self, code):
+        self.callbacks.pop(0)(code)
+
+class FakeWidget:
+    def __init__(self, text=''):
+        self.text = text
+        self.value_ = 0
+    def currentText(self):
+        return self.text
+    def setValue(self, value):
+        self.value_ = value
+    def value(self):
+        return self.value_
+    def clear(self):
+        pass
+
+class FakeWindow:
+    def __init__(self):
+        self.lines = []
+        self.js_bridge = FakeBridge()
+        self.console = FakeWidget()
+        self.combo = FakeWidget('Arduino Uno')
+        self.combo_puertos = FakeWidget('/dev/ttyUSB0')
+        self.progress_bar = FakeWidget()
+    def write_to_console(self, text):
+        self.lines.append(text)
+    def updateOutput(self, text):
+        self.lines.append(text)
+
+@pytest.fixture
+def manager(qapp, tmp_path, monkeypatch):
+    monkeypatch.setenv('XDG_CACHE_HOME', str(tmp_path / 'cache'))
+    monkeypatch.setattr(core.compilation_manager, 'CommandRunner', FakeRunner)
+    FakeRunner.instances = []
+    arduino = tmp_path / 'arduino'
+    arduino.mkdir()
+    (arduino / 'arduino-builder').write_text('')
+    config = ConfigManager(str(tmp_path / 'config.json'))
+    config.data['compiler_location'] = str(arduino / 'arduino-builder')
+    manager = CompilationManager(FakeWindow(), config)
+    manager.uploads = []
+
+    def run_upload(job):
+        manager.uploads.append(job)
+        job.finish()
+
+    monkeypatch.setattr(manager, '_run_upload', run_upload)
+    yield manager
+    manager.close()
+
+def test_failed_compile_never_uploads(manager):
+    manager.compile()
+    manager.window.js_bridge.deliver(SKETCH)
+    FakeRunner.instances[-1].finish(1)
+    assert manager.uploads == []
+    assert get_text('message.compile_failed', code=1) in manager.window.lines
+
+def test_successful_compile_uploads(manager):
+    manager.compile()
+    manager.window.js_bridge.deliver(SKETCH)
+    FakeRunner.instances[-1].finish(0, manager.workspace.hex_path)
+    assert len(manager.uploads) == 1
+
+def test_finished_signal_of_replaced_job_is_dropped(manager):
+    manager.compile()
+    manager.window.js_bridge.deliver(SKETCH)
+    old = FakeRunner.instances[-1]
+    manager.compile()
+    manager.window.js_bridge.deliver(SKETCH + '// cambio\n')
+    new = FakeRunner.instances[-1]
+    assert old.cancelled and new is not old
+    old.finish(0, manager.workspace.hex_path)
+    assert manager.uploads == []
+    new.finish(0, manager.workspace.hex_path)
+    assert len(manager.uploads) == 1
+
+def test_finished_signal_of_cancelled_job_is_dropped(manager):
+    manager.compile()
+    manager.window.js_bridge.deliver(SKETCH)
+    runner = FakeRunner.instances[-1]
+    manager.cancel()
+    assert runner.cancelled
+    runner.finish(0, manager.workspace.hex_path)
+    assert manager.uploads == []
+    assert get_text('message.build_cancelled') in manager.window.lines
+
+def test_build_cache_hit_skips_builder(manager):
+    manager.compile()
+    manager.window.js_bridge.deliver(SKETCH)
+    FakeRunner.instances[-1].finish(0, manager.workspace.hex_path)
+    os.remove(manager.workspace.hex_path)
+    manager.upload()
+    manager.window.js_bridge.deliver(SKETCH + '\n')
+    assert len(FakeRunner.instances) == 1
+    assert len(manager.uploads) == 2
+    assert os.path.exists(manager.workspace.hex_path)
+    assert get_text('message.build_cache_hit') in manager.window.lines
+
+def test_first_core_build_takes_the_board_lock(manager):
+    manager.compile()
+    manager.window.js_bridge.deliver(SKETCH)
+    first = FakeRunner.instances[-1]
+    assert first.lock.path == manager.core_cache.build_lock('arduino:avr:uno').path
+    core = os.path.join(manager.core_cache.directory('arduino:avr:uno'), 'core', 'core.a')
+    os.makedirs(os.path.dirname(core))
+    open(core, 'w').close()
+    first.finish(0, manager.workspace.hex_path)
+    manager.compile()
+    manager.window.js_bridge.deliver(SKETCH + '// otro\n')
+    # Con el núcleo ya compilado las ventanas compilan a la vez
+    assert FakeRunner.instances[-1].lock is None
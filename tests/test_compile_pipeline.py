@@ -0,0 +1,80 @@
+import pytest
+from core.compile_pipeline import (CompilePipeline, CompileJob, ACCEPTED, DUPLICATE, STALE,
+                                   STAGE_EXTRACT, STAGE_COMPILE, STAGE_UPLOAD, EXTRACT_TIMEOUT)
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+    def __call__(self):
+        return self.now
+
+def test_clicks_while_extracting_are_ignored():
+    pipeline = CompilePipeline()
+    job = pipeline.request()
+    assert job.stage == STAGE_EXTRACT
+    assert pipeline.request() is None
+    assert pipeline.accept(job, ('code', 'Arduino Uno', 'COM3')) == ACCEPTED
+    assert pipeline.request() is not None
+
+def test_same_code_is_deduplicated():
+    cancelled = []
+    pipeline = CompilePipeline(on_cancel=cancelled.append)
+    first = pipeline.request()
+    pipeline.accept(first, ('code', 'Arduino Uno', 'COM3'))
+    second = pipeline.request()
+    assert pipeline.accept(second, ('code', 'Arduino Uno', 'COM3')) == DUPLICATE
+    assert pipeline.is_current(first)
+    assert not second.active
+    assert cancelled == []
+
+def test_new_code_replaces_running_job():
+    cancelled = []
+    pipeline = CompilePipeline(on_cancel=cancelled.append)
+    first = pipeline.request()
+    pipeline.accept(first, ('old', 'Arduino Uno', 'COM3'))
+    first.begin(STAGE_COMPILE)
+    second = pipeline.request()
+    assert pipeline.accept(second, ('new', 'Arduino Uno', 'COM3')) == ACCEPTED
+    assert cancelled == [first]
+    assert not pipeline.is_current(first)
+    assert pipeline.is_current(second)
+
+def test_finished_job_does_not_block_rebuild():
+    pipeline = CompilePipeline()
+    first = pipeline.request()
+    pipeline.accept(first, ('code', 'Arduino Uno', 'COM3'))
+    first.finish()
+    second = pipeline.request()
+    assert pipeline.accept(second, ('code', 'Arduino Uno', 'COM3')) == ACCEPTED
+
+def test_cancel_makes_pending_extraction_stale():
+    pipeline = CompilePipeline()
+    job = pipeline.request()
+    pipeline.cancel()
+    assert pipeline.accept(job, ('code', 'Arduino Uno', 'COM3')) == STALE
+
+def test_stuck_extraction_expires():
+    clock = FakeClock()
+    pipeline = CompilePipeline(clock=clock)
+    stuck = pipeline.request()
+    clock.now = EXTRACT_TIMEOUT - 1
+    assert pipeline.request() is None
+    clock.now = EXTRACT_TIMEOUT + 1
+    job = pipeline.request()
+    assert job is not None and not stuck.active
+    # El callback perdido llega tarde y se descarta
+    assert pipeline.accept(stuck, ('code', 'Arduino Uno', 'COM3')) == STALE
+    assert pipeline.accept(job, ('code', 'Arduino Uno', 'COM3')) == ACCEPTED
+
+def test_stage_timings():
+    clock = FakeClock()
+    job = CompileJob(1, clock)
+    job.begin(STAGE_EXTRACT)
+    clock.now = 0.012
+    job.begin(STAGE_COMPILE)
+    clock.now = 3.412
+    job.begin(STAGE_UPLOAD)
+    clock.now = 5.0
+    job.finish()
+    assert job.timings[STAGE_COMPILE] == pytest.approx(3.4)
+    assert job.summary() == 'extract 12 ms, compile 3.40 s, upload 1.59 s'
@@ -1,7 +1,9 @@
-import pytest
 import os
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+import pytest
 import json
-from core.config_manager import ConfigManager
+from core.config_manager import ConfigManager, NUMERIC_SETTINGS
 
 def test_config_save_and_load(tmp_path):
     config_file = tmp_path / "test_config.json"
@@ -17,3 +19,37 @@ def test_config_save_and_load(tmp_path):
 def test_config_default_value():
     manager = ConfigManager(filename='non_existent.json')
     assert manager.get_value('missing_key') is None
+
+def test_numeric_settings_are_clamped(tmp_path):
+    config_file = tmp_path / "config.json"
+    config_file.write_text(json.dumps({'plot_capacity': 10, 'plot_fps': 1000,
+                                       'core_cache_mb': 'mucho', 'build_cache_mb': 128}))
+    manager = ConfigManager(filename=str(config_file))
+    assert manager.get_number('plot_capacity') == NUMERIC_SETTINGS['plot_capacity'][1]
+    assert manager.get_number('plot_fps') == NUMERIC_SETTINGS['plot_fps'][2]
+    assert manager.get_number('core_cache_mb') == NUMERIC_SETTINGS['core_cache_mb'][0]
+    assert manager.get_number('build_cache_mb') == 128
+
+def test_numeric_defaults_match_modules(tmp_path):
+    from core.build_cache import DEFAULT_MAX_BYTES as BUILD_BYTES
+    from core.core_cache import DEFAULT_MAX_BYTES as CORE_BYTES
+    from core.monitor_plotter import RENDER_FPS
+    from core.plot_buffer import DEFAULT_CAPACITY
+    manager = ConfigManager(filename=str(tmp_path / "config.json"))
+    assert manager.get_number('plot_capacity') == DEFAULT_CAPACITY
+    assert manager.get_number('plot_fps') == RENDER_FPS
+    assert manager.get_number('core_cache_mb') * 1024 * 1024 == CORE_BYTES
+    assert manager.get_number('build_cache_mb') * 1024 * 1024 == BUILD_BYTES
+
+def test_preferences_save_numeric_settings(qapp, tmp_path, monkeypatch):
+    monkeypatch.setenv('XDG_CACHE_HOME', str(tmp_path / 'cache'))
+    from core.preferences_dialog import PreferencesDialog
+    manager = ConfigManager(filename=str(tmp_path / "config.json"))
+    manager.data['plot_fps'] = 500
+    dialog = PreferencesDialog(manager)
+    assert dialog.number_spins['plot_fps'].value() == NUMERIC_SETTINGS['plot_fps'][2]
+    dialog.number_spins['build_cache_mb'].setValue(512)
+    dialog.save_preferences()
+    saved = json.loads((tmp_path / "config.json").read_text())
+    assert saved['build_cache_mb'] == 512
+    assert saved['plot_fps'] == NUMERIC_SETTINGS['plot_fps'][2]
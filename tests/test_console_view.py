@@ -0,0 +1,55 @@
+import os
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+import pytest
+import core.console_view
+from core.console_view import ConsoleView
+
+def test_lines_are_written_once_per_frame(qapp, tmp_path):
+    console = ConsoleView(max_lines=100, log_dir=str(tmp_path))
+    console.append('Compilar:')
+    console.append('a\nb')
+    assert console.text_edit.toPlainText() == ''
+    console.flush()
+    assert console.text_edit.toPlainText() == 'Compilar:\na\nb'
+    console.append('c')
+    assert console.toPlainText() == 'Compilar:\na\nb\nc'
+    console.close_log()
+
+def test_keeps_last_lines_and_full_log(qapp, tmp_path):
+    console = ConsoleView(max_lines=100, log_dir=str(tmp_path))
+    for start in range(0, 1000, 50):
+        console.append('\n'.join(f'line {i}' for i in range(start, start + 50)))
+        if start % 200 == 0:
+            console.flush()
+    lines = console.toPlainText().split('\n')
+    assert len(lines) == 100
+    assert lines[-1] == 'line 999' and lines[0] == 'line 900'
+    with open(console.log_path) as file:
+        assert file.read().split('\n')[:-1] == [f'line {i}' for i in range(1000)]
+    assert not console.log_link.isHidden()
+    assert 'file://' in console.log_link.text()
+
+def test_clear_restarts_console_and_log(qapp, tmp_path):
+    console = ConsoleView(max_lines=10, log_dir=str(tmp_path))
+    console.append('\n'.join(str(i) for i in range(20)))
+    console.flush()
+    console.clear()
+    console.append('nuevo')
+    assert console.toPlainText() == 'nuevo'
+    assert console.log_link.isHidden()
+    with open(console.log_path) as file:
+        assert file.read() == 'nuevo\n'
+
+def test_log_survives_close_and_old_logs_rotate(qapp, tmp_path, monkeypatch):
+    monkeypatch.setattr(core.console_view, 'MAX_KEPT_LOGS', 3)
+    paths = []
+    for i in range(5):
+        console = ConsoleView(max_lines=10, log_dir=str(tmp_path))
+        console.append(f'compilación {i}')
+        console.close_log()
+        os.utime(console.log_path, (i, i))
+        paths.append(console.log_path)
+    assert [os.path.exists(path) for path in paths] == [False, False, True, True, True]
+    with open(paths[-1]) as file:
+        assert file.read() == 'compilación 4\n'
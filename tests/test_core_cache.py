@@ -0,0 +1,53 @@
+import multiprocessing
+import os
+import pytest
+from core.core_cache import CoreCache
+
+def build_core(cache, fqbn, name='core_uno_abc.a', size=100):
+    folder = cache.directory(fqbn)
+    os.makedirs(os.path.join(folder, 'core'), exist_ok=True)
+    with open(os.path.join(folder, 'core', name), 'wb') as file:
+        file.write(b'x' * size)
+
+def test_record_counts_hits_and_misses(tmp_path):
+    cache = CoreCache(str(tmp_path))
+    before = cache.archives('arduino:avr:uno')
+    build_core(cache, 'arduino:avr:uno')
+    assert cache.record_build('arduino:avr:uno', before) is False
+    before = cache.archives('arduino:avr:uno')
+    assert cache.record_build('arduino:avr:uno', before) is True
+    stats = CoreCache(str(tmp_path)).stats()
+    assert (stats['hits'], stats['misses'], stats['boards']) == (1, 1, 1)
+    assert stats['bytes'] >= 100
+
+def test_evicts_least_recently_used_board(tmp_path):
+    cache = CoreCache(str(tmp_path), max_bytes=250)
+    for i, fqbn in enumerate(['arduino:avr:uno', 'arduino:avr:nano', 'arduino:avr:mega']):
+        build_core(cache, fqbn)
+        stamp = os.path.join(cache.directory(fqbn), '.last_used')
+        os.utime(stamp, (i, i))
+    cache.evict(keep='arduino:avr:uno')
+    assert cache.archives('arduino:avr:uno')
+    assert not cache.archives('arduino:avr:nano')
+    assert cache.archives('arduino:avr:mega')
+
+def test_clear(tmp_path):
+    cache = CoreCache(str(tmp_path / 'cores'))
+    build_core(cache, 'arduino:avr:uno')
+    cache.clear()
+    assert cache.stats() == {'hits': 0, 'misses': 0, 'bytes': 0, 'boards': 0}
+
+def record_many(root, count):
+    cache = CoreCache(root)
+    for _ in range(count):
+        cache.record_build('arduino:avr:uno', set())
+
+def test_concurrent_processes_keep_every_count(tmp_path):
+    root = str(tmp_path / 'cores')
+    processes = [multiprocessing.Process(target=record_many, args=(root, 50)) for _ in range(4)]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join(30)
+    assert CoreCache(root).stats()['misses'] == 200
+    assert not [name for name in os.listdir(root) if name.endswith('.tmp')]
@@ -0,0 +1,32 @@
+import multiprocessing
+import time
+from core.file_lock import FileLock
+
+def hold(path, seconds, ready):
+    with FileLock(path):
+        ready.set()
+        time.sleep(seconds)
+
+def test_excludes_other_processes(tmp_path):
+    path = str(tmp_path / 'locks' / 'core.lock')
+    ready = multiprocessing.Event()
+    holder = multiprocessing.Process(target=hold, args=(path, 0.5, ready))
+    holder.start()
+    assert ready.wait(10)
+    lock = FileLock(path)
+    assert not lock.acquire(timeout=0)
+    started = time.monotonic()
+    assert lock.acquire(timeout=10)
+    assert time.monotonic() - started > 0.2
+    lock.release()
+    holder.join(10)
+
+def test_released_by_context_manager(tmp_path):
+    path = str(tmp_path / 'stats.lock')
+    with FileLock(path) as lock:
+        assert lock.locked
+        assert not FileLock(path).acquire(timeout=0)
+    assert not lock.locked
+    other = FileLock(path)
+    assert other.acquire(timeout=0)
+    other.release()
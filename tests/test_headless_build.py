@@ -0,0 +1,169 @@
+import json
+import os
+import sys
+import threading
+import pytest
+import fab_cli
+from core.build_cache import BuildCache
+from core.code_generator import CodeGenerator, GeneratedCodeCache
+from core.core_cache import CoreCache
+from core.headless_build import HeadlessBuilder
+
+SKETCH = 'void setup() {\n}\n\nvoid loop() {\n}\n'
+
+# arduino-builder de prueba: copia el sketch como .hex y falla si contiene #error
+FAKE_BUILDER = '''
+import os, sys, time
+args = sys.argv[1:]
+build = args[args.index('-build-path') + 1]
+sketch = args[-1]
+code = open(sketch).read()
+print('===info ||| Progress {0} ||| [50.00]')
+print('===info ||| Linking everything together... ||| []')
+if '#error' in code:
+    print('sketch.ino:1: error: #error')
+    sys.exit(1)
+if 'sleep' in code:
+    time.sleep(10)
+os.makedirs(build, exist_ok=True)
+with open(os.path.join(build, 'extracted_code.ino.hex'), 'w') as f:
+    f.write(code)
+print('compiled')
+'''
+
+FAKE_AVRDUDE = '''
+import sys
+import threading
+print('avrdude: writing ' + [a for a in sys.argv if a.startswith('-Uflash')][0])
+sys.exit(1 if any(a == '-Pbad' for a in sys.argv) else 0)
+'''
+
+class FakeEngine:
+    def __init__(self):
+        self.calls = 0
+
+    def generate(self, xml):
+        self.calls += 1
+        return SKETCH
+
+    def close(self):
+        pass
+
+def write_script(path, source):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(f'#!{sys.executable}\n{source}')
+    path.chmod(0o755)
+
+@pytest.fixture
+def arduino(tmp_path, monkeypatch):
+    monkeypatch.setenv('XDG_CACHE_HOME', str(tmp_path / 'cache'))
+    folder = tmp_path / 'arduino'
+    write_script(folder / 'arduino-builder', FAKE_BUILDER)
+    write_script(folder / 'hardware' / 'tools' / 'avr' / 'bin' / 'avrdude', FAKE_AVRDUDE)
+    return str(folder)
+
+@pytest.fixture
+def builder(arduino, tmp_path):
+    return HeadlessBuilder(arduino, BuildCache(str(tmp_path / 'hex')), CoreCache(str(tmp_path / 'cores')))
+
+def test_compile_then_reuses_cache(builder):
+    first = builder.compile(SKETCH, 'Arduino Uno')
+    assert first['ok'] and not first['cached']
+    assert open(first['hex_path']).read() == SKETCH
+    assert 'link' in first['stages']
+    second = builder.compile(SKETCH + '\n', 'Arduino Uno')
+    assert second['ok'] and second['cached']
+    assert second['hex_path'] == first['hex_path']
+    assert not builder.compile(SKETCH, 'Arduino Nano')['cached']
+
+def test_compile_failure_keeps_output(builder):
+    result = builder.compile('#error\n' + SKETCH, 'Arduino Uno')
+    assert not result['ok']
+    assert result['returncode'] == 1
+    assert 'sketch.ino:1: error: #error' in result['output']
+    assert result['hex_path'] is None
+
+def test_unknown_board(builder):
+    result = builder.compile(SKETCH, 'ESP32')
+    assert not result['ok'] and result['output'] == ['Placa desconocida: ESP32']
+
+def test_timeout_kills_compiler(arduino, tmp_path):
+    builder = HeadlessBuilder(arduino, BuildCache(str(tmp_path / 'hex')),
+                              CoreCache(str(tmp_path / 'cores')), timeout=0.5)
+    result = builder.compile('// sleep\n' + SKETCH, 'Arduino Uno')
+    assert not result['ok'] and result['returncode'] is None
+    assert result['seconds'] < 5
+    assert result['output'][-1] == 'Tiempo agotado (0.5 s)'
+
+def test_upload(builder):
+    hex_path = builder.compile(SKETCH, 'Arduino Uno')['hex_path']
+    assert builder.upload(hex_path, 'Arduino Uno', 'good')['ok']
+    failed = builder.upload(hex_path, 'Arduino Uno', 'bad')
+    assert not failed['ok'] and failed['returncode'] == 1
+
+def test_generated_code_is_cached_per_engine(tmp_path):
+    html = tmp_path / 'html'
+    html.mkdir()
+    (html / 'blockly.js').write_text('v1')
+    engine = FakeEngine()
+    cache = GeneratedCodeCache(str(tmp_path / 'generated'))
+    assert CodeGenerator(str(html), cache, engine).generate('<xml/>') == SKETCH
+    assert CodeGenerator(str(html), cache, engine).generate('<xml/>\n') == SKETCH
+    assert engine.calls == 1
+    (html / 'blockly.js').write_text('v2 con otro tamaño')
+    CodeGenerator(str(html), cache, engine).generate('<xml/>')
+    assert engine.calls == 2
+
+def test_ino_skips_generation(tmp_path):
+    sketch = tmp_path / 'blink.ino'
+    sketch.write_text(SKETCH)
+    engine = FakeEngine()
+    generator = CodeGenerator(str(tmp_path), GeneratedCodeCache(str(tmp_path / 'g')), engine)
+    assert generator.generate_file(str(sketch)) == SKETCH
+    assert engine.calls == 0
+
+def test_cli_report(arduino, tmp_path, capsys):
+    projects = tmp_path / 'projects'
+    (projects / 'b').mkdir(parents=True)
+    (projects / 'a.ino').write_text(SKETCH)
+    (projects / 'b' / 'broken.ino').write_text('#error\n')
+    (projects / 'notes.txt').write_text('')
+    report = tmp_path / 'report.json'
+    code = fab_cli.main([str(projects), '--arduino', arduino, '--board', 'Arduino Nano',
+                         '--report', str(report)])
+    assert code == 1
+    data = json.loads(report.read_text())
+    assert data['board'] == 'Arduino Nano'
+    files = [os.path.relpath(r['file'], projects) for r in data['results']]
+    assert files == ['a.ino', os.path.join('b', 'broken.ino')]
+    ok, broken = data['results']
+    assert ok['error'] is None and ok['compile']['ok'] and ok['upload'] is None
+    assert broken['error'] == 'compile: código 1'
+    assert '1/2 proyectos correctos' in capsys.readouterr().err
+
+def test_cli_upload(arduino, tmp_path, capsys):
+    sketch = tmp_path / 'blink.ino'
+    sketch.write_text(SKETCH)
+    assert fab_cli.main([str(sketch), '--arduino', arduino, '--port', 'good']) == 0
+    result = json.loads(capsys.readouterr().out)['results'][0]
+    assert result['upload']['ok']
+
+def test_cli_usage_errors(arduino, tmp_path):
+    with pytest.raises(SystemExit) as exit_info:
+        fab_cli.main([str(tmp_path / 'missing.fab'), '--arduino', arduino])
+    assert exit_info.value.code == 2
+    with pytest.raises(SystemExit) as exit_info:
+        fab_cli.main([str(tmp_path), '--arduino', arduino, '--board', 'ESP32'])
+    assert exit_info.value.code == 2
+
+def test_first_core_build_waits_for_board_lock(builder):
+    lock = builder.core_cache.build_lock('arduino:avr:uno')
+    assert lock.acquire(timeout=0)
+    results = []
+    thread = threading.Thread(target=lambda: results.append(builder.compile(SKETCH, 'Arduino Uno')))
+    thread.start()
+    thread.join(0.5)
+    assert thread.is_alive()
+    lock.release()
+    thread.join(10)
+    assert results[0]['ok']
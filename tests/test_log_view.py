@@ -0,0 +1,39 @@
+import pytest
+from core.log_view import LineRing
+
+def test_keeps_order_until_full():
+    ring = LineRing(capacity=4)
+    assert ring.extend(['a', 'b', 'c']) == 0
+    assert ring.lines() == ['a', 'b', 'c']
+    assert ring[2] == 'c'
+
+def test_drops_oldest_when_full():
+    ring = LineRing(capacity=4)
+    ring.extend(['a', 'b', 'c'])
+    assert ring.extend(['d', 'e', 'f']) == 2
+    assert len(ring) == 4
+    assert ring.lines() == ['c', 'd', 'e', 'f']
+    assert ring[0] == 'c'
+    with pytest.raises(IndexError):
+        ring[4]
+
+def test_batch_larger_than_capacity():
+    ring = LineRing(capacity=3)
+    ring.extend(['x'])
+    ring.extend([str(i) for i in range(10)])
+    assert ring.lines() == ['7', '8', '9']
+
+def test_find_wraps_and_ignores_case():
+    ring = LineRing(capacity=4)
+    ring.extend(['temp:1', 'ERROR sensor', 'temp:2', 'error bus'])
+    assert ring.find('error') == 1
+    assert ring.find('error', 2) == 3
+    assert ring.find('ERROR', 4) == 1
+    assert ring.find('nada') == -1
+
+def test_clear():
+    ring = LineRing(capacity=2)
+    ring.extend(['a', 'b', 'c'])
+    ring.clear()
+    assert len(ring) == 0
+    assert ring.lines() == []
@@ -0,0 +1,117 @@
+import os
+import time
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+import numpy as np
+import pytest
+from core.monitor_plotter import LineSplitter, MainWindow
+
+@pytest.fixture
+def window(qapp, tmp_path, monkeypatch):
+    # MainWindow crea data_serial/ en el directorio actual
+    monkeypatch.chdir(tmp_path)
+    window = MainWindow(plot_capacity=1000)
+    yield window
+    window.close()
+
+def test_line_splitter_joins_fragments():
+    splitter = LineSplitter()
+    assert splitter.feed(b'a:1,b:') == []
+    assert splitter.feed(b'2\r\nc:3\r\nd:') == ['a:1,b:2', 'c:3']
+    assert splitter.flush() == ['d:']
+    assert splitter.flush() == []
+
+def test_line_splitter_skips_blank_lines():
+    splitter = LineSplitter()
+    assert splitter.feed(b'\r\n\n1,2\n\n') == ['1,2']
+
+def test_line_splitter_caps_unterminated_line():
+    splitter = LineSplitter(max_line_bytes=8)
+    assert splitter.feed(b'0123456789') == ['0123456789']
+    assert splitter.feed(b'ok\n') == ['ok']
+
+def test_parse_errors_reported_once_per_batch(window):
+    window.display_batch(['a:1,b:2', 'a:x,b:3', 'a:4,b:?'])
+    messages = [line for line in window.console_text.toPlainText().split('\n')
+                if line.startswith('Dato ignorado')]
+    assert messages == ['Dato ignorado en "a:x,b:3": a:x (valor no numérico) y 1 más en este cuadro']
+
+class FakeClock:
+    """Reemplaza al módulo time en monitor_plotter: solo time() es falso."""
+
+    def __init__(self, now):
+        self.now = now
+
+    def time(self):
+        return self.now
+
+    def __getattr__(self, name):
+        return getattr(time, name)
+
+def test_reconnect_keeps_time_axis_sorted(window, monkeypatch):
+    from core import monitor_plotter
+    clock = FakeClock(100.0)
+    monkeypatch.setattr(monitor_plotter, 'time', clock)
+    master, slave = os.openpty()
+    try:
+        window.port_combo.addItem(os.ttyname(slave))
+        window.port_combo.setCurrentText(os.ttyname(slave))
+        window.toggle_connection()
+        assert window.serial_monitor.serial.isOpen()
+        clock.now = 110.0
+        window.display_batch(['1', '2', '3'])
+        window.toggle_connection()
+        clock.now = 200.0
+        window.toggle_connection()
+        clock.now = 202.0
+        window.display_batch(['4', '5', '6'])
+        window.toggle_connection()
+    finally:
+        os.close(master)
+        os.close(slave)
+    x = window.plot_buffer.x_view()
+    assert len(x) == 6 and (x[1:] > x[:-1]).all()
+    assert x[3] > 10.0
+    visible_x, visible_y = window.plot_buffer.visible(0, 10.5, 20.0, 100)
+    assert list(visible_y) == [3, 4, 5, 6]
+
+def write_capture(path, rows):
+    from core.capture_format import CaptureWriter
+    writer = CaptureWriter(path)
+    xs = np.arange(rows, dtype=float) / 100
+    writer.append(xs, np.column_stack([np.sin(xs), np.cos(xs)]), ['sen', 'cos'])
+    return writer.close()
+
+def test_replay_reads_capture_without_copying(window, tmp_path):
+    from core.plot_lod import CaptureLodView
+    path = write_capture(str(tmp_path / 'larga.fabcap'), 200000)
+    window.replay_capture(path)
+    buffer = window.plot_buffer
+    assert isinstance(buffer, CaptureLodView)
+    assert isinstance(buffer.values, np.memmap)
+    assert len(buffer) == 200000 and len(window.curves) == 2
+    x, y = window.curves[0].getData()
+    assert len(x) <= 2 * window.width() + 4
+    assert window.capture_writer is None
+
+def test_replay_refused_while_connected_and_reset_on_connect(window, tmp_path):
+    from core.plot_lod import LodPlotBuffer
+    path = write_capture(str(tmp_path / 'corta.fabcap'), 100)
+    master, slave = os.openpty()
+    try:
+        window.port_combo.addItem(os.ttyname(slave))
+        window.port_combo.setCurrentText(os.ttyname(slave))
+        window.toggle_connection()
+        window.replay_capture(path)
+        assert isinstance(window.plot_buffer, LodPlotBuffer)
+        assert 'Desconecta el puerto' in window.console_text.toPlainText()
+        window.toggle_connection()
+        window.replay_capture(path)
+        assert len(window.plot_buffer) == 100
+        window.toggle_connection()
+        assert isinstance(window.plot_buffer, LodPlotBuffer)
+        assert len(window.plot_buffer) == 0 and window.curves == []
+        window.toggle_connection()
+    finally:
+        os.close(master)
+        os.close(slave)
@@ -0,0 +1,46 @@
+import pytest
+import numpy as np
+from core.plot_buffer import PlotRingBuffer
+
+def test_append_and_views():
+    buf = PlotRingBuffer(capacity=4, channels=2)
+    for i in range(3):
+        buf.append(float(i), [i * 10, i * 100])
+    assert len(buf) == 3
+    assert buf.x_view().tolist() == [0.0, 1.0, 2.0]
+    assert buf.y_view(1).tolist() == [0.0, 100.0, 200.0]
+
+def test_wraparound_keeps_latest_contiguous():
+    buf = PlotRingBuffer(capacity=4, channels=1)
+    for i in range(10):
+        buf.append(float(i), [i])
+    x = buf.x_view()
+    assert x.tolist() == [6.0, 7.0, 8.0, 9.0]
+    # Vista sin copia sobre el almacenamiento interno
+    assert x.base is not None
+    assert buf.y_view(0).tolist() == [6.0, 7.0, 8.0, 9.0]
+
+def test_missing_channels_are_nan():
+    buf = PlotRingBuffer(capacity=4)
+    buf.add_channel()
+    buf.append(0.0, [1.0])
+    buf.add_channel()
+    buf.append(1.0, [2.0, 3.0])
+    assert np.isnan(buf.y_view(1)[0])
+    assert buf.y_view(1)[1] == 3.0
+
+def test_extend_matches_append():
+    a = PlotRingBuffer(capacity=5, channels=2)
+    b = PlotRingBuffer(capacity=5, channels=2)
+    values = np.arange(16, dtype=float).reshape(8, 2)
+    for i, row in enumerate(values):
+        a.append(float(i), row)
+    b.extend(np.arange(3, dtype=float), values[:3])
+    b.extend(np.arange(3, 8, dtype=float), values[3:])
+    assert np.array_equal(a.x_view(), b.x_view())
+    assert np.array_equal(a.y_views(), b.y_views())
+
+def test_extend_larger_than_capacity():
+    buf = PlotRingBuffer(capacity=3, channels=1)
+    buf.extend(np.arange(7, dtype=float), np.arange(7, dtype=float).reshape(7, 1))
+    assert buf.x_view().tolist() == [4.0, 5.0, 6.0]
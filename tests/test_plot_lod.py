@@ -0,0 +1,85 @@
+import pytest
+import numpy as np
+from core import plot_lod
+from core.plot_lod import LodPlotBuffer, CaptureLodView, LOD_FACTOR
+
+def test_levels_summarize_min_max():
+    buf = LodPlotBuffer(capacity=LOD_FACTOR ** 4, channels=1)
+    values = np.sin(np.arange(LOD_FACTOR ** 3) / 7.0)
+    buf.extend(np.arange(len(values), dtype=float), values.reshape(-1, 1))
+    level = buf.levels[0]
+    expected = values.reshape(-1, LOD_FACTOR)
+    assert np.allclose(level.mins.y_view(0), expected.min(axis=1))
+    assert np.allclose(level.maxs.y_view(0), expected.max(axis=1))
+    assert level.mins.x_view().tolist() == list(range(0, len(values), LOD_FACTOR))
+
+def test_incremental_updates_match_single_extend():
+    a = LodPlotBuffer(capacity=LOD_FACTOR ** 4, channels=2)
+    b = LodPlotBuffer(capacity=LOD_FACTOR ** 4, channels=2)
+    values = np.random.default_rng(0).normal(size=(1000, 2))
+    xs = np.arange(1000, dtype=float)
+    a.extend(xs, values)
+    for start in range(0, 1000, 37):
+        b.extend(xs[start:start + 37], values[start:start + 37])
+    for la, lb in zip(a.levels, b.levels):
+        assert np.array_equal(la.mins.y_views(), lb.mins.y_views())
+        assert np.array_equal(la.maxs.y_views(), lb.maxs.y_views())
+
+def test_visible_uses_raw_when_zoomed_in():
+    buf = LodPlotBuffer(capacity=100000, channels=1)
+    xs = np.arange(50000, dtype=float)
+    buf.extend(xs, xs.reshape(-1, 1))
+    x, y = buf.visible(0, 100, 200, columns=800)
+    assert x[0] <= 100 and x[-1] >= 200
+    assert np.array_equal(x, y)
+
+def test_visible_bounds_points_when_zoomed_out():
+    buf = LodPlotBuffer(capacity=100000, channels=1)
+    xs = np.arange(100000, dtype=float)
+    buf.extend(xs, np.sin(xs).reshape(-1, 1))
+    x, y = buf.visible(0, 0, 100000, columns=500)
+    assert len(x) <= 2 * 500 + 4
+    # Los extremos se conservan en el nivel diezmado
+    assert y.max() == pytest.approx(np.sin(xs).max())
+    assert y.min() == pytest.approx(np.sin(xs).min())
+
+def test_channel_added_later():
+    buf = LodPlotBuffer(capacity=LOD_FACTOR ** 3, channels=1)
+    buf.extend(np.arange(5, dtype=float), np.ones((5, 1)))
+    buf.add_channel()
+    buf.extend(np.arange(5, 16, dtype=float), np.full((11, 2), 2.0))
+    level = buf.levels[0]
+    assert level.mins.y_view(0).tolist() == [1.0, 2.0]
+    # El primer bloque mezcla muestras sin el canal nuevo (NaN) y con él
+    assert level.mins.y_view(1).tolist() == [2.0, 2.0]
+
+def test_capture_view_matches_ring_buffer(monkeypatch):
+    # Bloques chicos para que la construcción recorra varios
+    monkeypatch.setattr(plot_lod, 'CAPTURE_CHUNK_ROWS', LOD_FACTOR ** 3)
+    rows = 50003
+    xs = np.arange(rows, dtype=float)
+    values = np.random.default_rng(1).normal(size=(2, rows)).astype(np.float32)
+    values[1, :700] = np.nan
+    view = CaptureLodView(xs, values)
+    buf = LodPlotBuffer(capacity=rows, channels=2)
+    buf.extend(xs, values.T)
+    assert [level.block for level in view.levels] == [level.block for level in buf.levels]
+    for channel in range(2):
+        for x0, x1, columns in [(0, rows, 500), (1000, 1200, 800), (0, 20000, 300)]:
+            vx, vy = view.visible(channel, x0, x1, columns)
+            bx, by = buf.visible(channel, x0, x1, columns)
+            # La vista también resume el último bloque incompleto
+            n = min(len(vx), len(bx))
+            assert np.array_equal(vx[:n], bx[:n])
+            assert np.allclose(vy[:n], by[:n], equal_nan=True)
+    low, high = view.value_range()
+    assert low == pytest.approx(np.nanmin(values))
+    assert high == pytest.approx(np.nanmax(values))
+
+def test_capture_view_small_or_empty():
+    view = CaptureLodView(np.arange(10, dtype=float), np.ones((1, 10), dtype=np.float32))
+    assert view.levels == []
+    x, y = view.visible(0, 2, 5, 100)
+    assert x.tolist() == [1, 2, 3, 4, 5, 6]
+    assert view.value_range() == (1.0, 1.0)
+    assert CaptureLodView(np.empty(0), np.empty((0, 0), dtype=np.float32)).value_range() is None
@@ -0,0 +1,44 @@
+import pytest
+from core import port_monitor
+from core.port_monitor import PortMonitor, PortInfo
+from core.port_inventory import PortInventory
+
+@pytest.fixture
+def scanned(monkeypatch):
+    calls = []
+    ports = {
+        '/dev/ttyUSB1': PortInfo('/dev/ttyUSB1', 'USB2.0-Serial', 0x1A86, 0x7523, None),
+        '/dev/ttyACM0': PortInfo('/dev/ttyACM0', 'Arduino Uno', 0x2341, 0x0043, '8573'),
+    }
+    def scan():
+        calls.append(1)
+        return dict(ports)
+    monkeypatch.setattr(port_monitor, '_scan_ports', scan)
+    monkeypatch.setattr(port_monitor.sys, 'platform', 'win32')
+    return calls
+
+def test_subscribers_share_one_monitor(scanned):
+    inventory = PortInventory(PortMonitor(poll_interval=30))
+    first, second = (lambda added, removed: None), (lambda added, removed: None)
+    inventory.subscribe(first)
+    inventory.subscribe(second)
+    try:
+        assert inventory.monitor.running
+        assert inventory.devices() == ['/dev/ttyACM0', '/dev/ttyUSB1']
+        assert inventory.info('/dev/ttyACM0').vid == 0x2341
+        assert inventory.info('/dev/ttyS9') is None
+        # Leer el inventario no vuelve a enumerar mientras el monitor vigila
+        calls = len(scanned)
+        inventory.ports()
+        inventory.devices()
+        assert len(scanned) == calls
+    finally:
+        inventory.unsubscribe(first)
+        assert inventory.monitor.running
+        inventory.unsubscribe(second)
+    assert not inventory.monitor.running
+
+def test_without_subscribers_reads_on_demand(scanned):
+    inventory = PortInventory(PortMonitor())
+    assert [port.description for port in inventory.ports()] == ['Arduino Uno', 'USB2.0-Serial']
+    assert len(scanned) == 1
@@ -0,0 +1,75 @@
+import threading
+import time
+import pytest
+from core.port_leases import PortLeaseRegistry
+
+def test_release_only_target_port():
+    registry = PortLeaseRegistry()
+    closed = []
+    registry.acquire('COM3', 'Monitor serial', lambda timeout: closed.append('COM3') or True)
+    registry.acquire('COM4', 'Monitor serial', lambda timeout: closed.append('COM4') or True)
+    assert registry.release('COM3') == (['Monitor serial'], [])
+    assert closed == ['COM3']
+    assert registry.holders('COM3') == []
+    assert registry.holders('COM4') == ['Monitor serial']
+
+def test_release_reports_failures_and_keeps_lease():
+    registry = PortLeaseRegistry()
+    def stuck(timeout):
+        return False
+    def broken(timeout):
+        raise OSError('driver')
+    registry.acquire('COM3', 'lento', stuck)
+    registry.acquire('COM3', 'roto', broken)
+    assert registry.release('COM3') == ([], ['lento', 'roto'])
+    assert registry.holders('COM3') == ['lento', 'roto']
+
+def test_timeout_is_per_port():
+    registry = PortLeaseRegistry()
+    timeouts = []
+    registry.acquire('COM3', 'a', lambda timeout: timeouts.append(timeout) or True)
+    registry.acquire('COM3', 'b', lambda timeout: timeouts.append(timeout) or True)
+    registry.release('COM3', timeout=0.5)
+    assert all(0 <= t <= 0.5 for t in timeouts)
+
+class SlowReader:
+    """Imita al monitor: stop() avisa al lector y release espera a que termine."""
+
+    def __init__(self, stop_seconds):
+        self.stop_seconds = stop_seconds
+        self.stopped = threading.Event()
+
+    def stop(self):
+        # stop_seconds None: el lector no termina nunca (driver trabado)
+        if self.stop_seconds is not None:
+            threading.Timer(self.stop_seconds, self.stopped.set).start()
+
+    def release(self, timeout):
+        return self.stopped.wait(timeout)
+
+def test_release_many_closes_ports_concurrently():
+    registry = PortLeaseRegistry()
+    for port in ['COM3', 'COM4', 'COM5']:
+        reader = SlowReader(0.3)
+        registry.acquire(port, 'Monitor serial', reader.release, reader.stop)
+    started = time.monotonic()
+    results = registry.release_many(['COM3', 'COM4', 'COM5'], timeout=2.0)
+    assert time.monotonic() - started < 0.8
+    assert all(result == (['Monitor serial'], []) for result in results.values())
+
+def test_stuck_ports_do_not_add_up():
+    registry = PortLeaseRegistry()
+    for port in ['COM3', 'COM4', 'COM5']:
+        reader = SlowReader(None)
+        registry.acquire(port, 'Monitor serial', reader.release, reader.stop)
+    started = time.monotonic()
+    results = registry.release_many(['COM3', 'COM4', 'COM5'], timeout=0.2)
+    assert time.monotonic() - started < 0.5
+    assert all(result == ([], ['Monitor serial']) for result in results.values())
+
+def test_drop_and_unknown_port():
+    registry = PortLeaseRegistry()
+    lease = registry.acquire('COM3', 'Monitor serial', lambda timeout: True)
+    lease.drop()
+    assert registry.holders('COM3') == []
+    assert registry.release('COM9') == ([], [])
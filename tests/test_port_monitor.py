@@ -0,0 +1,46 @@
+import sys
+import time
+import pytest
+from core import port_monitor
+from core.port_monitor import PortMonitor, PortInfo
+
+def fake_ports(*devices):
+    return {device: PortInfo(device, 'USB Serial', 0x1A86, 0x7523, None) for device in devices}
+
+def test_check_reports_added_and_removed(monkeypatch):
+    monitor = PortMonitor()
+    changes = []
+    monitor.portChanged.connect(lambda added, removed: changes.append((added, removed)))
+    monkeypatch.setattr(port_monitor, '_scan_ports', lambda: fake_ports('/dev/ttyACM0', '/dev/ttyUSB0'))
+    monitor.check()
+    monkeypatch.setattr(port_monitor, '_scan_ports', lambda: fake_ports('/dev/ttyUSB0', '/dev/ttyUSB1'))
+    monitor.check()
+    monitor.check()
+    assert changes == [
+        (['/dev/ttyACM0', '/dev/ttyUSB0'], []),
+        (['/dev/ttyUSB1'], ['/dev/ttyACM0']),
+    ]
+
+def test_polling_backend_stops_promptly(monkeypatch):
+    monkeypatch.setattr(port_monitor.sys, 'platform', 'win32')
+    monkeypatch.setattr(port_monitor, '_scan_ports', dict)
+    monitor = PortMonitor(poll_interval=30)
+    monitor.start()
+    time.sleep(0.05)
+    start = time.monotonic()
+    monitor.stop()
+    assert monitor.backend == 'polling'
+    assert time.monotonic() - start < 1
+
+@pytest.mark.skipif(not sys.platform.startswith('linux'), reason="inotify solo existe en Linux")
+def test_inotify_watcher_detects_serial_nodes(tmp_path):
+    watcher = port_monitor._InotifyWatcher(str(tmp_path))
+    try:
+        (tmp_path / 'sda1').touch()
+        assert watcher.read() is False
+        (tmp_path / 'ttyACM0').touch()
+        assert watcher.read() is True
+        (tmp_path / 'ttyACM0').unlink()
+        assert watcher.read() is True
+    finally:
+        watcher.close()
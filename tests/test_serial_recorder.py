@@ -0,0 +1,31 @@
+import pytest
+from core.serial_recorder import SerialRecorder
+
+def test_records_lines_with_timestamps(tmp_path):
+    recorder = SerialRecorder(str(tmp_path), flush_interval=60)
+    recorder.start('/dev/ttyUSB0')
+    recorder.write_lines(['a:1', 'a:2'])
+    recorder.flush()
+    recorder.write_lines(['a:3'])
+    files = recorder.stop()
+    assert len(files) == 1
+    assert 'ttyUSB0' in files[0]
+    rows = [line.split('\t') for line in open(files[0], encoding='utf-8').read().splitlines()]
+    assert [value for _, value in rows] == ['a:1', 'a:2', 'a:3']
+    times = [float(t) for t, _ in rows]
+    assert times == sorted(times) and times[0] >= 0
+
+def test_rotates_by_size(tmp_path):
+    recorder = SerialRecorder(str(tmp_path), max_bytes=100, flush_interval=60)
+    recorder.start('COM3')
+    for i in range(20):
+        recorder.write_lines([f'linea {i:02d} con datos'])
+    files = recorder.stop()
+    assert len(files) > 1
+    content = ''.join(open(path, encoding='utf-8').read() for path in files)
+    assert content.count('\n') == 20
+
+def test_inactive_recorder_ignores_lines(tmp_path):
+    recorder = SerialRecorder(str(tmp_path))
+    recorder.write_lines(['a:1'])
+    assert recorder.stop() == []
@@ -0,0 +1,46 @@
+import pytest
+import numpy as np
+from core.telemetry_parser import TelemetryParser
+
+def test_named_batch_uses_cached_schema():
+    parser = TelemetryParser()
+    result = parser.parse_batch(['temp:20.5,luz:300', 'temp:21,luz:310', 'temp:22,luz:320'])
+    assert parser.columns == ['temp', 'luz']
+    assert result.new_columns == [(0, 'temp'), (1, 'luz')]
+    assert result.values.tolist() == [[20.5, 300.0], [21.0, 310.0], [22.0, 320.0]]
+    assert result.valid.all()
+    # Segundo lote: mismo esquema, sin columnas nuevas
+    result = parser.parse_batch(['temp:23,luz:330'])
+    assert result.new_columns == []
+    assert result.values.tolist() == [[23.0, 330.0]]
+
+def test_positional_lines():
+    parser = TelemetryParser()
+    result = parser.parse_batch(['1,2', '3,4', '5'])
+    assert parser.columns == [None, None]
+    assert result.values[:2].tolist() == [[1.0, 2.0], [3.0, 4.0]]
+    assert result.values[2, 0] == 5.0
+    assert np.isnan(result.values[2, 1])
+
+def test_malformed_fields_are_reported_not_discarded():
+    parser = TelemetryParser()
+    result = parser.parse_batch(['a:1,b:2', 'a:3,b:x', 'Hola mundo', 'a:5,ruido'])
+    assert result.values[1, 0] == 3.0
+    assert np.isnan(result.values[1, 1])
+    assert result.valid.tolist() == [True, True, False, True]
+    assert [(e.line, e.field) for e in result.errors] == [(1, 'b:x'), (2, 'Hola mundo'), (3, 'ruido')]
+
+def test_new_variable_adds_column():
+    parser = TelemetryParser()
+    parser.parse_batch(['a:1'])
+    result = parser.parse_batch(['a:2', 'a:3,b:4'])
+    assert result.new_columns == [(1, 'b')]
+    assert result.values.shape == (2, 2)
+    assert result.values[1].tolist() == [3.0, 4.0]
+
+def test_misaligned_positional_lines_are_not_shifted():
+    parser = TelemetryParser()
+    parser.parse_batch(['1,2'])
+    result = parser.parse_batch(['1,2,3', '4'])
+    assert result.values[0].tolist() == [1.0, 2.0, 3.0]
+    assert result.values[1, 0] == 4.0
@@ -0,0 +1,59 @@
+import os
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+import pytest
+from PyQt5.QtCore import Qt
+from PyQt5.QtWidgets import QComboBox, QMenu, QAction, QListWidget, QListWidgetItem
+from core.ui_components import PortListUpdater
+
+def combo_items(combo):
+    return [combo.itemText(i) for i in range(combo.count())]
+
+def test_sync_combo_keeps_selection(qapp):
+    combo = QComboBox()
+    PortListUpdater.sync_combo(combo, ['COM3', 'COM5'], 'Sin puertos')
+    combo.setCurrentText('COM5')
+    assert PortListUpdater.sync_combo(combo, ['COM1', 'COM5', 'COM7'], 'Sin puertos')
+    assert combo_items(combo) == ['COM1', 'COM5', 'COM7']
+    assert combo.currentText() == 'COM5'
+    assert not PortListUpdater.sync_combo(combo, ['COM1', 'COM5', 'COM7'], 'Sin puertos')
+
+def test_sync_combo_placeholder(qapp):
+    combo = QComboBox()
+    PortListUpdater.sync_combo(combo, ['COM3'], 'Sin puertos')
+    assert PortListUpdater.sync_combo(combo, [], 'Sin puertos')
+    assert combo_items(combo) == ['Sin puertos']
+    assert not combo.isEnabled()
+    assert not PortListUpdater.sync_combo(combo, [], 'Sin puertos')
+    PortListUpdater.sync_combo(combo, ['COM4'], 'Sin puertos')
+    assert combo_items(combo) == ['COM4']
+    assert combo.isEnabled()
+
+def test_sync_menu_only_touches_changes(qapp):
+    menu = QMenu()
+    created = []
+    def create(device):
+        created.append(device)
+        return QAction(device, menu)
+    PortListUpdater.sync_menu(menu, [], create, 'Sin puertos')
+    assert [a.text() for a in menu.actions()] == ['Sin puertos']
+    PortListUpdater.sync_menu(menu, ['/dev/ttyACM0', '/dev/ttyUSB0'], create, 'Sin puertos')
+    PortListUpdater.sync_menu(menu, ['/dev/ttyACM1', '/dev/ttyUSB0'], create, 'Sin puertos')
+    assert [a.text() for a in menu.actions()] == ['/dev/ttyACM1', '/dev/ttyUSB0']
+    assert created == ['/dev/ttyACM0', '/dev/ttyUSB0', '/dev/ttyACM1']
+    assert not PortListUpdater.sync_menu(menu, ['/dev/ttyACM1', '/dev/ttyUSB0'], create, 'Sin puertos')
+
+def test_sync_list_keeps_check_states(qapp):
+    widget = QListWidget()
+    def create(device):
+        item = QListWidgetItem(device)
+        item.setFlags(item.flags() | Qt.ItemIsUserCheckable)
+        item.setCheckState(Qt.Unchecked)
+        return item
+    assert PortListUpdater.sync_list(widget, ['COM3', 'COM5'], create)
+    widget.item(1).setCheckState(Qt.Checked)
+    kept = widget.item(1)
+    assert PortListUpdater.sync_list(widget, ['COM4', 'COM5', 'COM6'], create)
+    assert [widget.item(i).text() for i in range(widget.count())] == ['COM4', 'COM5', 'COM6']
+    assert widget.item(1) is kept and kept.checkState() == Qt.Checked
+    assert not PortListUpdater.sync_list(widget, ['COM4', 'COM5', 'COM6'], create)
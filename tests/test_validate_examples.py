@@ -0,0 +1,158 @@
+import multiprocessing
+import os
+import sys
+import pytest
+import validate_examples
+from core.code_generator import CodeGenerator, GeneratedCodeCache
+
+SKETCH = 'void setup() {\n}\n\nvoid loop() {\n}\n'
+
+# arduino-builder de prueba: como el real, falla con #error en el sketch
+# antes de llegar al núcleo; si no, compila el núcleo una vez por
+# -build-cache (anotándolo en FAKE_LOG) y copia el sketch como .hex
+FAKE_BUILDER = '''
+import os, sys, time
+args = sys.argv[1:]
+build = args[args.index('-build-path') + 1]
+cache = args[args.index('-build-cache') + 1]
+fqbn = args[args.index('-fqbn') + 1]
+code = open(args[-1]).read()
+if '#error' in code:
+    print('sketch.ino:1: error: #error')
+    sys.exit(1)
+core = os.path.join(cache, 'core', 'core.a')
+if not os.path.exists(core):
+    with open(os.environ['FAKE_LOG'], 'a') as f:
+        f.write(fqbn + '\\n')
+    time.sleep(0.3)
+    os.makedirs(os.path.dirname(core), exist_ok=True)
+    open(core, 'w').close()
+os.makedirs(build, exist_ok=True)
+with open(os.path.join(build, 'extracted_code.ino.hex'), 'w') as f:
+    f.write(fqbn + code)
+'''
+
+BOARDS = ['Arduino Uno', 'Arduino Mega']
+
+class FakeEngine:
+    def generate(self, xml):
+        if 'broken' in xml:
+            raise RuntimeError('bloque desconocido')
+        return SKETCH
+
+    def close(self):
+        pass
+
+@pytest.fixture
+def arduino(tmp_path, monkeypatch):
+    monkeypatch.setenv('XDG_CACHE_HOME', str(tmp_path / 'cache'))
+    monkeypatch.setenv('FAKE_LOG', str(tmp_path / 'cores.log'))
+    builder = tmp_path / 'arduino' / 'arduino-builder'
+    builder.parent.mkdir()
+    builder.write_text(f'#!{sys.executable}\n{FAKE_BUILDER}')
+    builder.chmod(0o755)
+    return str(builder.parent)
+
+@pytest.fixture
+def examples(tmp_path):
+    folder = tmp_path / 'examples'
+    (folder / 'Betto').mkdir(parents=True)
+    (folder / 'Arduino').mkdir()
+    (folder / 'Arduino' / 'blink.ino').write_text(SKETCH)
+    (folder / 'Arduino' / 'fade.ino').write_text(SKETCH + '// fade\n')
+    (folder / 'Arduino' / 'error.ino').write_text('#error\n')
+    (folder / 'Betto' / 'dance.fab').write_text('<xml/>')
+    (folder / 'Betto' / 'old.fab').write_text('<xml>broken</xml>')
+    return folder
+
+def generator(tmp_path):
+    return CodeGenerator(str(tmp_path), GeneratedCodeCache(str(tmp_path / 'generated')), FakeEngine())
+
+def test_matrix_compiles_each_core_once(arduino, examples, tmp_path):
+    projects = validate_examples.collect_projects([str(examples)])
+    records = validate_examples.validate(projects, BOARDS, arduino, generator(tmp_path), jobs=4)
+    assert len(records) == len(projects) * len(BOARDS)
+    failed = {(os.path.basename(r['file']), r['board']): r['error'] for r in records if r['error']}
+    assert failed == {
+        ('error.ino', 'Arduino Uno'): 'compile: código 1',
+        ('error.ino', 'Arduino Mega'): 'compile: código 1',
+        ('old.fab', 'Arduino Uno'): 'generate: bloque desconocido',
+        ('old.fab', 'Arduino Mega'): 'generate: bloque desconocido',
+    }
+    cores = (tmp_path / 'cores.log').read_text().split()
+    assert sorted(cores) == ['arduino:avr:mega', 'arduino:avr:uno']
+
+def test_failing_first_example_does_not_race_on_the_core(arduino, tmp_path):
+    folder = tmp_path / 'first_fails'
+    folder.mkdir()
+    (folder / 'a_error.ino').write_text('#error\n')
+    for name in ('b.ino', 'c.ino', 'd.ino'):
+        (folder / name).write_text(SKETCH + f'// {name}\n')
+    projects = validate_examples.collect_projects([str(folder)])
+    records = validate_examples.validate(projects, BOARDS, arduino, generator(tmp_path), jobs=4)
+    failed = {(os.path.basename(r['file']), r['board']) for r in records if r['error']}
+    assert failed == {('a_error.ino', 'Arduino Uno'), ('a_error.ino', 'Arduino Mega')}
+    cores = (tmp_path / 'cores.log').read_text().split()
+    assert sorted(cores) == ['arduino:avr:mega', 'arduino:avr:uno']
+
+def test_boards_sharing_an_fqbn_share_core_and_compile(arduino, examples, tmp_path):
+    (examples / 'Arduino' / 'blink_copy.ino').write_text(SKETCH)
+    boards = ['Arduino Nano', 'Modular', 'Robot Betto']
+    projects = validate_examples.collect_projects([str(examples)])
+    records = validate_examples.validate(projects, boards, arduino, generator(tmp_path), jobs=4)
+    assert (tmp_path / 'cores.log').read_text().split() == ['arduino:avr:nano']
+    compiled = [r['compile'] for r in records if r['error'] is None]
+    assert len(compiled) == 4 * len(boards)
+    # Una compilación por código distinto: blink_copy.ino y dance.fab repiten blink.ino
+    assert len({id(result) for result in compiled}) == 2
+    assert not any(result['cached'] for result in compiled)
+
+def fail_blink(code, board):
+    if 'blink' in code:
+        raise OSError('sin espacio en disco')
+    return validate_examples.HeadlessBuilder.compile(validate_examples._builder, code, board)
+
+@pytest.mark.skipif(multiprocessing.get_start_method() != 'fork',
+                    reason='el reemplazo de _compile_cell solo llega a los procesos con fork')
+def test_worker_exception_fails_only_its_cell(arduino, tmp_path, monkeypatch):
+    folder = tmp_path / 'examples'
+    folder.mkdir()
+    (folder / 'a.ino').write_text(SKETCH + '// blink\n')
+    (folder / 'b.ino').write_text(SKETCH)
+    monkeypatch.setattr(validate_examples, '_compile_cell', fail_blink)
+    projects = validate_examples.collect_projects([str(folder)])
+    records = validate_examples.validate(projects, BOARDS, arduino, generator(tmp_path), jobs=2)
+    errors = {(os.path.basename(r['file']), r['board']): r['error'] for r in records}
+    assert errors == {
+        ('a.ino', 'Arduino Uno'): 'compile: sin espacio en disco',
+        ('a.ino', 'Arduino Mega'): 'compile: sin espacio en disco',
+        ('b.ino', 'Arduino Uno'): None,
+        ('b.ino', 'Arduino Mega'): None,
+    }
+
+def test_second_run_uses_build_cache(arduino, examples, tmp_path):
+    projects = validate_examples.collect_projects([str(examples)])
+    validate_examples.validate(projects, BOARDS, arduino, generator(tmp_path), jobs=2)
+    records = validate_examples.validate(projects, BOARDS, arduino, generator(tmp_path), jobs=2)
+    compiled = [r['compile'] for r in records if r['error'] is None]
+    assert len(compiled) == 6
+    assert all(result['cached'] for result in compiled)
+
+def test_main_prints_table_and_failures(arduino, examples, tmp_path, capsys):
+    (examples / 'Arduino' / 'error.ino').unlink()
+    (examples / 'Betto' / 'old.fab').unlink()
+    (examples / 'Betto' / 'dance.fab').unlink()
+    args = ['--examples', str(examples), '--arduino', arduino, '--html', str(tmp_path),
+            '--boards', *BOARDS, '--jobs', '2', '--report', str(tmp_path / 'report.json')]
+    assert validate_examples.main(args) == 0
+    out = capsys.readouterr().out
+    lines = out.splitlines()
+    assert lines[0].split() == ['ejemplo', 'Arduino', 'Uno', 'Arduino', 'Mega']
+    assert lines[1].startswith(os.path.join('Arduino', 'blink.ino'))
+    assert '4/4 compilaciones correctas' in out
+
+    (examples / 'Arduino' / 'error.ino').write_text('#error\n')
+    assert validate_examples.main(args) == 1
+    out = capsys.readouterr().out
+    assert 'FALLA' in out
+    assert 'sketch.ino:1: error: #error' in out
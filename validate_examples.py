@@ -0,0 +1,228 @@
+"""
+Validación de los ejemplos incluidos en todas las placas
+
+Compila cada proyecto de examples/ para cada placa de BOARD_CPU_MAPPING y
+muestra una tabla de tiempos (ejemplo × placa) y el detalle de las fallas.
+Sirve para comprobar que los ejemplos siguen compilando después de
+actualizar el motor de bloques o la instalación de Arduino.
+
+Uso:
+    python -m validate_examples [--examples examples] [--boards "Arduino Uno" ...]
+                                [--jobs 4] [--report resultado.json]
+
+El código de cada ejemplo se genera una sola vez (no depende de la placa) y
+las compilaciones corren en un grupo de procesos. Las placas con el mismo
+FQBN comparten cada compilación. Las de cada FQBN van de a una hasta que
+una compila de verdad, lo que deja su núcleo en la CoreCache; recién
+entonces el resto de ese FQBN corre en paralelo y reutiliza el núcleo. Los .hex van a la BuildCache, así que una segunda
+ejecución sin cambios no compila nada.
+
+Código de salida: 0 si toda la matriz compiló, 1 si hubo fallas y 2 si los
+argumentos no son válidos.
+
+Autor: Código Abierto Fab Blocks IDE
+Licencia: MIT
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+
+from core.code_generator import CodeGenerator
+from core.compilation_manager import BOARD_CPU_MAPPING
+from core.headless_build import HeadlessBuilder
+from fab_cli import collect_projects, default_arduino_folder, default_resource
+
+# Líneas de salida del compilador que se muestran por cada falla
+FAILURE_TAIL_LINES = 8
+
+# HeadlessBuilder de cada proceso del grupo (ver _init_worker)
+_builder = None
+
+
+def _init_worker(arduino_folder, timeout):
+    global _builder
+    _builder = HeadlessBuilder(arduino_folder, timeout=timeout)
+
+
+def _compile_cell(code, board):
+    return _builder.compile(code, board)
+
+
+def validate(projects, boards, arduino_folder, generator, jobs=None, timeout=None):
+    """
+    Compila la matriz proyectos × placas.
+
+    Returns:
+        list: un registro por celda (file, board, generate, compile, upload
+            y error, como fab_cli.build_project), en orden de proyecto y placa
+    """
+    records = {}
+    codes = {}
+    for path in projects:
+        started = time.perf_counter()
+        try:
+            codes[path] = generator.generate_file(path)
+            generated = {'ok': True, 'seconds': time.perf_counter() - started}
+            error = None
+        except (OSError, RuntimeError) as e:
+            generated = {'ok': False, 'seconds': time.perf_counter() - started}
+            error = f"generate: {e}"
+        for board in boards:
+            records[path, board] = {'file': path, 'board': board, 'generate': generated,
+                                    'compile': None, 'upload': None, 'error': error}
+
+    # Placas con el mismo FQBN (Nano, Modular, Robot Betto) comparten núcleo
+    # y .hex: cada (código, FQBN) distinto se compila una vez y el resultado
+    # se copia a todas sus celdas
+    cells = {}
+    for path in projects:
+        for board in boards if path in codes else ():
+            fqbn = BOARD_CPU_MAPPING[board]['TEXT_CPU']
+            cells.setdefault((codes[path], fqbn), []).append((path, board))
+    # Compilaciones pendientes de cada FQBN, en orden de proyecto
+    pending = {}
+    for code, fqbn in cells:
+        pending.setdefault(fqbn, []).append(code)
+
+    def finish(job, compiled=None, error=None):
+        for cell in cells[job]:
+            records[cell]['compile'] = compiled
+            records[cell]['error'] = error
+
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker,
+                             initargs=(arduino_folder, timeout)) as pool:
+        futures = {}
+
+        def submit_next(fqbn):
+            while pending[fqbn]:
+                job = (pending[fqbn].pop(0), fqbn)
+                board = cells[job][0][1]
+                try:
+                    futures[pool.submit(_compile_cell, job[0], board)] = job
+                    return
+                except BrokenProcessPool as e:
+                    finish(job, error=f"compile: {e}")
+
+        # Dos compilaciones simultáneas de un FQBN sin núcleo en la caché lo
+        # compilarían a la vez en la misma carpeta: hasta que una compile de
+        # verdad (no desde la BuildCache) van de a una por FQBN
+        for fqbn in pending:
+            submit_next(fqbn)
+        while futures:
+            done, _ = wait(futures, return_when=FIRST_COMPLETED)
+            for future in done:
+                job = futures.pop(future)
+                fqbn = job[1]
+                try:
+                    compiled = future.result()
+                except Exception as e:
+                    # Un error del proceso (no del compilador) solo falla su celda
+                    finish(job, error=f"compile: {e}")
+                    submit_next(fqbn)
+                    continue
+                if not compiled['ok']:
+                    finish(job, compiled, f"compile: código {compiled['returncode']}")
+                    submit_next(fqbn)
+                    continue
+                finish(job, compiled)
+                if compiled['cached']:
+                    submit_next(fqbn)
+                else:
+                    while pending[fqbn]:
+                        submit_next(fqbn)
+    return [records[path, board] for path in projects for board in boards]
+
+
+def print_table(records, projects, boards, root=None, stream=None):
+    """Tabla de tiempos: una fila por ejemplo y una columna por placa."""
+    stream = stream or sys.stdout
+    cells = {(record['file'], record['board']): record for record in records}
+    names = [os.path.relpath(path, root) if root else path for path in projects]
+    name_width = max(len(name) for name in names + ['ejemplo'])
+    widths = [max(len(board), 8) for board in boards]
+    print(f"{'ejemplo':<{name_width}}  " + '  '.join(
+        f'{board:>{width}}' for board, width in zip(boards, widths)), file=stream)
+    for name, path in zip(names, projects):
+        row = []
+        for board, width in zip(boards, widths):
+            record = cells[path, board]
+            compiled = record['compile']
+            if record['error'] is not None:
+                text = 'FALLA'
+            elif compiled['cached']:
+                text = 'caché'
+            else:
+                text = f"{compiled['seconds']:.1f} s"
+            row.append(f'{text:>{width}}')
+        print(f'{name:<{name_width}}  ' + '  '.join(row), file=stream)
+
+
+def print_failures(records, stream=None):
+    stream = stream or sys.stdout
+    not_generated = set()
+    for record in records:
+        if record['error'] is None:
+            continue
+        if not record['generate']['ok']:
+            # La generación no depende de la placa: se informa una vez por ejemplo
+            if record['file'] not in not_generated:
+                not_generated.add(record['file'])
+                print(f"\n{record['file']}: {record['error']}", file=stream)
+            continue
+        print(f"\n{record['file']} [{record['board']}]: {record['error']}", file=stream)
+        compiled = record['compile']
+        if compiled is not None:
+            for line in compiled['output'][-FAILURE_TAIL_LINES:]:
+                print(f'    {line}', file=stream)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='validate_examples', description=__doc__.splitlines()[1])
+    parser.add_argument('--examples', help='carpeta de ejemplos (por defecto examples/ del IDE)')
+    parser.add_argument('--boards', nargs='+', choices=list(BOARD_CPU_MAPPING),
+                        default=list(BOARD_CPU_MAPPING), help='placas a validar (por defecto todas)')
+    parser.add_argument('--jobs', type=int, default=os.cpu_count(),
+                        help='compilaciones simultáneas (por defecto una por CPU)')
+    parser.add_argument('--arduino', help='carpeta de Arduino (por defecto la configurada en el IDE)')
+    parser.add_argument('--html', help='carpeta del editor Blockly (por defecto html/ del IDE)')
+    parser.add_argument('--report', help='archivo JSON donde guardar todos los resultados')
+    parser.add_argument('--timeout', type=float, help='tiempo máximo de cada compilación en segundos')
+    args = parser.parse_args(argv)
+
+    arduino_folder = args.arduino or default_arduino_folder()
+    if not arduino_folder or not os.path.isdir(arduino_folder):
+        parser.error("indicar la carpeta de Arduino con --arduino")
+    if args.jobs < 1:
+        parser.error("--jobs debe ser al menos 1")
+    examples_dir = args.examples or default_resource('examples')
+    projects = collect_projects([examples_dir])
+    if not projects:
+        parser.error(f"no se encontraron proyectos en {examples_dir}")
+
+    started = time.perf_counter()
+    generator = CodeGenerator(args.html or default_resource('html'))
+    try:
+        records = validate(projects, args.boards, arduino_folder, generator,
+                           args.jobs, args.timeout)
+    finally:
+        generator.close()
+    seconds = time.perf_counter() - started
+
+    print_table(records, projects, args.boards, root=examples_dir)
+    print_failures(records)
+    failed = sum(1 for record in records if record['error'] is not None)
+    print(f"\n{len(records) - failed}/{len(records)} compilaciones correctas en {seconds:.1f} s "
+          f"({len(projects)} ejemplos × {len(args.boards)} placas, {args.jobs} procesos)")
+    if args.report:
+        with open(args.report, 'w', encoding='utf-8') as file:
+            json.dump({'boards': args.boards, 'seconds': seconds, 'results': records},
+                      file, indent=2, ensure_ascii=False)
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())